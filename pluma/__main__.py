@@ -15,8 +15,10 @@ CHECK_COMMAND = 'check'
 TESTS_COMMAND = 'tests'
 CLEAN_COMMAND = 'clean'
 VERSION_COMMAND = 'version'
+COMPACT_COMMAND = 'compact'
+EVENTS_COMMAND = 'events'
 COMMANDS = [RUN_COMMAND, CHECK_COMMAND,
-            TESTS_COMMAND, CLEAN_COMMAND, VERSION_COMMAND]
+            TESTS_COMMAND, CLEAN_COMMAND, VERSION_COMMAND, COMPACT_COMMAND, EVENTS_COMMAND]
 
 
 def arg_is_x(arg: Any, predicate: Callable, err_msg: Optional[str] = None):
@@ -41,7 +43,9 @@ def parse_arguments():
                         help=f'command for pluma, defaults to "{RUN_COMMAND}". "{RUN_COMMAND}": Run the tests suite, '
                         f'"{CHECK_COMMAND}": validate configuration files and tests, '
                         f'"{TESTS_COMMAND}": list all tests available and selected, '
-                        f'"{CLEAN_COMMAND}": remove logs, toolchains, and built executables')
+                        f'"{CLEAN_COMMAND}": remove logs, toolchains, and built executables, '
+                        f'"{COMPACT_COMMAND}": write a results file from a results stream, '
+                        f'"{EVENTS_COMMAND}": print the data sent and received on consoles')
     parser.add_argument(
         '-v', '--verbose', action='store_const', const=True,
         help='prints more information related to tests and progress')
@@ -49,13 +53,35 @@ def parse_arguments():
         '-q', '--quiet', action='store_const', const=True,
         help='print only test progress and results')
     parser.add_argument(
-        '-c', '--config', default='pluma.yml',
+        '-c', '--config',
         type=lambda arg: arg_is_file(arg, 'Config'),
         help='path to the tests configuration file. Default: "pluma.yml"')
     parser.add_argument(
-        '-t', '--target', default='pluma-target.yml',
+        '-t', '--target', action='append',
         type=lambda arg: arg_is_file(arg, 'Target config'),
-        help='path to the target configuration file. Default: "pluma-target.yml"')
+        help='path to the target configuration file. Default: "pluma-target.yml". '
+        f'Repeat to run the tests on several boards concurrently ("{RUN_COMMAND}" only)')
+    parser.add_argument(
+        '-j', '--jobs', type=int,
+        help='maximum number of boards tested concurrently. Default: all boards')
+    parser.add_argument(
+        '--stream', type=lambda arg: arg_is_file(arg, 'Results stream'),
+        help=f'path to the results stream to compact ("{COMPACT_COMMAND}" only)')
+    parser.add_argument(
+        '--events', type=lambda arg: arg_is_file(arg, 'Console events'),
+        help=f'path to the console events log to print ("{EVENTS_COMMAND}" only)')
+    parser.add_argument(
+        '--start', type=float,
+        help=f'print the console events from this time, in seconds from the first event '
+        f'("{EVENTS_COMMAND}" only)')
+    parser.add_argument(
+        '--end', type=float,
+        help=f'print the console events up to this time, in seconds from the first event '
+        f'("{EVENTS_COMMAND}" only)')
+    parser.add_argument(
+        '--console', action='append',
+        help=f'print only the events of this console, e.g. "serial". Can be repeated '
+        f'("{EVENTS_COMMAND}" only)')
     parser.add_argument(
         '--plugin', action='append',
         type=lambda arg: arg_is_dir(arg, 'Plugins'),
@@ -71,6 +97,31 @@ def parse_arguments():
         help='enable debug information')
 
     args = parser.parse_args()
+
+    if args.command == COMPACT_COMMAND:
+        if not args.stream:
+            parser.error(f'"{COMPACT_COMMAND}" requires a results stream (--stream)')
+        return args
+
+    if args.command == EVENTS_COMMAND:
+        if not args.events:
+            parser.error(f'"{EVENTS_COMMAND}" requires a console events log (--events)')
+        return args
+
+    try:
+        if not args.config:
+            args.config = arg_is_file('pluma.yml', 'Config')
+        if not args.target:
+            args.target = [arg_is_file('pluma-target.yml', 'Target config')]
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    if len(args.target) > 1 and args.command != RUN_COMMAND:
+        parser.error(f'multiple target configurations are only supported by "{RUN_COMMAND}"')
+
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('the number of jobs must be at least 1')
+
     return args
 
 
@@ -92,7 +143,8 @@ def main():
 
     set_log_mode(args)
     tests_config_path = args.config
-    target_config_path = args.target
+    target_config_paths = args.target or []
+    target_config_path = target_config_paths[0] if target_config_paths else None
 
     if args.plugin:
         for plugin_dir in args.plugin:
@@ -101,7 +153,11 @@ def main():
     try:
         command = args.command
         if command == RUN_COMMAND:
-            success = Pluma.execute_run(tests_config_path, target_config_path)
+            if len(target_config_paths) > 1:
+                success = Pluma.execute_run_boards(tests_config_path, target_config_paths,
+                                                   jobs=args.jobs)
+            else:
+                success = Pluma.execute_run(tests_config_path, target_config_path)
             exit(0 if success else 1)
         elif command == CHECK_COMMAND:
             Pluma.execute_run(tests_config_path, target_config_path,
@@ -112,6 +168,11 @@ def main():
             Pluma.execute_clean(args.force)
         elif command == VERSION_COMMAND:
             log.log(Pluma.version(), level=LogLevel.IMPORTANT)
+        elif command == COMPACT_COMMAND:
+            Pluma.execute_compact(args.stream)
+        elif command == EVENTS_COMMAND:
+            Pluma.execute_events(args.events, start=args.start, end=args.end,
+                                 consoles=args.console)
     except TestsConfigError as e:
         log.error(
             [f'Error while parsing the tests configuration ({tests_config_path}):', str(e)])
@@ -3,13 +3,21 @@ import sys
 import time
 import os
 import json
+import multiprocessing
 
-from pluma.core.baseclasses import Logger, LogLevel
+from typing import List
+
+from pluma.core.baseclasses import Logger, LogLevel, LogMode, LogFileSink, LogRotation, \
+    ConsoleEventReader, format_console_events
 from pluma.core.builder import TestsBuildError,  YoctoCBuilder
-from pluma.test import TestController
-from pluma.cli import PlumaContext, PlumaConfig, TestsConfig, TargetConfig
+from pluma.test import TestController, JsonlResultsSink, compact_results_stream, \
+    read_results_stream
+from pluma.test.resultsprocessor import NumpyResultsProcessor
+from pluma.cli import PlumaContext, PlumaConfig, TestsConfig, TargetConfig, Configuration, \
+    ConfigurationError, TestsConfigError
 from pluma.cli import PythonTestsProvider, ShellTestsProvider, CTestsProvider, \
     DeviceActionProvider
+from pluma.utils import indented_json, dump_json_list
 from pkg_resources import get_distribution
 
 from .configpreprocessor import PlumaConfigPreprocessor
@@ -41,7 +49,13 @@ class Pluma:
                     level=LogLevel.IMPORTANT)
             return True
 
-        success = controller.run()
+        Pluma.configure_results(controller, results_config)
+        try:
+            success = controller.run()
+        finally:
+            if controller.results_sink:
+                controller.results_sink.close()
+
         if success:
             log.log('All tests were successful.',
                     level=LogLevel.IMPORTANT, color='green', bold=True)
@@ -53,6 +67,146 @@ class Pluma:
 
         return success
 
+    @staticmethod
+    def execute_run_boards(tests_config_path: str, target_config_paths: List[str],
+                           jobs: int = None) -> bool:
+        '''Execute the "run" command on several boards concurrently.
+
+        Each board, described by a target configuration, is run by a
+        TestController in a separate process, with its own log files. Results
+        for all boards are merged in a single results file.
+        '''
+        board_keys = Pluma.board_keys(target_config_paths)
+        jobs = jobs or len(target_config_paths)
+
+        log.log(f'Running tests on {len(target_config_paths)} boards, '
+                f'{min(jobs, len(target_config_paths))} at a time', level=LogLevel.IMPORTANT)
+
+        # Configurations are parsed one board at a time, as tests may be built
+        config_lock = multiprocessing.Lock()
+        with multiprocessing.Pool(processes=jobs, initializer=_init_board_process,
+                                  initargs=(config_lock, log.mode)) as pool:
+            async_results = {
+                board_key: pool.apply_async(Pluma.execute_board_run,
+                                            (tests_config_path, target_config_path, board_key))
+                for board_key, target_config_path in zip(board_keys, target_config_paths)}
+
+            success = True
+            results_path = None
+            boards_results = {}
+            boards_streams = {}
+            for (board_key, async_result), target_config_path in zip(
+                    async_results.items(), target_config_paths):
+                try:
+                    board_success, board_results, board_results_path, board_stream_path = \
+                        async_result.get()
+                except Exception as e:
+                    log.error([f'Failed to run tests on board "{board_key}" '
+                               f'({target_config_path}):', str(e)])
+                    board_success = False
+                    board_results = {'error': str(e)}
+                else:
+                    results_path = results_path or board_results_path
+                    if board_stream_path:
+                        boards_streams[board_key] = board_stream_path
+
+                boards_results[board_key] = {
+                    'target_config': target_config_path,
+                    'success': board_success,
+                    **board_results
+                }
+                success = success and board_success
+
+        if success:
+            log.log('All tests were successful on all boards.',
+                    level=LogLevel.IMPORTANT, color='green', bold=True)
+        else:
+            failed = [key for key, results in boards_results.items() if not results['success']]
+            log.log(f'One of more test failed on boards: {failed}',
+                    level=LogLevel.IMPORTANT, color='red', bold=True)
+
+        results_path = results_path or Pluma.default_results_path()
+        Pluma.save_boards_results(results_path, boards_results, boards_streams)
+
+        return success
+
+    @staticmethod
+    def execute_board_run(tests_config_path: str, target_config_path: str,
+                          board_key: str) -> (bool, dict, str, str):
+        '''Run the tests on a single board of a multi-board run.
+
+        Returns the success, the results, the results file configured, and
+        the file results were streamed to. When streamed, the results of
+        each iteration are left out of the results returned, to be read from
+        the stream.
+        '''
+        with _board_config_lock:
+            context = Pluma.create_target_context(target_config_path)
+            tests_config = Pluma.create_tests_config(tests_config_path, context,
+                                                     log_suffix=board_key)
+            results_config = Pluma.create_results_config(tests_config)
+
+            for console in (context.board.consoles or {}).values():
+                if console.engine.raw_logfile:
+                    console.engine.raw_logfile = suffixed_path(console.engine.raw_logfile,
+                                                               board_key)
+
+            controller = Pluma.build_test_controller(tests_config, context,
+                                                     show_tests_list=False)
+            Pluma.configure_results(controller, results_config, suffix=board_key)
+
+        try:
+            success = controller.run()
+        finally:
+            if controller.results_sink:
+                controller.results_sink.close()
+            # Pool processes exit without running exit handlers
+            LogFileSink().close()
+
+        if results_config.format == 'columns':
+            Pluma.save_results_columns(controller,
+                                       suffixed_path(results_config.columns_path, board_key))
+
+        if controller.results_sink:
+            results = {
+                'data': controller.get_test_data_summary(),
+                'settings': controller.collect_test_settings()
+            }
+            return success, results, results_config.path, controller.results_sink.path
+
+        return success, Pluma.results(controller), results_config.path, None
+
+    @staticmethod
+    def execute_compact(stream_path: str):
+        '''Execute the "compact" command, writing a results file from a results stream.'''
+        output_path = f'{os.path.splitext(stream_path)[0]}.json'
+        log.log(f'Compacting results stream "{stream_path}" to "{output_path}"...')
+        compact_results_stream(stream_path, output_path)
+
+    @staticmethod
+    def execute_events(events_path: str, start: float = None, end: float = None,
+                       consoles: List[str] = None):
+        '''Execute the "events" command, printing the console events logged.
+
+        "start" and "end" are in seconds from the first event.
+        '''
+        reader = ConsoleEventReader(events_path)
+        start_time = reader.start_time or 0
+        events = reader.events(start=start_time + start if start is not None else None,
+                               end=start_time + end if end is not None else None,
+                               consoles=consoles)
+        for line in format_console_events(events, start_time=start_time):
+            log.log(line, level=LogLevel.IMPORTANT)
+
+    @staticmethod
+    def board_keys(target_config_paths: List[str]) -> List[str]:
+        '''Return a unique name for each board, based on its target configuration file'''
+        keys = [os.path.splitext(os.path.basename(path))[0] for path in target_config_paths]
+        if len(set(keys)) != len(keys):
+            keys = [f'{key}-{index}' for index, key in enumerate(keys)]
+
+        return keys
+
     @staticmethod
     def execute_tests(tests_config_path: str, target_config_path: str):
         '''Execute the "tests" command, listing all tests.'''
@@ -97,22 +251,90 @@ class Pluma:
         return context
 
     @staticmethod
-    def create_tests_config(tests_config_path: str, context: PlumaContext) -> TestsConfig:
+    def create_tests_config(tests_config_path: str, context: PlumaContext,
+                            log_suffix: str = None) -> TestsConfig:
         log.debug(f'Parsing tests configuration "{tests_config_path}"...')
         tests_config = PlumaConfig.load_configuration('Tests config', tests_config_path,
                                                       PlumaConfigPreprocessor(context.variables))
         default_log = f'pluma-{START_TIMESTAMP}.log'
-        context.board.log_file = tests_config.pop('log', default_log)
+        log_file = tests_config.pop('log', default_log)
+        if log_suffix:
+            log_file = suffixed_path(log_file, log_suffix)
+        context.board.log_file = log_file
+
+        rotation_config = tests_config.pop('log_rotation')
+        if rotation_config:
+            rotation = Pluma.create_log_rotation(rotation_config)
+            context.board.log_rotation = rotation
+            for console in (context.board.consoles or {}).values():
+                console.engine.raw_log_rotation = rotation
+
+        events_file = tests_config.pop('console_events', None)
+        if events_file:
+            if log_suffix:
+                events_file = suffixed_path(events_file, log_suffix)
+            for name, console in (context.board.consoles or {}).items():
+                console.engine.event_logfile = events_file
+                console.engine.event_log_name = name
 
         return TestsConfig(tests_config, Pluma.tests_providers())
 
+    @staticmethod
+    def create_log_rotation(config: Configuration) -> LogRotation:
+        '''Return the rotation of the log files, from the "log_rotation" configuration'''
+        if not isinstance(config, Configuration):
+            raise TestsConfigError('"log_rotation" must be a mapping of rotation settings')
+
+        max_size_mb = config.pop('max_size_mb')
+        max_age_hours = config.pop('max_age_hours')
+        try:
+            max_bytes = int(float(max_size_mb) * 1024 * 1024) if max_size_mb is not None \
+                else None
+            max_age_s = float(max_age_hours) * 3600 if max_age_hours is not None else None
+            rotation = LogRotation(
+                max_bytes=max_bytes, max_age_s=max_age_s,
+                backup_count=config.pop('keep', default=5),
+                compression=config.pop('compression'))
+            config.ensure_consumed()
+        except (ConfigurationError, ValueError, TypeError) as e:
+            raise TestsConfigError(f'Invalid "log_rotation": {e}')
+
+        return rotation
+
     @staticmethod
     def create_results_config(tests_config: TestsConfig) -> ResultsConfig:
         defaults = {
-            'file': f'pluma-results-{START_TIMESTAMP}.json'
+            'file': Pluma.default_results_path()
         }
         return tests_config.create_results_config(defaults)
 
+    @staticmethod
+    def configure_results(controller: TestController, results_config: ResultsConfig,
+                          suffix: str = None):
+        '''Set how the controller processes and saves results'''
+        if results_config.processor == 'numpy':
+            controller.results_processor = NumpyResultsProcessor()
+
+        controller.results_sink = Pluma.create_results_sink(results_config, suffix=suffix)
+
+    @staticmethod
+    def create_results_sink(results_config: ResultsConfig,
+                            suffix: str = None) -> JsonlResultsSink:
+        '''Return the sink iteration results are streamed to, or None if disabled'''
+        if not results_config.stream:
+            return None
+
+        stream_path = results_config.stream_path
+        if suffix:
+            stream_path = suffixed_path(stream_path, suffix)
+
+        log.debug(f'Streaming results to "{stream_path}"')
+        return JsonlResultsSink(stream_path)
+
+    @staticmethod
+    def default_results_path() -> str:
+        return f'pluma-results-{START_TIMESTAMP}.json'
+
     @staticmethod
     def build_test_controller(tests_config: TestsConfig, target_context: TargetConfig,
                               show_tests_list: bool) -> TestController:
@@ -129,14 +351,76 @@ class Pluma:
         return get_distribution(top_level_package).version
 
     @staticmethod
-    def save_results(controller: TestController, results_config: ResultsConfig):
+    def results(controller: TestController) -> dict:
+        '''Return the results of a test controller, as saved in results files'''
         settings_summary = controller.collect_test_settings()
         data_summary = controller.get_test_data_summary()
-        results = {
+        return {
             'data': data_summary,
             'settings': settings_summary,
-            'results': controller.results
+            'results': list(controller.results)
         }
 
+    @staticmethod
+    def save_results(controller: TestController, results_config: ResultsConfig):
+        if results_config.format == 'columns':
+            Pluma.save_results_columns(controller, results_config.columns_path)
+            return
+
+        if results_config.stream:
+            # Copy results from the stream, rather than building them all in memory
+            compact_results_stream(results_config.stream_path, results_config.path,
+                                   data=controller.get_test_data_summary(),
+                                   settings=controller.collect_test_settings())
+            return
+
         with open(results_config.path, 'w') as f:
-            json.dump(results, f, indent=4)
+            json.dump(Pluma.results(controller), f, indent=4)
+
+    @staticmethod
+    def save_boards_results(path: str, boards_results: dict, boards_streams: dict):
+        '''Save the results of a multi-board run.
+
+        The results of the boards in "boards_streams" are copied from their
+        stream, one iteration at a time.
+        '''
+        with open(path, 'w') as f:
+            # Same layout as json.dump({'boards': boards_results}, f, indent=4)
+            f.write('{\n    "boards": {')
+            for index, (board_key, board_results) in enumerate(boards_results.items()):
+                f.write(',\n' if index else '\n')
+                f.write(f'        {json.dumps(board_key)}: ')
+                if board_key not in boards_streams:
+                    f.write(indented_json(board_results, 2))
+                    continue
+
+                f.write('{\n')
+                for key, value in board_results.items():
+                    f.write(f'            {json.dumps(key)}: {indented_json(value, 3)},\n')
+                f.write('            "results": ')
+                dump_json_list(read_results_stream(boards_streams[board_key]), f, level=3)
+                f.write('\n        }')
+            f.write('\n    }\n}' if boards_results else '}\n}')
+
+    @staticmethod
+    def save_results_columns(controller: TestController, path: str):
+        '''Save the results in columns, to be memory-mapped when loaded'''
+        log.debug(f'Saving results columns to "{path}"')
+        controller.results_store.save(path, data=controller.get_test_data_summary(),
+                                      settings=controller.collect_test_settings())
+
+
+def suffixed_path(path: str, suffix: str) -> str:
+    '''Return "path" with "suffix" added before its extension'''
+    base, extension = os.path.splitext(path)
+    return f'{base}-{suffix}{extension}'
+
+
+_board_config_lock = None
+
+
+def _init_board_process(config_lock, log_mode: LogMode):
+    '''Initialise a process running a board, in a multi-board run'''
+    global _board_config_lock
+    _board_config_lock = config_lock
+    log.mode = log_mode
@@ -82,6 +82,8 @@ class TestDefinition():
         self.provider = test_provider
         self.parameter_sets = parameter_sets or []
         self.selected = selected
+        # Set from the sequence entry providing the test
+        self.sequence_node = None
 
         if isinstance(self.parameter_sets, dict):
             self.parameter_sets = [self.parameter_sets]
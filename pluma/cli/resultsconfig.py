@@ -1,4 +1,5 @@
 
+import os
 from dataclasses import dataclass
 
 
@@ -6,3 +7,19 @@ from dataclasses import dataclass
 class ResultsConfig:
     '''Data class to hold the results settings'''
     path: str
+    stream: bool = False
+    format: str = 'json'
+    processor: str = 'streaming'
+
+    FORMATS = ['json', 'columns']
+    PROCESSORS = ['streaming', 'numpy']
+
+    @property
+    def stream_path(self) -> str:
+        '''Path of the file results are streamed to, during the run'''
+        return f'{os.path.splitext(self.path)[0]}.jsonl'
+
+    @property
+    def columns_path(self) -> str:
+        '''Path of the directory results are saved to, in the "columns" format'''
+        return f'{os.path.splitext(self.path)[0]}.columns'
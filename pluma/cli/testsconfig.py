@@ -4,7 +4,8 @@ from pluma.cli.resultsconfig import ResultsConfig
 from typing import List, Union
 
 from pluma.core.baseclasses import Logger, LogLevel
-from pluma.test import TestController, TestRunner, TestBase
+from pluma.test import TestController, TestRunner, TestRunnerParallel, TestBase, \
+    SequenceNode
 from pluma.test.stock.deffuncs import sc_run_n_iterations
 from pluma.cli import Configuration, ConfigurationError, TestsConfigError, TestDefinition,\
     TestsProvider
@@ -54,7 +55,9 @@ class TestsConfig:
             return controller
 
     def _create_test_controller(self, board: Board, settings: Configuration) -> TestController:
-        testrunner = TestRunner(
+        runner_class = TestRunnerParallel if settings.pop('parallel', default=False) \
+            else TestRunner
+        testrunner = runner_class(
             board=board,
             tests=TestsConfig.create_tests(
                 self.selected_tests(), board),
@@ -77,9 +80,21 @@ class TestsConfig:
 
     def create_results_config(self, defaults: dict) -> ResultsConfig:
         path = self.results_config.pop('file', defaults.get('file', None))
+        stream = self.results_config.pop('stream', default=False)
+        results_format = self.results_config.pop('format', default='json')
+        processor = self.results_config.pop('processor', default='streaming')
         self.results_config.ensure_consumed()
 
-        return ResultsConfig(path=path)
+        if results_format not in ResultsConfig.FORMATS:
+            raise TestsConfigError(f'Invalid results format "{results_format}". '
+                                   f'Supported formats: {ResultsConfig.FORMATS}')
+
+        if processor not in ResultsConfig.PROCESSORS:
+            raise TestsConfigError(f'Invalid results processor "{processor}". '
+                                   f'Supported processors: {ResultsConfig.PROCESSORS}')
+
+        return ResultsConfig(path=path, stream=stream, format=results_format,
+                             processor=processor)
 
     def __populate_tests(self, tests_config: Configuration):
         self.tests = []
@@ -126,6 +141,7 @@ class TestsConfig:
 
         all_tests = []
         supported_actions = cls._supported_actions(test_providers)
+        sequence_ids = set()
 
         # Parse sequence
         for action in sequence:
@@ -139,13 +155,60 @@ class TestsConfig:
                     f' Supported actions: {supported_actions.keys()}')
 
             action_key = next(iter(action))
+            action_config = action[action_key]
+            node = cls.sequence_node_from_action(action_key, action_config, sequence_ids)
+            if node.id:
+                sequence_ids.add(node.id)
+
             tests = cls.tests_from_action(action_key=action_key,
-                                          action_config=action[action_key],
+                                          action_config=action_config,
                                           supported_actions=supported_actions)
+            for test in tests:
+                test.sequence_node = node
+
             all_tests.extend(tests)
 
         return all_tests
 
+    @staticmethod
+    def sequence_node_from_action(action_key: str, action_config: dict,
+                                  previous_ids: set) -> SequenceNode:
+        '''Return the scheduling information of a sequence action.
+
+        The "id", "depends_on" and "resources" attributes are removed from
+        the action configuration. Dependencies must refer to ids of actions
+        defined earlier in the sequence.
+        '''
+        if not isinstance(action_config, dict):
+            return SequenceNode()
+
+        node_id = action_config.pop('id', None)
+        depends_on = action_config.pop('depends_on', None) or []
+        resources = action_config.pop('resources', None) or []
+
+        if node_id is not None:
+            node_id = str(node_id)
+            if node_id in previous_ids:
+                raise TestsConfigError(
+                    f'Sequence action "{action_key}" uses the id "{node_id}", which is '
+                    'already used by another action')
+
+        if not isinstance(depends_on, list):
+            depends_on = [depends_on]
+        depends_on = [str(dependency) for dependency in depends_on]
+
+        for dependency in depends_on:
+            if dependency not in previous_ids:
+                raise TestsConfigError(
+                    f'Sequence action "{action_key}" depends on "{dependency}", which is '
+                    'not the id of an action defined earlier in the sequence')
+
+        if not isinstance(resources, list):
+            resources = [resources]
+
+        return SequenceNode(id=node_id, depends_on=depends_on,
+                            resources=[str(resource) for resource in resources])
+
     @staticmethod
     def tests_from_action(action_key: str, action_config: Union[dict, Configuration],
                           supported_actions: dict) -> List[TestDefinition]:
@@ -211,6 +274,7 @@ class TestsConfig:
                         test_object = test.testclass(board, parameters)
                         test_object.settings = {parameters}
 
+                    test_object.sequence_node = test.sequence_node
                     test_objects.append(test_object)
             except Exception as e:
                 if f'{e}'.startswith('__init__()'):
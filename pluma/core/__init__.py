@@ -10,7 +10,9 @@ from .pdu import APCPDU, IPPowerPDU, EnergeniePDU
 from .serialconsole import SerialConsole
 from .hostconsole import HostConsole
 from .telnetconsole import TelnetConsole
+from .sshtransport import SSHTransport
 from .sshconsole import SSHConsole
+from .asyncconsole import AsyncConsole
 from .hub import Hub
 from .sdwire import SDWire
 from .multimeter import MultimeterTTI1604
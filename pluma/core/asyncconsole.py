@@ -0,0 +1,163 @@
+from typing import List
+
+from .baseclasses import AsyncConsoleEngine, ConsoleBase, LogLevel
+from .baseclasses.consoleexceptions import (ConsoleError, ConsoleCannotOpenError,
+                                            ConsoleExceptionKeywordReceivedError)
+from .sshconsole import SSHConsole
+
+
+class AsyncConsole():
+    '''Asynchronous counterpart of a console.
+
+    Wraps a console (e.g. :class:`~pluma.core.SerialConsole` or
+    :class:`~pluma.core.SSHConsole`) and drives it with an
+    :class:`~pluma.core.baseclasses.AsyncConsoleEngine`, so that many
+    consoles can be multiplexed on a single event loop, without a thread
+    for each console:
+
+        >>> consoles = [AsyncConsole(board.console) for board in boards]
+        >>> await asyncio.gather(*(c.open() for c in consoles))
+        >>> await asyncio.gather(*(c.send_and_expect('uname -a', match='Linux')
+                                   for c in consoles))
+
+    The console wrapped should not be used directly while the asynchronous
+    console is open.
+    '''
+
+    def __init__(self, console: ConsoleBase, engine: AsyncConsoleEngine = None):
+        if not isinstance(console, ConsoleBase):
+            raise ValueError(f'Console "{console}" is not an instance of ConsoleBase')
+
+        self.console = console
+        self.engine = engine or AsyncConsoleEngine(
+            linesep=console.engine.linesep, encoding=console.engine.encoding,
+            event_logfile=console.engine.event_logfile,
+            event_log_name=console.engine.event_log_name,
+            raw_log_rotation=console.engine.raw_log_rotation)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}[{self.console}]'
+
+    @property
+    def system(self):
+        return self.console.system
+
+    @property
+    def is_open(self):
+        '''Return whether the console is opened or not'''
+        return self.engine.is_open
+
+    async def open(self):
+        '''Open the console.'''
+        self.console.open_with_engine(self.engine)
+
+        if isinstance(self.console, SSHConsole):
+            try:
+                await self.wait_for_prompt(timeout=5)
+            except Exception:
+                self.close()
+                raise ConsoleCannotOpenError
+
+    def close(self):
+        '''Close the console.'''
+        self.console.close_with_engine(self.engine)
+
+    async def require_open(self):
+        '''Open the console or raise an error.'''
+        if not self.is_open:
+            await self.open()
+        if not self.is_open:
+            raise ConsoleCannotOpenError
+
+    async def read_all(self, preserve_read_buffer: bool = False) -> str:
+        '''Read and return all data available on the console'''
+        await self.require_open()
+        return await self.engine.read_all(preserve_read_buffer=preserve_read_buffer)
+
+    async def wait_for_match(self, match: List[str], timeout=None) -> str:
+        '''Wait a maximum duration of 'timeout' for a matching regex, and returns matched text'''
+        match_result = await self.engine.wait_for_match(match=match, timeout=timeout)
+        return match_result.text_matched
+
+    async def wait_for_quiet(self, quiet: float = None, timeout: float = None) -> bool:
+        '''Wait at most "timeout" for no activity during "quiet" consecutive seconds'''
+        await self.require_open()
+        return await self.engine.wait_for_quiet(quiet=quiet, timeout=timeout)
+
+    async def send_nonblocking(self, cmd: str, send_newline: bool = True,
+                               flush_before: bool = True):
+        '''Send a command/data and return immediately'''
+        await self.require_open()
+        self.console.log('Sending command: \'{}\'', args=(cmd,), force_log_file=None,
+                         level=LogLevel.DEBUG)
+
+        if flush_before:
+            await self.engine.read_all()
+
+        if send_newline:
+            await self.engine.send_line(cmd)
+        else:
+            await self.engine.send(cmd)
+
+        self.console.log('<<sent>>{}<</sent>>', args=(cmd,),
+                         force_echo=False, level=LogLevel.DEBUG)
+
+    async def send(self, cmd: str, send_newline: bool = True, flush_before: bool = True):
+        '''Send a command/data. Identical to AsyncConsole.send_nonblocking()'''
+        await self.send_nonblocking(cmd=cmd, send_newline=send_newline,
+                                    flush_before=flush_before)
+
+    async def send_and_read(self, cmd: str, timeout: float = None, quiet_time: float = None,
+                            send_newline: bool = True, flush_before: bool = True) -> str:
+        '''Send a command/data on the console, wait for quiet and return the data received'''
+        timeout = timeout if timeout is not None else 3
+        quiet_time = quiet_time if quiet_time is not None else 0.3
+
+        await self.send_nonblocking(cmd, send_newline=send_newline,
+                                    flush_before=flush_before)
+        await self.wait_for_quiet(quiet=quiet_time, timeout=timeout)
+        return await self.read_all()
+
+    async def send_and_expect(self, cmd: str, match: list, excepts: list = None,
+                              timeout: float = None, send_newline: bool = True,
+                              flush_before: bool = True) -> (str, str):
+        '''Send a command/data on the console, and wait for one of "expects" patterns.'''
+        match = match or []
+        excepts = excepts or []
+        timeout = timeout if timeout is not None else 5
+
+        if not isinstance(match, list):
+            match = [match]
+        if not isinstance(excepts, list):
+            excepts = [excepts]
+
+        watches = []
+        watches.extend(match)
+        watches.extend(excepts)
+
+        await self.send_nonblocking(cmd, send_newline=send_newline,
+                                    flush_before=flush_before)
+
+        match = await self.engine.wait_for_match(timeout=timeout, match=watches)
+
+        if match.regex_matched:
+            debug_match_str = f'<<matched expects={watches}>>{match.regex_matched}<</matched>>'
+        else:
+            debug_match_str = f'<<not_matched expects={watches}>>'
+
+        self.console.log(f'<<received>>{match.text_received}{debug_match_str}<</received>>',
+                         force_echo=False, level=LogLevel.DEBUG)
+
+        if match.regex_matched in excepts:
+            self.console.error(f'Matched [{match.regex_matched}] is in exceptions list '
+                               f'{excepts}', exception=ConsoleExceptionKeywordReceivedError)
+
+        return (match.text_received, match.text_matched)
+
+    async def wait_for_prompt(self, timeout: float = None):
+        '''Wait for a prompt, throws if no prompt before timeout'''
+        prompt_regex = self.system.prompt_regex
+        self.console.log('Waiting for prompt "{}" for {}s', args=(prompt_regex, timeout))
+        match_result = await self.engine.wait_for_match(match=prompt_regex, timeout=timeout)
+        if not match_result.regex_matched:
+            raise ConsoleError('No prompt detected.')
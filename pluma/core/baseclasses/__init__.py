@@ -1,12 +1,19 @@
 from .hardwarebase import HardwareBase
 from .consoleexceptions import *
+from .receptionbuffer import ReceptionBuffer
+from .streammatcher import StreamMatcher, StreamMatch, PatternSet, compile_patterns
+from .consoleeventlog import ConsoleEventLog, ConsoleEventReader, ConsoleEvent, \
+    format_console_events
 from .consoleengine import ConsoleEngine, ConsoleType, MatchResult
 from .pexpectengine import PexpectEngine
-from .consolebase import ConsoleBase
+from .asyncconsoleengine import AsyncConsoleEngine
+from .consolebase import ConsoleBase, ExecResult
 from .powerbase import PowerBase
 from .relaybase import RelayBase
 from .storagebase import StorageBase
 from .nonblocking import Nonblocking
 from .locking import Locking
 from .singleton import Singleton
+from .logrotation import LogRotation, RotatingLogFile
+from .logsink import LogFileSink
 from .logging import Logger, LogMode, LogLevel
@@ -0,0 +1,366 @@
+import asyncio
+import errno
+import fcntl
+import os
+import pty
+import shlex
+import subprocess
+import termios
+import time
+
+from datetime import datetime
+from typing import List
+
+from pluma.utils import datetime_to_timestamp
+from .consoleengine import ConsoleType, MatchResult
+from .consoleeventlog import ConsoleEventLog
+from .logrotation import LogRotation, open_log_file
+from .consoleexceptions import ConsoleCannotOpenError
+from .receptionbuffer import ReceptionBuffer
+from .streammatcher import StreamMatcher
+from .logging import Logger
+
+log = Logger()
+
+""" Maximum number of bytes read from the console in a single read """
+DEFAULT_READ_CHUNK_SIZE = 4096
+
+""" Time given to a process to exit when closing, before it is killed """
+PROCESS_TERMINATE_TIMEOUT_S = 5
+
+
+class AsyncConsoleEngine():
+    '''Console engine driven by an asyncio event loop.
+
+    Unlike :class:`ConsoleEngine` implementations, waiting on the console
+    does not block a thread: the console file descriptor is registered with
+    the event loop, and the coroutines "send", "read_all", "wait_for_match"
+    and "wait_for_quiet" yield to the loop while waiting. This allows a single
+    event loop to drive many consoles concurrently.
+
+    Processes are spawned on a pseudo-terminal, so that interactive programs
+    (shells, ssh, ...) behave as they would with :class:`PexpectEngine`.
+    "open" must be called while an event loop is available, typically from a
+    coroutine. "close" does not wait for the process to exit, which
+    "wait_closed" does.
+    '''
+
+    def __init__(self, linesep: str = None, encoding: str = None,
+                 raw_logfile: str = None, read_chunk_size: int = None,
+                 search_window_size: int = None, event_logfile: str = None,
+                 event_log_name: str = None, raw_log_rotation: LogRotation = None):
+        timestamp = datetime_to_timestamp(datetime.now())
+        default_raw_logfile = os.path.join(
+            '/tmp', 'pluma',
+            f'{self.__class__.__name__}_raw_{timestamp}.log')
+
+        self.linesep = linesep or '\n'
+        self.encoding = encoding or 'ascii'
+        self.raw_logfile = raw_logfile or default_raw_logfile
+        self.raw_log_rotation = raw_log_rotation
+        self.read_chunk_size = read_chunk_size or DEFAULT_READ_CHUNK_SIZE
+        self.search_window_size = search_window_size
+        self._raw_logfile_fd = None
+        self.event_logfile = event_logfile
+        self.event_log_name = event_log_name or self.__class__.__name__
+        self._event_log = None
+        self._event_console_id = None
+        self._console_type = None
+        self._reception_buffer = ReceptionBuffer(encoding=self.encoding)
+        self._loop = None
+        self._fd = None
+        self._process = None
+        self._eof = False
+        self._read_error = None
+        self._received = None
+        self._process_exit = None
+
+    @property
+    def console_type(self):
+        return self._console_type
+
+    def open(self, console_cmd: str = None, console_fd=None):
+        if (console_cmd is None and console_fd is None) or (
+                console_cmd and console_fd):
+            raise ValueError('Either "console_cmd" or "console_fd" must be provided.')
+
+        if self.raw_logfile:
+            self._raw_logfile_fd = open_log_file(self.raw_logfile, self.raw_log_rotation,
+                                                 truncate=True)
+
+        try:
+            if self.event_logfile:
+                self._event_log = ConsoleEventLog.acquire(self.event_logfile)
+                self._event_console_id = self._event_log.console_id(self.event_log_name)
+
+            if console_cmd:
+                self._fd = self._spawn_process(command=console_cmd)
+                self._console_type = ConsoleType.Process
+            else:
+                self._fd = console_fd
+                self._console_type = ConsoleType.FileDescriptor
+
+            self._eof = False
+            self._read_error = None
+            self._received = asyncio.Event()
+            self._loop = asyncio.get_event_loop()
+            os.set_blocking(self._fd, False)
+            self._loop.add_reader(self._fd, self._on_readable)
+
+            assert self.is_open
+        except Exception:
+            self._close_logs()
+            raise ConsoleCannotOpenError
+
+    def _spawn_process(self, command: str) -> int:
+        '''Spawn "command" on a pseudo-terminal, and return the terminal file descriptor'''
+        main_fd, secondary_fd = pty.openpty()
+
+        def set_controlling_terminal():
+            fcntl.ioctl(0, termios.TIOCSCTTY, 0)
+
+        try:
+            self._process = subprocess.Popen(
+                shlex.split(command), stdin=secondary_fd, stdout=secondary_fd,
+                stderr=secondary_fd, start_new_session=True,
+                preexec_fn=set_controlling_terminal)
+        except Exception:
+            os.close(main_fd)
+            raise
+        finally:
+            os.close(secondary_fd)
+
+        return main_fd
+
+    @property
+    def is_open(self):
+        '''Return whether the console is open or not'''
+        if self._fd is None or self._eof or self._read_error:
+            return False
+
+        if self._process:
+            return self._process.poll() is None
+
+        return True
+
+    def close(self):
+        '''Close the console.'''
+        if self._fd is None:
+            return
+
+        self._loop.remove_reader(self._fd)
+
+        if self.console_type is ConsoleType.Process:
+            # Closing the terminal hangs up interactive shells, which ignore SIGTERM
+            os.close(self._fd)
+            if self._process.poll() is None:
+                self._process.terminate()
+                # Waiting for the process to exit would block the event loop
+                self._process_exit = self._loop.run_in_executor(
+                    None, reap_process, self._process)
+            self._process = None
+        else:
+            # File descriptor is owned, and closed, at a higher level
+            os.set_blocking(self._fd, True)
+
+        self._fd = None
+
+        self._close_logs()
+
+    def _close_logs(self):
+        if self._raw_logfile_fd:
+            self._raw_logfile_fd.close()
+            self._raw_logfile_fd = None
+
+        if self._event_log:
+            self._event_log.release()
+            self._event_log = None
+
+    async def wait_closed(self):
+        '''Wait for the process of the console closed to exit'''
+        if self._process_exit:
+            await self._process_exit
+            self._process_exit = None
+
+    def _on_readable(self):
+        '''Read data available on the console, called by the event loop'''
+        try:
+            data = os.read(self._fd, self.read_chunk_size)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            # Linux reports the end of a pseudo-terminal with EIO
+            if e.errno != errno.EIO:
+                # Raised by the coroutines waiting for data
+                self._read_error = e
+                self._loop.remove_reader(self._fd)
+                self._received.set()
+                return
+            data = b''
+
+        if not data:
+            self._eof = True
+            self._loop.remove_reader(self._fd)
+        else:
+            self._reception_buffer.append(data)
+            self._write_raw_log(data)
+            if self._event_log:
+                self._event_log.received(self._event_console_id, data)
+
+        self._received.set()
+
+    def _write_raw_log(self, data: bytes):
+        if self._raw_logfile_fd:
+            self._raw_logfile_fd.write(data)
+            self._raw_logfile_fd.flush()
+
+    async def _wait_for_data(self, timeout: float) -> bool:
+        '''Wait a maximum duration of 'timeout' for data to be received'''
+        if self._read_error:
+            raise self._read_error
+
+        self._received.clear()
+        try:
+            await asyncio.wait_for(self._received.wait(), max(timeout, 0))
+        except asyncio.TimeoutError:
+            return False
+
+        if self._read_error:
+            raise self._read_error
+
+        return True
+
+    async def send(self, data: str):
+        '''Send data on the console.'''
+        assert self.is_open
+
+        encoded = self.encode(data)
+        while encoded:
+            try:
+                written = os.write(self._fd, encoded)
+            except BlockingIOError:
+                await self._wait_writable()
+                continue
+
+            self._write_raw_log(encoded[:written])
+            if self._event_log:
+                self._event_log.sent(self._event_console_id, encoded[:written])
+            encoded = encoded[written:]
+
+    async def _wait_writable(self):
+        writable = self._loop.create_future()
+        self._loop.add_writer(self._fd, lambda: writable.done() or writable.set_result(None))
+        try:
+            await writable
+        finally:
+            self._loop.remove_writer(self._fd)
+
+    async def send_line(self, data: str):
+        '''Send data and a line break on the console.'''
+        await self.send(data+self.linesep)
+
+    async def read_all(self, preserve_read_buffer: bool = False) -> str:
+        '''Return all data received on the console'''
+        assert self._fd is not None
+
+        # Let the event loop process pending reads
+        await asyncio.sleep(0)
+
+        received = self._reception_buffer.text
+        if not preserve_read_buffer:
+            if received.strip():
+                log.debug('<<flushed>>{}<</flushed>>', received)
+            self._reception_buffer.clear()
+
+        return received
+
+    async def wait_for_match(self, match: List[str], timeout: float = None) -> MatchResult:
+        '''Wait a maximum duration of 'timeout' for a matching regex.
+
+        On match, the data received up to the end of the match is consumed
+        from the reception buffer. Only the data received since the last
+        search is searched, see :class:`StreamMatcher`.
+        '''
+        assert self._fd is not None
+
+        timeout = timeout if timeout is not None else 0.5
+
+        if not isinstance(match, list):
+            match = [match]
+
+        log.debug('Waiting up to {}s for patterns: {}...', timeout, match)
+
+        matcher = StreamMatcher(match, search_window_size=self.search_window_size)
+        deadline = time.time() + timeout
+        while True:
+            stream_match = matcher.feed(
+                self._reception_buffer.text_from(matcher.position))
+            if stream_match:
+                log.debug('Matched {}', stream_match.regex)
+
+                text_received = self._reception_buffer.consume(stream_match.end)
+                return MatchResult(regex_matched=stream_match.regex,
+                                   text_matched=stream_match.text,
+                                   text_received=text_received)
+
+            remaining_time = deadline - time.time()
+            if remaining_time <= 0 or self._eof:
+                break
+
+            await self._wait_for_data(timeout=remaining_time)
+
+        log.debug('No match found before timeout or EOF')
+        return MatchResult(regex_matched=None, text_matched=None,
+                           text_received=self._reception_buffer.text)
+
+    async def wait_for_quiet(self, quiet: float = None, timeout: float = None) -> bool:
+        '''Wait at most "timeout" for no activity during "quiet" consecutive seconds'''
+        assert self._fd is not None
+
+        quiet = quiet if quiet is not None else 0.5
+        timeout = timeout if timeout is not None else 10.0
+
+        start = time.time()
+        now = start
+        quiet_start = start
+        while now - start < timeout:
+            wait_time = min(quiet_start + quiet, start + timeout) - now
+            received = await self._wait_for_data(timeout=wait_time)
+
+            now = time.time()
+            if not received:
+                if now - quiet_start >= quiet:
+                    return True
+            else:
+                quiet_start = now
+
+        return False
+
+    @property
+    def reception_buffer_size(self) -> int:
+        '''Size of the reception buffer for the console, in bytes'''
+        return len(self._reception_buffer)
+
+    @property
+    def reception_buffer(self) -> str:
+        '''Content of the reception buffer'''
+        return self._reception_buffer.text
+
+    def encode(self, text: str) -> bytes:
+        '''Encode text using the engine's encoding'''
+        if not text:
+            return b''
+
+        if not isinstance(text, str):
+            raise ValueError('"text" should be of type "str"')
+
+        return text.encode(self.encoding)
+
+
+def reap_process(process: subprocess.Popen):
+    '''Wait for a terminated "process" to exit, and kill it if it does not'''
+    try:
+        process.wait(timeout=PROCESS_TERMINATE_TIMEOUT_S)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
@@ -3,6 +3,7 @@ import json
 import os
 from typing import List
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 
 from pluma.core.dataclasses import SystemContext
 from pluma.core.baseclasses import ConsoleEngine, PexpectEngine
@@ -15,6 +16,13 @@ from .consoleexceptions import (ConsoleError, ConsoleCannotOpenError,
                                 ConsoleLoginFailedError)
 
 
+@dataclass(frozen=True)
+class ExecResult:
+    stdout: str
+    stderr: str
+    retcode: int
+
+
 class ConsoleBase(HardwareBase, ABC):
     """ Implements the console functionality not specific to a given transport layer """
 
@@ -31,6 +39,19 @@ class ConsoleBase(HardwareBase, ABC):
     def open(self):
         '''Open a console.'''
 
+    def open_with_engine(self, engine):
+        '''Open the console transport with "engine" instead of the console engine.
+
+        Used by :class:`~pluma.core.asyncconsole.AsyncConsole` to open the
+        console with an :class:`AsyncConsoleEngine`.
+        '''
+        raise ValueError(
+            f'Console type {self} does not support opening with a different engine')
+
+    def close_with_engine(self, engine):
+        '''Close the console transport opened with "open_with_engine"'''
+        engine.close()
+
     def _on_opened(self):
         '''Executed after the console is opened.'''
 
@@ -65,62 +86,80 @@ class ConsoleBase(HardwareBase, ABC):
 
     def wait_for_bytes(self, timeout: int = None, sleep_time: int = None,
                        start_bytes: int = None) -> bool:
-        '''Wait for data to be received on the console.'''
+        '''Wait for data to be received on the console.
+
+        Returns as soon as data is received if the engine can wait on the
+        console, otherwise polls the console every "sleep_time" seconds.
+        '''
         timeout = timeout or 10.0
         sleep_time = sleep_time or 0.1
 
         self.require_open()
 
-        self.engine.read_all(preserve_read_buffer=True)
+        self.engine.fill_reception_buffer()
         initial_byte_count = start_bytes or self.engine.reception_buffer_size
 
         start_time = time.time()
-        while(time.time()-start_time < timeout):
-            self.engine.read_all(preserve_read_buffer=True)
+        now = start_time
+        while(now - start_time < timeout):
             byte_count = self.engine.reception_buffer_size
 
-            self.log(f'Waiting for data: Waited[{time.time()-start_time:.1f}/{timeout:.1f}s] '
-                     'Received[{byte_count-initial_byte_count}B]...',
+            self.log('Waiting for data: Waited[{:.1f}/{:.1f}s] Received[{}B]...',
+                     args=(now - start_time, timeout, byte_count - initial_byte_count),
                      level=LogLevel.DEBUG)
 
             if byte_count > initial_byte_count:
                 return True
 
-            time.sleep(sleep_time)
+            if self.engine.can_wait_for_data:
+                wait_time = start_time + timeout - now
+            else:
+                wait_time = sleep_time
 
-        return False
+            self.engine.wait_for_data(timeout=wait_time)
+            self.engine.fill_reception_buffer()
+            now = time.time()
+
+        return self.engine.reception_buffer_size > initial_byte_count
 
     def wait_for_quiet(self, quiet: float = None, sleep_time: float = None,
                        timeout: float = None) -> bool:
-        '''Wait at most "timeout" for no activity during "quiet" consecutive seconds'''
+        '''Wait at most "timeout" for no activity during "quiet" consecutive seconds.
+
+        Returns as soon as the quiet window expires if the engine can wait on
+        the console, otherwise polls the console every "sleep_time" seconds.
+        '''
         self.require_open()
         quiet = quiet if quiet is not None else 0.5
         sleep_time = sleep_time if sleep_time is not None else 0.1
         timeout = timeout if timeout is not None else 10.0
 
-        last_read_buffer_size = 0
         start = time.time()
         now = start
         quiet_start = start
         while(now - start < timeout):
-            time.sleep(sleep_time)
+            if self.engine.can_wait_for_data:
+                # Wake up on reception, or when the quiet window expires
+                wait_time = min(quiet_start + quiet, start + timeout) - now
+            else:
+                wait_time = sleep_time
 
-            self.read_all(preserve_read_buffer=True)
-            reception_buffer_size = self.engine.reception_buffer_size
+            self.engine.wait_for_data(timeout=wait_time)
+            received_size = self.engine.fill_reception_buffer()
 
             # Check if more data was received
             now = time.time()
-            if reception_buffer_size == last_read_buffer_size:
-                if now - quiet_start > quiet:
+            if received_size == 0:
+                if now - quiet_start >= quiet:
                     return True
             else:
                 quiet_start = now
 
-            last_read_buffer_size = reception_buffer_size
-            log_string = ("Waiting for quiet... Waited[{:.1f}/{:.1f}s] "
-                          "Quiet[{:.1f}/{:.1f}s] Received[{:.0f}B]...")
-            self.log(log_string.format(now - start, timeout, now - quiet_start,
-                                       quiet, reception_buffer_size), level=LogLevel.DEBUG)
+            self.log("Waiting for quiet... Waited[{:.1f}/{:.1f}s] "
+                     "Quiet[{:.1f}/{:.1f}s] Received[{:.0f}B]...",
+                     args=(now - start, timeout, now - quiet_start,
+                           quiet, self.engine.reception_buffer_size),
+                     level=LogLevel.DEBUG)
 
         # Timeout
         return False
@@ -161,13 +200,14 @@ class ConsoleBase(HardwareBase, ABC):
 
         match = self.engine.wait_for_match(timeout=timeout, match=watches)
 
-        if match.regex_matched:
-            debug_match_str = f'<<matched expects={watches}>>{match.regex_matched}<</matched>>'
-        else:
-            debug_match_str = f'<<not_matched expects={watches}>>'
+        def received_log() -> str:
+            if match.regex_matched:
+                debug_match_str = f'<<matched expects={watches}>>{match.regex_matched}<</matched>>'
+            else:
+                debug_match_str = f'<<not_matched expects={watches}>>'
+            return f'<<received>>{match.text_received}{debug_match_str}<</received>>'
 
-        self.log(f'<<received>>{match.text_received}{debug_match_str}<</received>>',
-                 force_echo=False, level=LogLevel.DEBUG)
+        self.log(received_log, force_echo=False, level=LogLevel.DEBUG)
 
         if match.regex_matched in excepts:
             self.error(f'Matched [{match.regex_matched}] is in exceptions list {excepts}',
@@ -180,7 +220,7 @@ class ConsoleBase(HardwareBase, ABC):
                          flush_before: bool = True):
         '''Send a command/data and return immediately. Identical to ConsoleBase.send()'''
         self.require_open()
-        self.log(f'Sending command: \'{cmd}\'', force_log_file=None,
+        self.log('Sending command: \'{}\'', args=(cmd,), force_log_file=None,
                  level=LogLevel.DEBUG)
 
         if flush_before:
@@ -191,7 +231,7 @@ class ConsoleBase(HardwareBase, ABC):
         else:
             self.engine.send(cmd)
 
-        self.log(f'<<sent>>{cmd}<</sent>>',
+        self.log('<<sent>>{}<</sent>>', args=(cmd,),
                  force_echo=False, level=LogLevel.DEBUG)
 
     def send(self, cmd: str, send_newline: bool = True, flush_before: bool = True):
@@ -280,6 +320,15 @@ class ConsoleBase(HardwareBase, ABC):
         raise ValueError(
             f'Console type {self} does not support copying from target')
 
+    @property
+    def support_exec(self):
+        return False
+
+    def exec(self, command: str, timeout: float = None) -> ExecResult:
+        '''Run a command on the target, outside of the interactive shell'''
+        raise ValueError(
+            f'Console type {self} does not support command execution')
+
     @property
     def requires_login(self):
         return self._requires_login
@@ -288,7 +337,7 @@ class ConsoleBase(HardwareBase, ABC):
         '''Wait for a prompt, throws if no prompt before timeout'''
 
         prompt_regex = self.system.prompt_regex
-        self.log(f'Waiting for prompt "{prompt_regex}" for {timeout}s')
+        self.log('Waiting for prompt "{}" for {}s', args=(prompt_regex, timeout))
         match_result = self.engine.wait_for_match(match=prompt_regex, timeout=timeout)
         if not match_result.regex_matched:
             raise ConsoleError('No prompt detected.')
@@ -1,4 +1,5 @@
 import os
+import time
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
@@ -7,7 +8,10 @@ from enum import Enum
 from typing import List
 
 from pluma.utils import datetime_to_timestamp
+from .consoleeventlog import ConsoleEventLog
+from .logrotation import LogRotation, open_log_file
 from .consoleexceptions import ConsoleCannotOpenError
+from .receptionbuffer import ReceptionBuffer
 from .logging import Logger
 
 log = Logger()
@@ -27,7 +31,8 @@ class MatchResult:
 
 class ConsoleEngine(ABC):
     def __init__(self, linesep: str = None, encoding: str = None,
-                 raw_logfile: str = None):
+                 raw_logfile: str = None, event_logfile: str = None,
+                 event_log_name: str = None, raw_log_rotation: LogRotation = None):
         timestamp = datetime_to_timestamp(datetime.now())
         default_raw_logfile = os.path.join(
             '/tmp', 'pluma',
@@ -36,9 +41,14 @@ class ConsoleEngine(ABC):
         self.linesep = linesep or '\n'
         self.encoding = encoding or 'ascii'
         self.raw_logfile = raw_logfile or default_raw_logfile
+        self.raw_log_rotation = raw_log_rotation
         self._raw_logfile_fd = None
+        self.event_logfile = event_logfile
+        self.event_log_name = event_log_name or self.__class__.__name__
+        self._event_log = None
+        self._event_console_id = None
         self._console_type = None
-        self._reception_buffer = ''
+        self._reception_buffer = ReceptionBuffer(encoding=self.encoding)
 
     @property
     def console_type(self):
@@ -50,10 +60,14 @@ class ConsoleEngine(ABC):
             raise ValueError('Either "console_cmd" or "console_fd" must be provided.')
 
         if self.raw_logfile:
-            os.makedirs(os.path.dirname(self.raw_logfile), exist_ok=True)
-            self._raw_logfile_fd = open(self.raw_logfile, 'wb')
+            self._raw_logfile_fd = open_log_file(self.raw_logfile, self.raw_log_rotation,
+                                                 truncate=True)
 
         try:
+            if self.event_logfile:
+                self._event_log = ConsoleEventLog.acquire(self.event_logfile)
+                self._event_console_id = self._event_log.console_id(self.event_log_name)
+
             if console_cmd:
                 self._open_process(command=console_cmd)
                 self._console_type = ConsoleType.Process
@@ -63,6 +77,7 @@ class ConsoleEngine(ABC):
 
             assert self.is_open
         except Exception:
+            self._close_logs()
             raise ConsoleCannotOpenError
 
     @abstractmethod
@@ -90,10 +105,27 @@ class ConsoleEngine(ABC):
         else:
             raise Exception(f'Unknown console_type {self.console_type}')
 
+        self._close_logs()
+
+    def _close_logs(self):
         if self._raw_logfile_fd:
             self._raw_logfile_fd.close()
             self._raw_logfile_fd = None
 
+        if self._event_log:
+            self._event_log.release()
+            self._event_log = None
+
+    def _log_received(self, data: bytes):
+        '''Add "data" received to the console event log, if enabled'''
+        if self._event_log:
+            self._event_log.received(self._event_console_id, data)
+
+    def _log_sent(self, data: bytes):
+        '''Add "data" sent to the console event log, if enabled'''
+        if self._event_log:
+            self._event_log.sent(self._event_console_id, data)
+
     @abstractmethod
     def _close_fd(self):
         '''Close file descriptor based console'''
@@ -112,21 +144,47 @@ class ConsoleEngine(ABC):
 
     def read_all(self, preserve_read_buffer: bool = False):
         '''Read and return all data available on the console'''
-        assert self.is_open
-
-        self._reception_buffer += self._read_from_console()
-        received = self._reception_buffer
+        self.fill_reception_buffer()
+        received = self._reception_buffer.text
 
         if not preserve_read_buffer:
-            if self._reception_buffer.strip():
-                log.debug(f'<<flushed>>{self._reception_buffer}<</flushed>>')
-            self._reception_buffer = ''
+            if received.strip():
+                log.debug('<<flushed>>{}<</flushed>>', received)
+            self._reception_buffer.clear()
 
         return received
 
+    def fill_reception_buffer(self) -> int:
+        '''Read all data available on the console into the reception buffer.
+
+        Returns the size of the data read.
+        '''
+        assert self.is_open
+
+        received = self._read_from_console()
+        if isinstance(received, str):
+            received = self.encode(received)
+
+        self._reception_buffer.append(received)
+        return len(received)
+
     @abstractmethod
-    def _read_from_console(self) -> str:
-        '''Read and return all data available on the console'''
+    def _read_from_console(self) -> bytes:
+        '''Read and return all data available on the console, undecoded'''
+
+    @property
+    def can_wait_for_data(self) -> bool:
+        '''Return whether "wait_for_data" returns as soon as data is received'''
+        return False
+
+    def wait_for_data(self, timeout: float) -> bool:
+        '''Wait a maximum duration of 'timeout' for data to be available.
+
+        Returns True if data may be available. Engines unable to wait on the
+        console simply sleep for 'timeout', see "can_wait_for_data".
+        '''
+        time.sleep(timeout)
+        return True
 
     @abstractmethod
     def wait_for_match(self, match: List[str], timeout: int = None) -> MatchResult:
@@ -134,13 +192,13 @@ class ConsoleEngine(ABC):
 
     @property
     def reception_buffer_size(self) -> int:
-        '''Size of the reception buffer for the console'''
+        '''Size of the reception buffer for the console, in bytes'''
         return len(self._reception_buffer)
 
     @property
     def reception_buffer(self) -> str:
         '''Content of the reception buffer'''
-        return self._reception_buffer
+        return self._reception_buffer.text
 
     @abstractmethod
     def interact(self):
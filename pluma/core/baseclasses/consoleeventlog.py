@@ -0,0 +1,249 @@
+import bisect
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional
+
+""" Identifies console event log files, followed by the format version """
+EVENT_LOG_MAGIC = b'PLUMAEVT'
+EVENT_LOG_VERSION = 1
+EVENT_LOG_HEADER = struct.Struct('<8sH')
+
+""" Record header: time (s since epoch), kind, console id, and data size """
+EVENT_RECORD_HEADER = struct.Struct('<dBHI')
+
+EVENT_RECEIVED = 0
+EVENT_SENT = 1
+EVENT_CONSOLE = 2
+EVENT_DIRECTIONS = {EVENT_RECEIVED: 'received', EVENT_SENT: 'sent'}
+
+""" Maximum duration, in seconds, for which events stay in memory """
+DEFAULT_EVENT_LOG_FLUSH_INTERVAL_S = 1
+
+
+@dataclass(frozen=True)
+class ConsoleEvent:
+    time: float
+    direction: str
+    console: str
+    data: bytes
+
+
+class ConsoleEventLog():
+    '''Append-only log of the data sent and received on consoles, with timestamps.
+
+    The file starts with a header, followed by a binary record per chunk
+    of data sent or received: its time, direction, console id and data.
+    A record maps each console id to a console name on its first use.
+    Records are written in time order, with times never decreasing, so
+    that :class:`ConsoleEventReader` can seek by time.
+
+    Consoles share the log of a path with :meth:`acquire`, and
+    :meth:`release` it when closed. Opening an existing log appends to it.
+    '''
+
+    _shared: Dict[str, 'ConsoleEventLog'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: str,
+                 flush_interval_s: float = DEFAULT_EVENT_LOG_FLUSH_INTERVAL_S):
+        self.path = path
+        self.flush_interval_s = flush_interval_s
+        self._lock = threading.Lock()
+        self._users = 0
+        self._consoles: Dict[str, int] = {}
+        self._last_time = 0
+        self._last_flush = time.monotonic()
+
+        logdir = os.path.dirname(path)
+        if logdir:
+            os.makedirs(logdir, exist_ok=True)
+
+        end = 0
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            reader = ConsoleEventReader(path)
+            self._consoles = {name: console_id
+                              for console_id, name in reader.consoles.items()}
+            self._last_time = reader.end_time or 0
+            end = reader.end_offset
+
+        self._file: BinaryIO = open(path, 'r+b' if end else 'wb')
+        if end:
+            # Drop a record partly written, if the log was not closed
+            self._file.truncate(end)
+            self._file.seek(end)
+        else:
+            self._file.write(EVENT_LOG_HEADER.pack(EVENT_LOG_MAGIC, EVENT_LOG_VERSION))
+
+    @classmethod
+    def acquire(cls, path: str) -> 'ConsoleEventLog':
+        '''Return the log shared for "path", opening it if needed'''
+        path = os.path.abspath(path)
+        with cls._shared_lock:
+            event_log = cls._shared.get(path)
+            if not event_log:
+                event_log = cls._shared[path] = cls(path)
+            event_log._users += 1
+            return event_log
+
+    def release(self):
+        '''Stop using a log returned by :meth:`acquire`, closing it if unused'''
+        with self._shared_lock:
+            self._users -= 1
+            if self._users <= 0:
+                self._shared.pop(self.path, None)
+                self.close()
+
+    def console_id(self, name: str) -> int:
+        '''Return the id of the console "name" in the log, adding it if needed'''
+        with self._lock:
+            console_id = self._consoles.get(name)
+            if console_id is None:
+                console_id = self._consoles[name] = len(self._consoles)
+                self._write_record(EVENT_CONSOLE, console_id, name.encode())
+
+            return console_id
+
+    def received(self, console_id: int, data: bytes):
+        '''Log "data" received on the console "console_id"'''
+        if data:
+            with self._lock:
+                self._write_record(EVENT_RECEIVED, console_id, data)
+
+    def sent(self, console_id: int, data: bytes):
+        '''Log "data" sent on the console "console_id"'''
+        if data:
+            with self._lock:
+                self._write_record(EVENT_SENT, console_id, data)
+
+    def flush(self):
+        with self._lock:
+            if self._file:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def _write_record(self, kind: int, console_id: int, data: bytes):
+        if not self._file:
+            return
+
+        # Keep times ordered if the clock goes backward
+        self._last_time = max(time.time(), self._last_time)
+        self._file.write(EVENT_RECORD_HEADER.pack(self._last_time, kind, console_id,
+                                                  len(data)))
+        self._file.write(data)
+
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval_s:
+            self._file.flush()
+            self._last_flush = now
+
+
+class ConsoleEventReader():
+    '''Read a console event log, seeking by time.
+
+    The record headers are indexed when the reader is created, without
+    reading the data, so that :meth:`events` reads only the records in
+    the time range requested.
+    '''
+
+    def __init__(self, path: str):
+        self.path = path
+        self.consoles: Dict[int, str] = {}
+        self._times = array('d')
+        self._offsets = array('q')
+        self.end_offset = EVENT_LOG_HEADER.size
+        self._index()
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    @property
+    def start_time(self) -> Optional[float]:
+        '''Time of the first event, or None if empty'''
+        return self._times[0] if self._times else None
+
+    @property
+    def end_time(self) -> Optional[float]:
+        '''Time of the last event, or None if empty'''
+        return self._times[-1] if self._times else None
+
+    def events(self, start: float = None, end: float = None,
+               consoles: Iterable[str] = None) -> Iterator[ConsoleEvent]:
+        '''Return the events between the times "start" and "end" included.
+
+        Only events of the console names in "consoles" are returned, if set.
+        '''
+        first = bisect.bisect_left(self._times, start) if start is not None else 0
+        last = bisect.bisect_right(self._times, end) if end is not None else len(self)
+        if first >= last:
+            return
+
+        consoles = set(consoles) if consoles is not None else None
+        with open(self.path, 'rb') as f:
+            f.seek(self._offsets[first])
+            remaining = last - first
+            while remaining:
+                event_time, kind, console_id, size = EVENT_RECORD_HEADER.unpack(
+                    f.read(EVENT_RECORD_HEADER.size))
+                if kind == EVENT_CONSOLE:
+                    f.seek(size, os.SEEK_CUR)
+                    continue
+
+                remaining -= 1
+                console = self.consoles.get(console_id)
+                if consoles is not None and console not in consoles:
+                    f.seek(size, os.SEEK_CUR)
+                    continue
+
+                yield ConsoleEvent(time=event_time, direction=EVENT_DIRECTIONS[kind],
+                                   console=console, data=f.read(size))
+
+    def _index(self):
+        size = os.path.getsize(self.path)
+        if size < EVENT_LOG_HEADER.size:
+            raise ValueError(f'"{self.path}" is not a console event log')
+
+        with open(self.path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, version = EVENT_LOG_HEADER.unpack_from(data)
+            if magic != EVENT_LOG_MAGIC or version != EVENT_LOG_VERSION:
+                raise ValueError(f'"{self.path}" is not a console event log '
+                                 f'(version {EVENT_LOG_VERSION})')
+
+            # Only the record headers are read, from the memory-mapped file
+            unpack_header = EVENT_RECORD_HEADER.unpack_from
+            header_size = EVENT_RECORD_HEADER.size
+            offset = self.end_offset
+            while offset + header_size <= size:
+                event_time, kind, console_id, data_size = unpack_header(data, offset)
+                record_end = offset + header_size + data_size
+                if record_end > size:
+                    # Record partly written
+                    break
+
+                if kind == EVENT_CONSOLE:
+                    self.consoles[console_id] = \
+                        data[offset + header_size:record_end].decode()
+                else:
+                    self._times.append(event_time)
+                    self._offsets.append(offset)
+
+                offset = self.end_offset = record_end
+
+
+def format_console_events(events: Iterable[ConsoleEvent], start_time: float = 0,
+                          encoding: str = 'ascii') -> Iterator[str]:
+    '''Return a line per event, with its time relative to "start_time"'''
+    for event in events:
+        arrow = '<' if event.direction == 'received' else '>'
+        text = event.data.decode(encoding, 'replace')
+        yield f'[{event.time - start_time:12.6f}] {event.console} {arrow} {text!r}'
@@ -1,11 +1,14 @@
 import datetime
 import os
+import threading
 
 from enum import Enum, IntEnum
-from typing import Iterable
+from typing import Callable, Iterable, List, Tuple, Union
 from pluma.utils import datetime_to_timestamp
 
 from .hierarchy import hier_setter
+from .logrotation import LogRotation
+from .logsink import LogFileSink
 from .singleton import Singleton
 
 """ Enable logging """
@@ -26,6 +29,8 @@ DEFAULT_LOG_TIME = False
 """ Add log name to logs """
 DEFAULT_LOG_NAME = None
 
+""" Rotation of log files, none by default """
+DEFAULT_LOG_ROTATION = None
 STYLE_NORMAL = '\033[0m'
 STYLE_BOLD = '\033[1m'
 COLOR_STYLES = {
@@ -71,11 +76,33 @@ class LogMode(Enum):
             return int(LogLevel.DEBUG)
 
 
+""" Minimum level of the messages written to log files """
+# Log files keep all messages, as they did before log file levels, since
+# debug messages are needed to investigate failures. Raising "log_file_level"
+# skips building and writing them.
+DEFAULT_LOG_FILE_LEVEL = LogLevel.DEBUG
+
+
+def render_message(message: Union[str, Callable[[], str]], args: tuple = ()) -> str:
+    '''Return the text of a log message, only built once the message is to be output.
+
+    "message" can be a callable returning the message, and is formatted
+    with "args" if set, with str.format.
+    '''
+    if callable(message):
+        message = message()
+    if args:
+        message = message.format(*args)
+    return message
+
+
 class Logger(Singleton):
     '''Global log manager for the standard output.
 
     Handles the text formatting and what to output
     based on log levels and log mode.
+
+    The output can be held per thread, see :meth:`hold`.
     '''
 
     def __init__(self):
@@ -84,35 +111,54 @@ class Logger(Singleton):
 
         self._initialized = True
         self.mode = LogMode.NORMAL
-        self.held = False
-        self.log_buffer = ''
+        self._holds = threading.local()
+        self._output_lock = threading.Lock()
+
+    @property
+    def mode(self) -> LogMode:
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode: LogMode):
+        self._mode = mode
+        # Checked for every message, most of them being filtered out
+        self._min_level = mode.min_level()
 
-    def log(self, message, color=None, bold=False, newline=True, bypass_hold=False, level=None):
+    def enabled_for(self, level: LogLevel = None) -> bool:
+        '''Return True if messages of "level" are output in the current mode'''
         if level is None:
             level = LogLevel.NOTICE
 
-        if level < self.mode.min_level():
+        return level >= self._min_level
+
+    def log(self, message, color=None, bold=False, newline=True, bypass_hold=False, level=None,
+            args=()):
+        '''Output "message" if "level" is enabled.
+
+        The message is only built if output, see :func:`render_message`.
+        '''
+        if not self.enabled_for(level):
             return
 
-        self._log(message, color, bold, newline, bypass_hold)
+        self._log(render_message(message, args), color, bold, newline, bypass_hold)
 
-    def debug(self, message):
-        self.log(message, level=LogLevel.DEBUG)
+    def debug(self, message, *args):
+        self.log(message, level=LogLevel.DEBUG, args=args)
 
-    def notice(self, message):
-        self.log(message, level=LogLevel.NOTICE)
+    def notice(self, message, *args):
+        self.log(message, level=LogLevel.NOTICE, args=args)
 
-    def info(self, message):
-        self.log(message, level=LogLevel.INFO)
+    def info(self, message, *args):
+        self.log(message, level=LogLevel.INFO, args=args)
 
-    def warning(self, message):
-        self.log(message, color='yellow', level=LogLevel.WARNING)
+    def warning(self, message, *args):
+        self.log(message, color='yellow', level=LogLevel.WARNING, args=args)
 
-    def important(self, message):
-        self.log(message, level=LogLevel.IMPORTANT)
+    def important(self, message, *args):
+        self.log(message, level=LogLevel.IMPORTANT, args=args)
 
-    def error(self, message):
-        self.log(message, color='red', level=LogLevel.ERROR)
+    def error(self, message, *args):
+        self.log(message, color='red', level=LogLevel.ERROR, args=args)
 
     def _log(self, message, color=None, bold=False, newline=True, bypass_hold=False):
         # Use message in list form for consistent multiline messages
@@ -134,21 +180,55 @@ class Logger(Singleton):
         if newline:
             message += os.linesep
 
-        if self.held and not bypass_hold:
-            self.log_buffer += message
+        buffers = self._hold_buffers()
+        if buffers and not bypass_hold:
+            buffers[-1][1].append(message)
+        elif len(buffers) > 1:
+            # Bypass only the innermost hold
+            buffers[-2][1].append(message)
         else:
-            print(message, end='', flush=not newline)
+            self._output(message, flush=not newline)
+
+    @property
+    def held(self) -> bool:
+        '''Return whether the log output of the current thread is held'''
+        return bool(self._hold_buffers())
+
+    def hold(self, separator: str = os.linesep):
+        '''Hold the log output of the current thread until `release` is called.
 
-    def hold(self):
-        '''Hold the log output until `release` is called.'''
-        self.held = True
+        "separator" is added after the log held, if any, when released.
+        Holds can be nested, messages logged with "bypass_hold" only bypassing
+        the innermost hold. Other threads are not affected.
+        '''
+        self._hold_buffers().append((separator, []))
 
     def release(self):
-        '''Flush the log, and restore log output to normal.'''
-        self.held = False
-        if self.log_buffer:
-            self._log(self.log_buffer)
-        self.log_buffer = ''
+        '''Flush the log held by the current thread at once, and end the hold.'''
+        buffers = self._hold_buffers()
+        if not buffers:
+            return
+
+        separator, messages = buffers.pop()
+        if messages:
+            held = ''.join(messages) + separator
+            if buffers:
+                buffers[-1][1].append(held)
+            else:
+                self._output(held, flush=False)
+
+    def _hold_buffers(self) -> List[Tuple[str, List[str]]]:
+        '''Return the stack of separators and log buffers held by the current thread'''
+        try:
+            return self._holds.buffers
+        except AttributeError:
+            self._holds.buffers = []
+            return self._holds.buffers
+
+    def _output(self, text: str, flush: bool):
+        # Output of different threads is not mixed within a message
+        with self._output_lock:
+            print(text, end='', flush=flush)
 
 
 class Logging():
@@ -218,6 +298,30 @@ class Logging():
     def log_file(self, log_file):
         self._log_file = log_file
 
+    @property
+    def log_rotation(self) -> LogRotation:
+        if hasattr(self, "_log_rotation"):
+            return self._log_rotation
+        else:
+            return DEFAULT_LOG_ROTATION
+
+    @log_rotation.setter
+    @hier_setter
+    def log_rotation(self, log_rotation: LogRotation):
+        self._log_rotation = log_rotation
+
+    @property
+    def log_file_level(self):
+        if hasattr(self, "_log_file_level"):
+            return self._log_file_level
+        else:
+            return DEFAULT_LOG_FILE_LEVEL
+
+    @log_file_level.setter
+    @hier_setter
+    def log_file_level(self, log_file_level):
+        self._log_file_level = log_file_level
+
     @property
     def log_echo(self):
         if hasattr(self, "_log_echo"):
@@ -251,47 +355,60 @@ class Logging():
 
     def log_file_clear(self):
         if self.log_file:
-            open(self.log_file, 'w').close()
+            LogFileSink().truncate(self.log_file, rotation=self.log_rotation)
 
     def log(self, message, color=None, bold=False, force_echo=None,
-            force_log_file=False, newline=True, bypass_hold=False, level=None):
-        prefix = ''
+            force_log_file=False, newline=True, bypass_hold=False, level=None, args=()):
+        '''Log "message" to the log file, and to the standard output if echoed.
 
+        Messages below "log_file_level" are not written to the log file, and
+        those below the Logger mode level are not echoed. The message is
+        only built if output, see :func:`render_message`.
+        '''
+        if level is None:
+            level = LogLevel.NOTICE
+
+        logger = Logger()
         if force_echo is not None:
             echo = force_echo
         else:
             echo = self.log_echo
+        echo = echo and logger.enabled_for(level)
 
         if force_log_file is not False:
             log_file = force_log_file
         else:
             log_file = self.log_file
+        if level < self.log_file_level:
+            log_file = None
+
+        # Check before any formatting, as most debug messages are not output
+        if not (echo or log_file) or logger.mode == LogMode.SILENT:
+            return
 
-        if self.log_on:
-            if self.log_hier_path:
-                prefix = '[{}]{}'.format(self.log_hier_path, prefix)
-            if self.log_name:
-                prefix = '{}{}'.format(self.log_name, prefix)
-            if self.log_time and self.log_time_format:
-                timestr = datetime.datetime.now().strftime(self.log_time_format)
-                prefix = '{} {}'.format(timestr, prefix)
-            if prefix:
-                message = '{}: {}'.format(prefix, message)
-            if log_file:
-                logdir = os.path.dirname(log_file)
-                if logdir and not os.path.exists(logdir):
-                    os.makedirs(logdir)
-                with open(log_file, 'a', encoding='utf-8') as logfd:
-                    logfd.write(message + '\n')
-
-            if echo:
-                logger = Logger()
-                logger.log(message.replace('\\n', '\n'), color=color, bold=bold,
-                           newline=newline, bypass_hold=bypass_hold, level=level)
-
-    def hold_log(self):
+        message = render_message(message, args)
+        prefix = ''
+        if self.log_hier_path:
+            prefix = '[{}]{}'.format(self.log_hier_path, prefix)
+        if self.log_name:
+            prefix = '{}{}'.format(self.log_name, prefix)
+        if self.log_time and self.log_time_format:
+            timestr = datetime.datetime.now().strftime(self.log_time_format)
+            prefix = '{} {}'.format(timestr, prefix)
+        if prefix:
+            message = '{}: {}'.format(prefix, message)
+        if log_file:
+            # Written by a background thread, and flushed at once for warnings
+            LogFileSink().write(log_file, message + '\n', flush=level >= LogLevel.WARNING,
+                                rotation=self.log_rotation)
+
+        if echo:
+            logger.log(message.replace('\\n', '\n'), color=color, bold=bold,
+                       newline=newline, bypass_hold=bypass_hold, level=level)
+
+    def hold_log(self, separator: str = os.linesep):
         global_log = Logger()
-        global_log.hold()
+        global_log.hold(separator=separator)
 
     def release_log(self):
         global_log = Logger()
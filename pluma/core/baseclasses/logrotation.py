@@ -0,0 +1,200 @@
+import gzip
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Union
+
+""" Extension of the rotated log files, per compression """
+LOG_COMPRESSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+""" Format of the time added to rotated log files, sorting by time """
+ROTATED_LOG_TIME_FORMAT = '%Y%m%d-%H%M%S-%f'
+
+
+@dataclass(frozen=True)
+class LogRotation:
+    '''When to rotate a log file, and what to keep of the rotated files.
+
+    A log file is rotated once it reaches "max_bytes", or "max_age_s"
+    seconds after it was opened. The file is renamed with the time of the
+    rotation appended (e.g. "board.log.20210102-030405-000000"), and
+    compressed if "compression" is set ("gzip", or "zstd" if the
+    "zstandard" package is installed). Only the last "backup_count"
+    rotated files are kept.
+    '''
+    max_bytes: Optional[int] = None
+    max_age_s: Optional[float] = None
+    backup_count: int = 5
+    compression: Optional[str] = None
+
+    def __post_init__(self):
+        if self.compression is not None and self.compression not in LOG_COMPRESSIONS:
+            raise ValueError(f'Invalid log compression "{self.compression}". '
+                             f'Supported compressions: {list(LOG_COMPRESSIONS)}')
+
+        if self.compression == 'zstd':
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                raise ValueError('Log compression "zstd" requires the "zstandard" package')
+
+        if self.max_bytes is not None and self.max_bytes <= 0:
+            raise ValueError('The maximum size of log files must be positive')
+
+        if self.max_age_s is not None and self.max_age_s <= 0:
+            raise ValueError('The maximum age of log files must be positive')
+
+        if self.backup_count < 0:
+            raise ValueError('The number of rotated log files kept cannot be negative')
+
+
+class RotatingLogFile():
+    '''Binary log file rotated according to a :class:`LogRotation`.
+
+    Can be used in place of a file opened in binary mode, by the writers of
+    log files: it supports "write", "flush" and "close". Text written is
+    encoded with "encoding". Rotated files are compressed by a background
+    thread, so that writers do not wait for the compression.
+    '''
+
+    def __init__(self, path: str, rotation: LogRotation, truncate: bool = False,
+                 encoding: str = 'utf-8'):
+        self.path = path
+        self.rotation = rotation
+        self.encoding = encoding
+        self._file = None
+        self._size = 0
+        self._opened_time = None
+        self._compressions: List[threading.Thread] = []
+        self._open(truncate=truncate)
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def write(self, data: Union[bytes, str]) -> int:
+        if isinstance(data, str):
+            data = data.encode(self.encoding, 'backslashreplace')
+
+        if self._size and self._should_rotate(len(data)):
+            self.rotate()
+
+        self._file.write(data)
+        self._size += len(data)
+        return len(data)
+
+    def flush(self):
+        if self._file:
+            self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def rotate(self):
+        '''Rotate the log file now, and open a new, empty one'''
+        self.close()
+        rotated_path = f'{self.path}.{datetime.now().strftime(ROTATED_LOG_TIME_FORMAT)}'
+        os.replace(self.path, rotated_path)
+
+        # Compressing also removes old files, once done
+        self._compressions = [thread for thread in self._compressions if thread.is_alive()]
+        thread = threading.Thread(target=self._compress_and_clean, args=(rotated_path,),
+                                  name='RotatingLogFile', daemon=True)
+        thread.start()
+        self._compressions.append(thread)
+
+        self._open(truncate=True)
+
+    def wait_for_compressions(self, timeout: float = None):
+        '''Wait for the rotated files to be compressed, and the old ones removed'''
+        for thread in self._compressions:
+            thread.join(timeout)
+
+    def rotated_files(self) -> List[str]:
+        '''Return the paths of the rotated log files, oldest first'''
+        logdir = os.path.dirname(self.path) or '.'
+        prefix = f'{os.path.basename(self.path)}.'
+        rotated = []
+        for name in os.listdir(logdir):
+            if not name.startswith(prefix):
+                continue
+
+            suffix = name[len(prefix):]
+            for extension in LOG_COMPRESSIONS.values():
+                if suffix.endswith(extension):
+                    suffix = suffix[:-len(extension)]
+            try:
+                datetime.strptime(suffix, ROTATED_LOG_TIME_FORMAT)
+            except ValueError:
+                continue
+
+            rotated.append(os.path.join(logdir, name))
+
+        return sorted(rotated)
+
+    def _should_rotate(self, size: int) -> bool:
+        max_bytes = self.rotation.max_bytes
+        if max_bytes is not None and self._size + size > max_bytes:
+            return True
+
+        max_age_s = self.rotation.max_age_s
+        return max_age_s is not None and time.monotonic() - self._opened_time >= max_age_s
+
+    def _open(self, truncate: bool):
+        logdir = os.path.dirname(self.path)
+        if logdir:
+            os.makedirs(logdir, exist_ok=True)
+
+        self._file = open(self.path, 'wb' if truncate else 'ab')
+        self._size = self._file.tell()
+        self._opened_time = time.monotonic()
+
+    def _compress_and_clean(self, rotated_path: str):
+        try:
+            if self.rotation.compression:
+                compress_log_file(rotated_path, self.rotation.compression)
+        except OSError:
+            # The rotated file is kept uncompressed
+            pass
+
+        rotated = self.rotated_files()
+        for path in rotated[:max(0, len(rotated) - self.rotation.backup_count)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def compress_log_file(path: str, compression: str) -> str:
+    '''Compress the file "path", replacing it. Returns the path of the compressed file.'''
+    compressed_path = f'{path}{LOG_COMPRESSIONS[compression]}'
+    temp_path = f'{compressed_path}.tmp'
+
+    with open(path, 'rb') as source:
+        if compression == 'zstd':
+            import zstandard
+            with open(temp_path, 'wb') as destination:
+                zstandard.ZstdCompressor().copy_stream(source, destination)
+        else:
+            with gzip.open(temp_path, 'wb') as destination:
+                shutil.copyfileobj(source, destination)
+
+    os.replace(temp_path, compressed_path)
+    os.remove(path)
+    return compressed_path
+
+
+def open_log_file(path: str, rotation: LogRotation = None, truncate: bool = False):
+    '''Open the log file "path" for writing bytes, rotated if "rotation" is set'''
+    if rotation:
+        return RotatingLogFile(path, rotation, truncate=truncate)
+
+    logdir = os.path.dirname(path)
+    if logdir:
+        os.makedirs(logdir, exist_ok=True)
+    return open(path, 'wb' if truncate else 'ab')
@@ -0,0 +1,195 @@
+import atexit
+import collections
+import os
+import threading
+import time
+from typing import Dict, Optional, TextIO
+
+from .logrotation import LogRotation, RotatingLogFile
+from .singleton import Singleton
+
+""" Maximum number of writes queued, before writers wait for the log files """
+DEFAULT_LOG_QUEUE_SIZE = 10000
+
+""" Maximum duration, in seconds, for which writes stay in memory """
+DEFAULT_LOG_FLUSH_INTERVAL_S = 1
+
+""" Number of writes queued for which the writer thread is woken up """
+DEFAULT_LOG_BATCH_SIZE = 1000
+
+
+class LogFileSink(Singleton):
+    '''Write log files from a background thread, keeping them open.
+
+    Log lines are queued, and written in batches by a writer thread which
+    keeps a file open per path. Files are flushed when a write requests it
+    (e.g. for errors), at most every "flush_interval_s" seconds otherwise,
+    and when the program exits. The queue is bounded, so that writers wait
+    for the log files rather than using unbounded memory.
+
+    Use :meth:`flush` to wait for the lines queued to be written, before
+    reading a log file. Files are rotated if a :class:`LogRotation` is set
+    for them, when they are opened.
+    '''
+
+    def __init__(self, queue_size: int = DEFAULT_LOG_QUEUE_SIZE,
+                 flush_interval_s: float = DEFAULT_LOG_FLUSH_INTERVAL_S):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.queue_size = queue_size
+        self.flush_interval_s = flush_interval_s
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._wake = None
+        self._thread = None
+        self._files: Dict[str, TextIO] = {}
+        atexit.register(self.close)
+
+    def write(self, path: str, text: str, flush: bool = False,
+              rotation: LogRotation = None):
+        '''Append "text" to the file "path", flushing it soon if "flush" is set'''
+        self._put(('write', path, text, flush, rotation))
+        if len(self._queue) >= self.queue_size:
+            # Wait for the log files, rather than using unbounded memory
+            self.flush()
+
+    def truncate(self, path: str, rotation: LogRotation = None):
+        '''Empty the file "path", after the writes already queued'''
+        self._put(('truncate', path, None, False, rotation))
+
+    def flush(self, timeout: float = None) -> bool:
+        '''Wait for the writes queued to be written and flushed to the files.
+
+        Returns False if not done within "timeout" seconds.
+        '''
+        if not self._running():
+            return True
+
+        done = threading.Event()
+        self._put(('flush', None, done, True, None))
+        return done.wait(timeout)
+
+    def close(self):
+        '''Write the lines queued, close all the files and stop the writer thread'''
+        with self._lock:
+            if not self._running():
+                return
+
+            self._put(('stop', None, None, True, None))
+            self._thread.join()
+            self._thread = None
+
+    def _running(self) -> bool:
+        return self._thread is not None and self._pid == os.getpid() and \
+            self._thread.is_alive()
+
+    def _put(self, item: tuple):
+        '''Queue a write, starting the writer thread if needed'''
+        if not self._running():
+            self._start()
+
+        # Appending to a deque is thread safe, and much cheaper than a
+        # queue.Queue. The writer is only woken up for a batch, or a flush.
+        self._queue.append(item)
+        if item[3] or len(self._queue) >= DEFAULT_LOG_BATCH_SIZE:
+            self._wake.set()
+
+    def _start(self):
+        with self._lock:
+            if not self._running():
+                # Files and thread of a parent process are not usable after a fork
+                self._files = {}
+                self._pid = os.getpid()
+                self._queue = collections.deque()
+                self._wake = threading.Event()
+                self._thread = threading.Thread(target=self._write_loop,
+                                                name='LogFileSink', daemon=True)
+                self._thread.start()
+
+    def _write_loop(self):
+        dirty = set()
+        last_flush = time.monotonic()
+        stop = False
+
+        while not stop:
+            self._wake.wait(self.flush_interval_s)
+            self._wake.clear()
+
+            flush = False
+            events = []
+            while self._queue:
+                action, path, value, flush_requested, rotation = self._queue.popleft()
+                flush |= flush_requested
+                if action == 'write':
+                    self._write(path, value, rotation)
+                    dirty.add(path)
+                elif action == 'truncate':
+                    self._open(path, rotation, truncate=True)
+                    dirty.add(path)
+                elif action == 'flush':
+                    events.append(value)
+                elif action == 'stop':
+                    stop = True
+
+            if flush or stop or time.monotonic() - last_flush >= self.flush_interval_s:
+                for path in dirty:
+                    self._flush(path)
+                dirty.clear()
+                last_flush = time.monotonic()
+
+            for event in events:
+                event.set()
+
+        for log_file in self._files.values():
+            try:
+                log_file.close()
+            except Exception:
+                pass
+        self._files = {}
+
+    def _open(self, path: str, rotation: LogRotation = None,
+              truncate: bool = False) -> Optional[TextIO]:
+        log_file = self._files.pop(path, None)
+        if log_file and truncate:
+            try:
+                log_file.close()
+            except Exception:
+                pass
+            log_file = None
+
+        if not log_file:
+            try:
+                logdir = os.path.dirname(path)
+                if logdir:
+                    os.makedirs(logdir, exist_ok=True)
+                if rotation:
+                    log_file = RotatingLogFile(path, rotation, truncate=truncate)
+                else:
+                    log_file = open(path, 'w' if truncate else 'a', encoding='utf-8',
+                                    errors='backslashreplace')
+            except Exception:
+                # Logging must not stop the tests, or the writer thread:
+                # lines for this file are lost
+                return None
+
+        self._files[path] = log_file
+        return log_file
+
+    def _write(self, path: str, text: str, rotation: LogRotation = None):
+        log_file = self._files.get(path) or self._open(path, rotation)
+        try:
+            if log_file:
+                log_file.write(text)
+        except Exception:
+            pass
+
+    def _flush(self, path: str):
+        log_file = self._files.get(path)
+        try:
+            if log_file:
+                log_file.flush()
+        except Exception:
+            pass
@@ -1,18 +1,32 @@
+import select
+import time
+
 import pexpect
 import pexpect.fdpexpect
 
 from typing import List
 
 from pluma.core.baseclasses import ConsoleEngine, MatchResult
+from .logrotation import LogRotation
+from .streammatcher import StreamMatcher
 from .logging import Logger
 
 log = Logger()
 
+""" Maximum number of bytes read from the console in a single read """
+DEFAULT_READ_CHUNK_SIZE = 4096
+
 
 class PexpectEngine(ConsoleEngine):
-    def __init__(self, linesep: str = None, encoding: str = None, raw_logfile: str = None):
+    def __init__(self, linesep: str = None, encoding: str = None, raw_logfile: str = None,
+                 read_chunk_size: int = None, search_window_size: int = None,
+                 event_logfile: str = None, event_log_name: str = None,
+                 raw_log_rotation: LogRotation = None):
         super().__init__(linesep=linesep, encoding=encoding,
-                         raw_logfile=raw_logfile)
+                         raw_logfile=raw_logfile, event_logfile=event_logfile,
+                         event_log_name=event_log_name, raw_log_rotation=raw_log_rotation)
+        self.read_chunk_size = read_chunk_size or DEFAULT_READ_CHUNK_SIZE
+        self.search_window_size = search_window_size
         self._pex = None
 
     def _open_process(self, command: str):
@@ -44,23 +58,50 @@ class PexpectEngine(ConsoleEngine):
 
     def send(self, data: str):
         assert self.is_open
-        self._pex.send(data)
-
-    def _read_from_console(self) -> str:
-        received = ''
+        written = self._pex.send(data)
+        if self._event_log:
+            # pexpect sends text encoded in utf-8, whatever the engine encoding
+            sent = data if isinstance(data, bytes) else data.encode('utf-8')
+            self._log_sent(sent[:written])
+
+    def _read_from_console(self) -> bytes:
+        # Drain all data already available in large chunks, without waiting
+        # for more. Decoding is left to the reception buffer, which decodes
+        # incrementally when the text is requested.
+        received = []
         try:
-            while 1:
-                received += self.decode(
-                    self._pex.read_nonblocking(1, 0.01))
+            while self._has_data(timeout=0):
+                received.append(
+                    self._pex.read_nonblocking(self.read_chunk_size, timeout=0))
         except pexpect.TIMEOUT:
             pass
         except pexpect.EOF:
             pass
 
+        received = b''.join(received)
+        self._log_received(received)
         return received
 
+    @property
+    def can_wait_for_data(self) -> bool:
+        return True
+
+    def wait_for_data(self, timeout: float) -> bool:
+        assert self.is_open
+        return self._has_data(timeout=max(timeout, 0))
+
+    def _has_data(self, timeout: float) -> bool:
+        '''Return whether data can be read from the console within "timeout"'''
+        readable, __, __ = select.select([self._pex.child_fd], [], [], timeout)
+        return bool(readable)
+
     def wait_for_match(self, match: List[str], timeout: int = None) -> MatchResult:
-        '''Wait a maximum duration of 'timeout' for a matching regex'''
+        '''Wait a maximum duration of 'timeout' for a matching regex.
+
+        On match, the data received up to the end of the match is consumed
+        from the reception buffer. Only the data received since the last
+        search is searched, see :class:`StreamMatcher`.
+        '''
         assert self.is_open
 
         timeout = timeout or self._pex.timeout
@@ -68,34 +109,36 @@ class PexpectEngine(ConsoleEngine):
         if not isinstance(match, list):
             match = [match]
 
-        log.debug(f'Waiting up to {timeout}s for patterns: {match}...')
+        log.debug('Waiting up to {}s for patterns: {}...', timeout, match)
 
-        matched_regex = None
-        try:
-            index = self._pex.expect(match, timeout)
-            matched_regex = match[index]
-        except pexpect.EOF:
-            pass
-        except pexpect.TIMEOUT:
-            pass
+        matcher = StreamMatcher(match, search_window_size=self.search_window_size)
+        deadline = time.time() + timeout
+        stream_match = None
+        while True:
+            # Data received before the process ended can still be read
+            is_open = self.is_open
+            self._reception_buffer.append(self._read_from_console())
+            stream_match = matcher.feed(
+                self._reception_buffer.text_from(matcher.position))
+            if stream_match:
+                break
 
-        if matched_regex:
-            log.debug(f'Matched {matched_regex}')
-        else:
-            log.debug('No match found before timeout or EOF')
+            remaining_time = deadline - time.time()
+            if remaining_time <= 0 or not is_open:
+                break
 
-        # Pexpect exposes received via '.before'
-        received = self._pex.before
-        if matched_regex:
-            matched_text = self._pex.after
-            received += matched_text
-        else:
-            matched_regex = None
-            matched_text = None
-
-        return MatchResult(regex_matched=matched_regex,
-                           text_matched=self.decode(matched_text),
-                           text_received=self.decode(received))
+            self._has_data(timeout=remaining_time)
+
+        if not stream_match:
+            log.debug('No match found before timeout or EOF')
+            return MatchResult(regex_matched=None, text_matched=None,
+                               text_received=self._reception_buffer.text)
+
+        log.debug('Matched {}', stream_match.regex)
+        text_received = self._reception_buffer.consume(stream_match.end)
+        return MatchResult(regex_matched=stream_match.regex,
+                           text_matched=stream_match.text,
+                           text_received=text_received)
 
     def interact(self):
         assert self.is_open
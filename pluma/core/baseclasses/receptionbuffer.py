@@ -0,0 +1,128 @@
+import codecs
+import re
+
+""" Characters standing for the bytes that could not be decoded """
+UNDECODED_BYTES = re.compile('[\udc80-\udcff]')
+REPLACE_UNDECODED_BYTES = {char: '\ufffd' for char in range(0xdc80, 0xdd00)}
+
+
+class ReceptionBuffer:
+    '''Append-optimised buffer for the data received on a console.
+
+    Data is stored as raw bytes, and only decoded when the text content is
+    requested. Decoding is incremental: only the data appended since the
+    last request is decoded, and the decoded text is cached. Each byte that
+    cannot be decoded is replaced by one U+FFFD character.
+    '''
+
+    def __init__(self, encoding: str = None):
+        self.encoding = encoding or 'ascii'
+        self._decoder = self._new_decoder()
+        self._initial_state = self._decoder.getstate()
+        self.clear()
+
+    def clear(self):
+        '''Discard the content of the buffer.
+
+        Incomplete multi-byte characters at the end of the buffer are kept
+        by the decoder, to be completed by the next data appended.
+        '''
+        self._data = bytearray()
+        self._data_state = self._decoder.getstate()
+        self._decoded_size = 0
+        self._text_parts = []
+        self._text = ''
+        self._text_length = 0
+
+    def consume(self, size: int) -> str:
+        '''Remove and return the first "size" characters of the decoded content'''
+        text = self.text
+        consumed = text[:size]
+        remaining = text[size:]
+
+        del self._data[:self._encoded_size(consumed)]
+        self._data_state = self._initial_state
+        self._decoded_size = len(self._data)
+        self._text_parts = [remaining]
+        self._text = remaining
+        self._text_length = len(remaining)
+
+        return consumed
+
+    def append(self, data: bytes):
+        '''Append raw data to the buffer'''
+        if data:
+            self._data += data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def data(self) -> bytes:
+        '''Raw content of the buffer'''
+        return bytes(self._data)
+
+    @property
+    def text(self) -> str:
+        '''Decoded content of the buffer'''
+        self._decode()
+
+        if self._text is None:
+            self._text = ''.join(self._text_parts)
+            self._text_parts = [self._text]
+
+        return self._text
+
+    def text_from(self, start: int) -> str:
+        '''Decoded content of the buffer, from the character at index "start".
+
+        Only the text requested is copied, which makes reading the text
+        received since a previous read independent of the buffer size.
+        '''
+        self._decode()
+
+        size = self._text_length - start
+        if size <= 0:
+            return ''
+
+        parts = []
+        collected = 0
+        for part in reversed(self._text_parts):
+            parts.append(part)
+            collected += len(part)
+            if collected >= size:
+                break
+
+        parts[-1] = parts[-1][collected - size:]
+        return ''.join(reversed(parts))
+
+    def _new_decoder(self) -> codecs.IncrementalDecoder:
+        # Undecodable bytes are escaped one by one, so that each character
+        # decoded still matches a known number of bytes
+        return codecs.getincrementaldecoder(self.encoding)('surrogateescape')
+
+    def _encoded_size(self, text: str) -> int:
+        '''Number of bytes at the beginning of the data decoded as "text"'''
+        if '\ufffd' in text:
+            # Decode the data again to know the bytes that were replaced
+            decoder = self._new_decoder()
+            decoder.setstate(self._data_state)
+            text = decoder.decode(bytes(self._data))[:len(text)]
+
+        # Incomplete characters at the beginning were decoded with previous data
+        pending = self._data_state[0]
+        return len(text.encode(self.encoding, 'surrogateescape')) - len(pending)
+
+    def _decode(self):
+        '''Decode the data appended since the last decoding'''
+        if self._decoded_size < len(self._data):
+            new_text = self._decoder.decode(
+                memoryview(self._data)[self._decoded_size:].tobytes())
+            self._decoded_size = len(self._data)
+            if UNDECODED_BYTES.search(new_text):
+                new_text = new_text.translate(REPLACE_UNDECODED_BYTES)
+
+            if new_text:
+                self._text_parts.append(new_text)
+                self._text_length += len(new_text)
+                self._text = None
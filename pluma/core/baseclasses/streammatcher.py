@@ -0,0 +1,145 @@
+import re
+
+from _sre import MAXREPEAT
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+@dataclass(frozen=True)
+class StreamMatch:
+    index: int
+    regex: str
+    text: str
+    start: int
+    end: int
+
+
+class PatternSet:
+    '''Compiled list of regular expressions, searched together.
+
+    Use :func:`compile_patterns` to get a pattern set, which caches
+    pattern sets already compiled.
+    '''
+
+    def __init__(self, patterns: Tuple[str, ...]):
+        self.patterns = tuple(patterns)
+        self.regexes = [re.compile(pattern) for pattern in self.patterns]
+        self.max_lengths = [self._max_match_length(regex) for regex in self.regexes]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    @staticmethod
+    def _max_match_length(regex) -> Optional[int]:
+        '''Return the maximum length of a match for "regex", or None if unbounded'''
+        try:
+            __, max_length = sre_parse.parse(regex.pattern, regex.flags).getwidth()
+        except Exception:
+            return None
+
+        return max_length if max_length < MAXREPEAT else None
+
+
+@lru_cache(maxsize=256)
+def _compile_patterns(patterns: Tuple[str, ...]) -> PatternSet:
+    return PatternSet(patterns)
+
+
+def compile_patterns(patterns: List[str]) -> PatternSet:
+    '''Return the compiled pattern set for "patterns", from cache if available'''
+    if not isinstance(patterns, (list, tuple)):
+        patterns = [patterns]
+
+    return _compile_patterns(tuple(patterns))
+
+
+class StreamMatcher:
+    '''Search a list of regular expressions in a stream of text.
+
+    Text is fed as it is received, and only the new text, plus the end of
+    the text previously fed that a match could still span, is searched.
+    The look-back is the maximum match length for each pattern. Patterns of
+    unbounded length, such as ".*", search all the text since the start of
+    the stream or the last match, unless "search_window_size" is set: they
+    then only look back "search_window_size" characters, and a match
+    spanning more than that before the text last fed may be missed.
+
+    Match positions are absolute offsets in the stream. When several
+    patterns match, the match starting first is returned, or the first
+    pattern in the list for matches starting at the same offset. Text up to
+    the end of a match is discarded, and never matched again.
+    '''
+
+    def __init__(self, patterns: List[str], search_window_size: int = None):
+        self.pattern_set = compile_patterns(patterns)
+        self.search_window_size = search_window_size
+
+        self._lookbacks = [self._lookback(max_length)
+                           for max_length in self.pattern_set.max_lengths]
+        # Keep an extra character, so that "^" never matches at the start of
+        # a window which is not the start of the stream
+        self._tail_size = None if None in self._lookbacks else \
+            max(self._lookbacks, default=0) + 1
+        self.reset()
+
+    def _lookback(self, max_length: Optional[int]) -> Optional[int]:
+        '''Return the look-back of a pattern, or None to search all the text kept'''
+        if max_length is None:
+            return self.search_window_size
+
+        if self.search_window_size is None:
+            return max_length
+
+        return min(max_length, self.search_window_size)
+
+    def reset(self, offset: int = 0):
+        '''Discard the text fed, and restart the stream at "offset"'''
+        self._tail = ''
+        self._tail_start = offset
+        self._scan_offsets = [offset] * len(self.pattern_set)
+
+    @property
+    def position(self) -> int:
+        '''Offset in the stream of the end of the text fed'''
+        return self._tail_start + len(self._tail)
+
+    def feed(self, text: str) -> Optional[StreamMatch]:
+        '''Append "text" to the stream, and return the first match found, if any'''
+        window = self._tail + text
+        window_start = self._tail_start
+        end = window_start + len(window)
+
+        first_match = None
+        for index, regex in enumerate(self.pattern_set.regexes):
+            scan_offset = self._scan_offsets[index]
+            match = regex.search(window, scan_offset - window_start)
+            if self._lookbacks[index] is not None:
+                self._scan_offsets[index] = max(scan_offset, end - self._lookbacks[index])
+
+            if match and (first_match is None or match.start() < first_match.start()):
+                first_match = match
+                first_index = index
+
+        if first_match is None:
+            tail_offset = max(len(window) - self._tail_size, 0) \
+                if self._tail_size is not None else 0
+            self._tail = window[tail_offset:]
+            self._tail_start = window_start + tail_offset
+            return None
+
+        result = StreamMatch(index=first_index,
+                             regex=self.pattern_set.patterns[first_index],
+                             text=first_match.group(0),
+                             start=window_start + first_match.start(),
+                             end=window_start + first_match.end())
+
+        self._tail = window[first_match.end():]
+        self._tail_start = result.end
+        self._scan_offsets = [result.end] * len(self.pattern_set)
+
+        return result
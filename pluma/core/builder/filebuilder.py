@@ -78,7 +78,7 @@ class CommandFileBuilder(FileBuilder):
         log.info(f'Building "{self.target_name}"...')
         FileBuilder.create_directory(self.install_dir)
 
-        log.debug(f'Build command = "{self.build_command}"')
+        log.debug('Build command = "{}"', self.build_command)
 
         try:
             out = subprocess.check_output(
@@ -87,7 +87,7 @@ class CommandFileBuilder(FileBuilder):
             raise TestsBuildError(
                 f'Failed to build "{self.target_name}": {e.output.decode()}')
 
-        log.debug(f'Build output = "{out.decode()}"')
+        log.debug(lambda: f'Build output = "{out.decode()}"')
 
         if not self.output_filepath.is_file():
             raise TestsBuildError(f'The build generated no output for target "{self.target_name}": '
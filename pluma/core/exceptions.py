@@ -8,3 +8,4 @@ from .multimeter import MultimeterError, MultimeterInvalidKeyPress,\
     MultimeterMeasurementError, MultimeterDecodeError
 from .pdu import PDUError, PDUInvalidPort, PDURequestError
 from .usb import USBError, USBNoDevice
+from .sshtransport import SSHTransportError
@@ -17,7 +17,10 @@ class HostConsole(ConsoleBase):
         return f'{self.__class__.__name__}[{command}]'
 
     def open(self):
-        self.engine.open(console_cmd=self.command)
+        self.open_with_engine(self.engine)
+
+    def open_with_engine(self, engine):
+        engine.open(console_cmd=self.command)
 
     def interact(self):
         if not self.is_open:
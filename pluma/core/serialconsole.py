@@ -23,6 +23,15 @@ class SerialConsole(ConsoleBase):
         return super().is_open and self._ser and self._ser.isOpen()
 
     def open(self):
+        self.open_with_engine(self.engine)
+
+        if not self.is_open:
+            raise RuntimeError(f'Failed to open serial port {self.port}')
+
+        self.log(f'Init serial {self.port} success', level=LogLevel.DEBUG)
+        return
+
+    def open_with_engine(self, engine):
         self.log(f'Trying to open serial port {self.port}', level=LogLevel.DEBUG)
         self._ser = Serial(
             port=self.port,
@@ -30,20 +39,20 @@ class SerialConsole(ConsoleBase):
             timeout=self._timeout
         )
 
-        self.engine.open(console_fd=self._ser.fileno())
+        engine.open(console_fd=self._ser.fileno())
 
+    def close(self):
         if not self.is_open:
-            raise RuntimeError(f'Failed to open serial port {self.port}')
+            return
 
-        self.log(f'Init serial {self.port} success', level=LogLevel.DEBUG)
-        return
+        self.close_with_engine(self.engine)
 
-    def close(self):
-        if not self.is_open:
+    def close_with_engine(self, engine):
+        if not self._ser:
             return
 
         self._ser.flush()
-        super().close()
+        engine.close()
         self._ser.close()
         self._ser = None
         self.log("Closed serial", level=LogLevel.DEBUG)
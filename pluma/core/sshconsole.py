@@ -1,8 +1,9 @@
 import subprocess
 
-from pluma.core.baseclasses import ConsoleCannotOpenError
+from pluma.core.baseclasses import ConsoleCannotOpenError, ConsoleError, ExecResult
 from .hostconsole import HostConsole
 from .dataclasses import SystemContext
+from .sshtransport import SSHTransport
 
 
 class SSHConsole(HostConsole):
@@ -15,18 +16,12 @@ class SSHConsole(HostConsole):
         if not system.credentials.login:
             raise ValueError("A login must be provided for an SSH console")
 
-        login = system.credentials.login
-        password = system.credentials.password
+        # Shells and file copies share a single connection to the target
+        self.transport = SSHTransport.get(target=target,
+                                          login=system.credentials.login,
+                                          password=system.credentials.password)
 
-        if not password:
-            command = f'ssh {login}@{target} -o StrictHostKeyChecking=no'
-        else:
-            command = \
-                f'sshpass -p {password} ssh {login}@{target}' \
-                ' -o PreferredAuthentications=password' \
-                ' -o PubkeyAuthentication=no -o StrictHostKeyChecking=no'
-
-        super().__init__(command, system=system)
+        super().__init__(self.transport.shell_command(), system=system)
 
     def open(self):
         try:
@@ -36,29 +31,31 @@ class SSHConsole(HostConsole):
             self.close()
             raise ConsoleCannotOpenError
 
+    def open_with_engine(self, engine):
+        self.transport.connect()
+        super().open_with_engine(engine)
+
     @property
     def support_file_copy(self):
         return True
 
     def copy_to_host(self, source, destination, timeout=30):
-        return self._scp_copy(f'{self.system.credentials.login}@{self.target}:{source}',
-                              destination, timeout=timeout)
+        return self.transport.copy_to_host(source, destination, timeout=timeout)
 
     def copy_to_target(self, source, destination, timeout=30):
-        return self._scp_copy(source,
-                              f'{self.system.credentials.login}@{self.target}:{destination}',
-                              timeout=timeout)
+        return self.transport.copy_to_target(source, destination, timeout=timeout)
 
-    def _scp_copy(self, scp_source, scp_destination, timeout=30):
-        command = f'scp {scp_source} {scp_destination}'
-        if self.system.credentials.password:
-            command = f'sshpass -p {self.system.credentials.password} {command}'
+    @property
+    def support_exec(self):
+        return True
 
+    def exec(self, command: str, timeout: float = None) -> ExecResult:
+        '''Run a command on the target, in a separate channel of the SSH connection'''
         try:
-            command_list = command.split()
-            subprocess.check_output(command_list, stderr=subprocess.STDOUT)
-        except subprocess.CalledProcessError as e:
-            raise Exception(
-                f'Failed to copy (scp) "{scp_source}" to "{scp_destination}".\n'
-                f'  Command {command} failed with error:\n'
-                f'    "{e.output.decode()}"')
+            result = self.transport.run(command, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            raise ConsoleError(f'Command "{command}" did not complete within {timeout}s')
+
+        return ExecResult(stdout=self.engine.decode(result.stdout) or '',
+                          stderr=self.engine.decode(result.stderr) or '',
+                          retcode=result.returncode)
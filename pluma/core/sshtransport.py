@@ -0,0 +1,258 @@
+import atexit
+import hashlib
+import os
+import shlex
+import subprocess
+import tempfile
+import threading
+
+from typing import Dict, List, Tuple
+
+from .baseclasses import ConsoleError, Logger
+
+log = Logger()
+
+""" Directory containing the control sockets of the SSH connections """
+DEFAULT_CONTROL_DIR = os.path.join('/tmp', 'pluma', 'ssh')
+""" Seconds an unused SSH connection is kept open """
+DEFAULT_CONTROL_PERSIST = 600
+""" Seconds allowed to establish an SSH connection """
+DEFAULT_CONNECT_TIMEOUT = 10
+""" Exit code of the ssh client on connection errors """
+SSH_CONNECTION_ERROR = 255
+
+
+class SSHTransportError(ConsoleError):
+    pass
+
+
+class SSHTransport:
+    '''Persistent SSH connection to a target, shared by all its users.
+
+    A single authenticated connection is kept open in the background (using
+    OpenSSH "ControlMaster"), and interactive shells, command executions and
+    file copies are multiplexed over it, avoiding a new handshake for each.
+
+    Use :meth:`SSHTransport.get` to get the transport for a target. The
+    connection is re-established when it is lost, e.g. after the target
+    rebooted.
+
+    Each process uses its own connection, and only closes the connection it
+    established, so concurrent runs and worker processes do not close each
+    other's connections.
+    '''
+    _transports: Dict[Tuple[str, str], 'SSHTransport'] = {}
+    _transports_lock = threading.Lock()
+
+    def __init__(self, target: str, login: str, password: str = None,
+                 control_dir: str = None, control_persist: int = None):
+        if not target:
+            raise ValueError('A host/target must be provided for an SSH transport')
+
+        if not login:
+            raise ValueError('A login must be provided for an SSH transport')
+
+        self.target = target
+        self.login = login
+        self.password = password
+        self.control_dir = control_dir or DEFAULT_CONTROL_DIR
+        self.control_persist = control_persist or DEFAULT_CONTROL_PERSIST
+        self._lock = threading.RLock()
+        # Process which established the shared connection, if any
+        self._master_pid = None
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}[{self.destination}]'
+
+    @classmethod
+    def get(cls, target: str, login: str, password: str = None) -> 'SSHTransport':
+        '''Return the transport shared for "login" on "target"'''
+        with cls._transports_lock:
+            transport = cls._transports.get((target, login))
+            if transport is None or transport.password != password:
+                transport = cls(target=target, login=login, password=password)
+                cls._transports[(target, login)] = transport
+
+            return transport
+
+    @classmethod
+    def disconnect_all(cls):
+        '''Close the connections of all shared transports'''
+        with cls._transports_lock:
+            transports = list(cls._transports.values())
+
+        for transport in transports:
+            transport.disconnect()
+
+    @property
+    def destination(self) -> str:
+        return f'{self.login}@{self.target}'
+
+    @property
+    def control_path(self) -> str:
+        '''Path of the control socket of the connection of the current process'''
+        # Unix socket paths are limited in size, so name sockets with a hash
+        socket_id = f'{self.destination}:{os.getpid()}'
+        socket_hash = hashlib.sha1(socket_id.encode()).hexdigest()[:16]
+        return os.path.join(self.control_dir, f'{socket_hash}.sock')
+
+    @property
+    def _owns_connection(self) -> bool:
+        return self._master_pid == os.getpid()
+
+    def ssh_options(self) -> List[str]:
+        '''Options used by SSH clients to connect through the shared connection'''
+        options = [
+            '-o', 'StrictHostKeyChecking=no',
+            '-o', f'ControlPath={self.control_path}',
+            '-o', 'ServerAliveInterval=5',
+            '-o', 'ServerAliveCountMax=3',
+            '-o', f'ConnectTimeout={DEFAULT_CONNECT_TIMEOUT}',
+        ]
+
+        if self.password:
+            options.extend(['-o', 'PreferredAuthentications=password',
+                            '-o', 'PubkeyAuthentication=no'])
+
+        return options
+
+    def _auth_prefix(self) -> List[str]:
+        return ['sshpass', '-p', self.password] if self.password else []
+
+    def ssh_command(self, command: str = None) -> List[str]:
+        '''Return the ssh command running "command", or a shell if None'''
+        ssh_command = [*self._auth_prefix(), 'ssh', *self.ssh_options(),
+                       '-o', 'ControlMaster=no', self.destination]
+        if command is not None:
+            ssh_command.append(command)
+
+        return ssh_command
+
+    def shell_command(self) -> str:
+        '''Return the command opening an interactive shell on the target'''
+        return ' '.join(shlex.quote(arg) for arg in self.ssh_command())
+
+    @property
+    def is_connected(self) -> bool:
+        '''Return whether the shared connection is established.
+
+        This queries the connection, so runs an ssh client each time.
+        '''
+        if not os.path.exists(self.control_path):
+            return False
+
+        result = subprocess.run(
+            ['ssh', '-o', f'ControlPath={self.control_path}', '-O', 'check',
+             self.destination],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL)
+        return result.returncode == 0
+
+    def connect(self):
+        '''Establish the shared connection, if not already established'''
+        with self._lock:
+            # Assume an established connection is alive, until a command
+            # fails with a connection error
+            if self._owns_connection:
+                return
+
+            # A socket left by a connection which ended (e.g. target rebooted)
+            # prevents a new connection from listening on the same path
+            self._remove_control_socket()
+            os.makedirs(self.control_dir, mode=0o700, exist_ok=True)
+
+            log.debug('Opening SSH connection to {}', self.destination)
+            command = [*self._auth_prefix(), 'ssh', *self.ssh_options(),
+                       '-o', 'ControlMaster=yes',
+                       '-o', f'ControlPersist={self.control_persist}',
+                       '-N', '-f', self.destination]
+            # The connection keeps running in the background with the
+            # standard streams inherited, so errors are not read from a pipe,
+            # which would remain open.
+            with tempfile.TemporaryFile() as stderr:
+                try:
+                    result = subprocess.run(command, stdin=subprocess.DEVNULL,
+                                            stdout=subprocess.DEVNULL, stderr=stderr,
+                                            timeout=DEFAULT_CONNECT_TIMEOUT*2)
+                except subprocess.TimeoutExpired:
+                    raise SSHTransportError(
+                        f'Timed out while connecting to {self.destination}')
+
+                if result.returncode != 0:
+                    stderr.seek(0)
+                    raise SSHTransportError(
+                        f'Failed to connect to {self.destination}: '
+                        f'{stderr.read().decode(errors="replace").strip()}')
+
+            self._master_pid = os.getpid()
+
+    def disconnect(self):
+        '''Close the shared connection, if established by this process'''
+        with self._lock:
+            if not self._owns_connection:
+                return
+
+            self._master_pid = None
+            if os.path.exists(self.control_path):
+                subprocess.run(
+                    ['ssh', '-o', f'ControlPath={self.control_path}', '-O', 'exit',
+                     self.destination],
+                    stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL)
+            self._remove_control_socket()
+
+    def reconnect(self):
+        '''Close the shared connection and establish a new one'''
+        with self._lock:
+            self.disconnect()
+            self.connect()
+
+    def _remove_control_socket(self):
+        try:
+            os.remove(self.control_path)
+        except FileNotFoundError:
+            pass
+
+    def _run_connected(self, command: List[str], timeout: float = None,
+                       **kwargs) -> subprocess.CompletedProcess:
+        '''Run an ssh based "command", reconnecting once if the connection was lost'''
+        self.connect()
+
+        result = subprocess.run(command, timeout=timeout, stdin=subprocess.DEVNULL,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                **kwargs)
+        if result.returncode == SSH_CONNECTION_ERROR and not self.is_connected:
+            log.debug('SSH connection to {} lost, reconnecting', self.destination)
+            self.reconnect()
+            result = subprocess.run(command, timeout=timeout, stdin=subprocess.DEVNULL,
+                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                    **kwargs)
+
+        return result
+
+    def run(self, command: str, timeout: float = None) -> subprocess.CompletedProcess:
+        '''Run "command" on the target, and return its result'''
+        return self._run_connected(self.ssh_command(command), timeout=timeout)
+
+    def copy_to_target(self, source: str, destination: str, timeout: float = 30):
+        '''Copy "source" from the host to "destination" on the target'''
+        self._scp_copy(source, f'{self.destination}:{destination}', timeout=timeout)
+
+    def copy_to_host(self, source: str, destination: str, timeout: float = 30):
+        '''Copy "source" from the target to "destination" on the host'''
+        self._scp_copy(f'{self.destination}:{source}', destination, timeout=timeout)
+
+    def _scp_copy(self, scp_source: str, scp_destination: str, timeout: float = 30):
+        command = ['scp', *self.ssh_options(), '-o', 'ControlMaster=no',
+                   scp_source, scp_destination]
+
+        result = self._run_connected([*self._auth_prefix(), *command], timeout=timeout)
+        if result.returncode != 0:
+            output = (result.stdout + result.stderr).decode(errors='replace')
+            raise SSHTransportError(
+                f'Failed to copy (scp) "{scp_source}" to "{scp_destination}".\n'
+                f'  Command {" ".join(command)} failed with error:\n'
+                f'    "{output}"')
+
+
+atexit.register(SSHTransport.disconnect_all)
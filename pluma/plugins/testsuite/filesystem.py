@@ -1,80 +1,158 @@
-from pluma.test import ShellTest
+import threading
+from typing import List
+
+from pluma.core.baseclasses import ConsoleBase, ExecResult
+from pluma.test import CommandRunner, ShellTest, TestBase
 from pluma import Board
 
 
-class FileExists(ShellTest):
+class FilesystemCheckBatch:
+    '''Consecutive filesystem checks, run together in a single script.
+
+    The script is run by the first check requesting its result, and the
+    following checks use the results already received.
+    '''
+
+    def __init__(self, checks: List['FilesystemCheck']):
+        self.checks = checks
+        self.results = None
+        # Checks run on the host may request their result concurrently
+        self._lock = threading.Lock()
+
+    def result(self, check: 'FilesystemCheck', console: ConsoleBase) -> ExecResult:
+        '''Return the result of "check", or None if it did not complete'''
+        with self._lock:
+            if self.results is None:
+                self.results = CommandRunner.execute_batch(
+                    console=console, commands=[c.scripts[0] for c in self.checks],
+                    timeout=check.timeout, stop_on_error=False)
+
+        index = self.checks.index(check)
+        return self.results[index] if index < len(self.results) else None
+
+
+def plan_filesystem_checks(tests: List[TestBase]):
+    '''Group consecutive filesystem checks with the same "batch_key" into batches'''
+    batch_checks = []
+    for test in tests + [None]:
+        if isinstance(test, FilesystemCheck) and (
+                not batch_checks or test.batch_key == batch_checks[0].batch_key):
+            batch_checks.append(test)
+            continue
+
+        if len(batch_checks) > 1:
+            batch = FilesystemCheckBatch(batch_checks)
+            for check in batch_checks:
+                check.batch = batch
+        elif batch_checks:
+            batch_checks[0].batch = None
+
+        batch_checks = [test] if isinstance(test, FilesystemCheck) else []
+
+
+class FilesystemCheck(ShellTest):
+    '''Base class for filesystem tests, checking a path with a single command.
+
+    Consecutive filesystem checks in a sequence are run together, with a
+    single script sent to the console, while still being reported as
+    individual tests.
+    '''
+    planner = staticmethod(plan_filesystem_checks)
+
+    def __init__(self, board: Board, script: str, run_on_host: bool = False):
+        super().__init__(board, script=script, runs_in_shell=True, run_on_host=run_on_host)
+        self.batch = None
+
+    @property
+    def batch_key(self):
+        '''Checks with the same key can run in the same batch.
+
+        Checks from sequence entries with different dependencies or
+        resources may be scheduled at different times, and are not batched.
+        '''
+        return (self.board, self.run_on_host, self.sequence_node)
+
+    def test_body(self):
+        if not self.batch:
+            return super().test_body()
+
+        script = self.scripts[0]
+        result = self.batch.result(self, console=self.prepare_console())
+        if result is None:
+            CommandRunner.log_error(test_name=self._test_name, sent=script, output='',
+                                    error='No response within timeout, or failed device'
+                                    ' failed to send return code')
+
+        if result.retcode != 0:
+            CommandRunner.log_error(test_name=self._test_name, sent=script,
+                                    output=result.stdout,
+                                    error=f'Command "{script}" returned with exit code '
+                                    f'{result.retcode}')
+
+        self.check_command_output(script=script, output=result.stdout)
+
+
+class FileExists(FilesystemCheck):
     def __init__(self, board: Board, path: str, run_on_host: bool = False):
-        super().__init__(board, script=f'[ -e "{path}" ]', runs_in_shell=True,
-                         run_on_host=run_on_host)
+        super().__init__(board, script=f'[ -e "{path}" ]', run_on_host=run_on_host)
 
 
-class FileIsRegular(ShellTest):
+class FileIsRegular(FilesystemCheck):
     def __init__(self, board: Board, path: str, run_on_host: bool = False):
-        super().__init__(board, script=f'[ -f "{path}" ]', runs_in_shell=True,
-                         run_on_host=run_on_host)
+        super().__init__(board, script=f'[ -f "{path}" ]', run_on_host=run_on_host)
 
 
-class FileIsDir(ShellTest):
+class FileIsDir(FilesystemCheck):
     def __init__(self, board: Board, path: str, run_on_host: bool = False):
-        super().__init__(board, script=f'[ -d "{path}" ]', runs_in_shell=True,
-                         run_on_host=run_on_host)
+        super().__init__(board, script=f'[ -d "{path}" ]', run_on_host=run_on_host)
 
 
-class FileIsNotEmpty(ShellTest):
+class FileIsNotEmpty(FilesystemCheck):
     def __init__(self, board: Board, path: str, run_on_host: bool = False):
-        super().__init__(board, script=f'[ -s "{path}" ]', runs_in_shell=True,
-                         run_on_host=run_on_host)
+        super().__init__(board, script=f'[ -s "{path}" ]', run_on_host=run_on_host)
 
 
-class FileIsEmpty(ShellTest):
+class FileIsEmpty(FilesystemCheck):
     def __init__(self, board: Board, path: str, run_on_host: bool = False):
-        super().__init__(board, script=f'[ ! -s "{path}" ]', runs_in_shell=True,
-                         run_on_host=run_on_host)
+        super().__init__(board, script=f'[ ! -s "{path}" ]', run_on_host=run_on_host)
 
 
-class FileIsCharDevice(ShellTest):
+class FileIsCharDevice(FilesystemCheck):
     def __init__(self, board: Board, path: str, run_on_host: bool = False):
-        super().__init__(board, script=f'[ -c "{path}" ]', runs_in_shell=True,
-                         run_on_host=run_on_host)
+        super().__init__(board, script=f'[ -c "{path}" ]', run_on_host=run_on_host)
 
 
-class FileIsBlockDevice(ShellTest):
+class FileIsBlockDevice(FilesystemCheck):
     def __init__(self, board: Board, path: str, run_on_host: bool = False):
-        super().__init__(board, script=f'[ -b "{path}" ]', runs_in_shell=True,
-                         run_on_host=run_on_host)
+        super().__init__(board, script=f'[ -b "{path}" ]', run_on_host=run_on_host)
 
 
-class FileIsSymlink(ShellTest):
+class FileIsSymlink(FilesystemCheck):
     def __init__(self, board: Board, path: str, run_on_host: bool = False):
-        super().__init__(board, script=f'[ -h "{path}" ]', runs_in_shell=True,
-                         run_on_host=run_on_host)
+        super().__init__(board, script=f'[ -h "{path}" ]', run_on_host=run_on_host)
 
 
-class FileIsSocket(ShellTest):
+class FileIsSocket(FilesystemCheck):
     def __init__(self, board: Board, path: str, run_on_host: bool = False):
-        super().__init__(board, script=f'[ -S "{path}" ]', runs_in_shell=True,
-                         run_on_host=run_on_host)
+        super().__init__(board, script=f'[ -S "{path}" ]', run_on_host=run_on_host)
 
 
-class FileIsReadable(ShellTest):
+class FileIsReadable(FilesystemCheck):
     def __init__(self, board: Board, path: str, run_on_host: bool = False):
-        super().__init__(board, script=f'[ -r "{path}" ]', runs_in_shell=True,
-                         run_on_host=run_on_host)
+        super().__init__(board, script=f'[ -r "{path}" ]', run_on_host=run_on_host)
 
 
-class FileIsWritable(ShellTest):
+class FileIsWritable(FilesystemCheck):
     def __init__(self, board: Board, path: str, run_on_host: bool = False):
-        super().__init__(board, script=f'[ -w "{path}" ]', runs_in_shell=True,
-                         run_on_host=run_on_host)
+        super().__init__(board, script=f'[ -w "{path}" ]', run_on_host=run_on_host)
 
 
-class FileIsExecutable(ShellTest):
+class FileIsExecutable(FilesystemCheck):
     def __init__(self, board: Board, path: str, run_on_host: bool = False):
-        super().__init__(board, script=f'[ -x "{path}" ]', runs_in_shell=True,
-                         run_on_host=run_on_host)
+        super().__init__(board, script=f'[ -x "{path}" ]', run_on_host=run_on_host)
 
 
-class CheckFileSize(ShellTest):
+class CheckFileSize(FilesystemCheck):
     def __init__(self, board: Board, path: str, min: str = None, max: str = None,
                  run_on_host: bool = False):
         conditions = []
@@ -85,4 +163,4 @@ class CheckFileSize(ShellTest):
 
         script = ' && '.join(conditions)
 
-        super().__init__(board, script=script, runs_in_shell=True, run_on_host=run_on_host)
\ No newline at end of file
+        super().__init__(board, script=script, run_on_host=run_on_host)
\ No newline at end of file
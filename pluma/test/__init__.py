@@ -1,8 +1,11 @@
 from .exceptions import TestingException, TaskFailed, AbortTesting
 from .testbase import TestBase
-from .testrunner import TestRunner
+from .scheduler import SequenceNode, TaskScheduler
+from .testrunner import TestRunner, TestRunnerParallel
 from .unittest import deferred_function
 from .testcontroller import TestController
+from .resultssink import ResultsSink, JsonlResultsSink, read_results_stream, \
+    compact_results_stream
 from .commandrunner import CommandRunner
 from .shelltest import ShellTest
 from .executabletest import ExecutableTest
@@ -1,8 +1,10 @@
 import os
 import re
+import shlex
+import uuid
 from typing import List
 
-from pluma.core.baseclasses import ConsoleBase, Logger
+from pluma.core.baseclasses import ConsoleBase, ConsoleError, ExecResult, Logger
 from pluma.test import TestingException, TaskFailed
 
 log = Logger()
@@ -12,6 +14,10 @@ class CommandRunner():
     @staticmethod
     def run(test_name: str, console: ConsoleBase, command: str, timeout: int = None) -> str:
         '''Run a command in a Shell context'''
+        if console.support_exec:
+            return CommandRunner.run_exec(test_name=test_name, console=console,
+                                          command=command, timeout=timeout)
+
         retcode_token = 'pluma-retcode='
         base_command = command
         command += f' ; echo {retcode_token}$?'
@@ -42,10 +48,135 @@ class CommandRunner():
                                     error=f'Command "{command}" {error}')
 
         output = CommandRunner.cleanup_command_output(command, output)
-        log.log(CommandRunner.format_command_log(sent=base_command, output=output))
+        log.log(lambda: CommandRunner.format_command_log(sent=base_command, output=output))
+
+        return output
+
+    @staticmethod
+    def run_exec(test_name: str, console: ConsoleBase, command: str,
+                 timeout: int = None) -> str:
+        '''Run a command out of the interactive shell, for consoles supporting it'''
+        timeout = timeout if timeout is not None else 10
+
+        try:
+            result = console.exec(command, timeout=timeout)
+        except ConsoleError as e:
+            CommandRunner.log_error(test_name=test_name, sent=command, output='',
+                                    error=str(e))
+
+        output = CommandRunner.exec_output(result)
+        if result.retcode != 0:
+            CommandRunner.log_error(test_name=test_name, sent=command, output=output,
+                                    error=f'Command "{command}" returned with exit code '
+                                    f'{result.retcode}')
+
+        log.log(lambda: CommandRunner.format_command_log(sent=command, output=output))
 
         return output
 
+    @staticmethod
+    def exec_output(result: ExecResult) -> str:
+        '''Return the output of a command ran with exec, as it would show in a shell'''
+        outputs = [result.stdout.strip(), result.stderr.strip()]
+        return os.linesep.join(output for output in outputs if output)
+
+    @staticmethod
+    def run_batch(test_name: str, console: ConsoleBase, commands: List[str],
+                  timeout: int = None) -> List[str]:
+        '''Run commands in a Shell context, sending them all at once.
+
+        Commands are run in order, stopping at the first command failing,
+        as successive calls to "run" would. Returns the output of each command.
+        '''
+        results = CommandRunner.execute_batch(console=console, commands=commands,
+                                              timeout=timeout)
+
+        outputs = []
+        for command, result in zip(commands, results):
+            if result.retcode != 0:
+                CommandRunner.log_error(test_name=test_name, sent=command,
+                                        output=result.stdout,
+                                        error=f'Command "{command}" returned with exit code '
+                                        f'{result.retcode}')
+
+            log.log(lambda: CommandRunner.format_command_log(sent=command,
+                                                             output=result.stdout))
+            outputs.append(result.stdout)
+
+        if len(results) < len(commands):
+            CommandRunner.log_error(test_name=test_name, sent=commands[len(results)],
+                                    output='',
+                                    error='No response within timeout, or failed device'
+                                    ' failed to send return code. If this is not running'
+                                    ' in a shell, set "runs_in_shell" to "false".')
+
+        return outputs
+
+    @staticmethod
+    def execute_batch(console: ConsoleBase, commands: List[str], timeout: int = None,
+                      stop_on_error: bool = True) -> List[ExecResult]:
+        '''Run commands in a Shell context, sending them in a single transmission.
+
+        Each command is followed by a marker, unique to the batch, carrying
+        its return code, which is used to split the output received between
+        commands. With "stop_on_error", commands following a failing command
+        are not run. "timeout" applies to each command.
+
+        Returns the results of the commands which completed, in order. Both
+        standard output and error are reported as "stdout".
+        '''
+        timeout = timeout if timeout is not None else 10
+        token = f'pluma-{uuid.uuid4().hex[:12]}'
+        lines = CommandRunner._batch_lines(token=token, commands=commands,
+                                           stop_on_error=stop_on_error)
+        # Quotes prevent the echo of the line sent from matching the marker
+        end_marker = f'{token}-done'
+        lines.append(f"echo {token}''-done")
+        script = '\n'.join(lines)
+
+        if console.support_exec:
+            try:
+                received = console.exec(f'exec 2>&1\n{script}',
+                                        timeout=timeout*len(commands)).stdout
+            except ConsoleError:
+                received = ''
+        else:
+            received, __ = console.send_and_expect(script, match=end_marker,
+                                                   timeout=timeout*len(commands))
+
+        return CommandRunner._parse_batch_output(token=token, received=received)
+
+    @staticmethod
+    def _batch_lines(token: str, commands: List[str], stop_on_error: bool) -> List[str]:
+        '''Return the shell lines running "commands", each between markers'''
+        variable_suffix = token.replace('-', '_')
+        retcode_variable = f'retcode_{variable_suffix}'
+        failed_variable = f'failed_{variable_suffix}'
+
+        lines = []
+        for index, command in enumerate(commands):
+            # Markers are printed from the same line as the command, so that
+            # prompts and echoes of the lines sent are never between them
+            line = (f"echo {token}''-{index}-start; eval {shlex.quote(command)}; "
+                    f"{retcode_variable}=$?; echo; echo {token}''-{index}=${retcode_variable}")
+            if stop_on_error:
+                line = (f'if [ -z "${failed_variable}" ]; then {line}; '
+                        f'[ ${retcode_variable} -eq 0 ] || {failed_variable}=1; fi')
+            lines.append(line)
+
+        lines.append(f'unset {retcode_variable} {failed_variable}')
+        return lines
+
+    @staticmethod
+    def _parse_batch_output(token: str, received: str) -> List[ExecResult]:
+        '''Split the output of a batch between its commands, using their markers'''
+        token = re.escape(token)
+        command_regex = re.compile(rf'{token}-(\d+)-start(.*?){token}-\1=(-?\d+)', re.DOTALL)
+
+        return [ExecResult(stdout=match.group(2).strip(), stderr='',
+                           retcode=int(match.group(3)))
+                for match in command_regex.finditer(received)]
+
     @staticmethod
     def run_raw(test_name: str, console: ConsoleBase, command: str, timeout: int = None) -> str:
         '''Run a command with minimal assumptions regarding the context'''
@@ -56,8 +187,7 @@ class CommandRunner():
             CommandRunner.log_error(test_name=test_name, sent=command, output=output,
                                     error='No response received after sending command')
         else:
-            message = CommandRunner.format_command_log(sent=command, output=output)
-            log.log(message)
+            log.log(lambda: CommandRunner.format_command_log(sent=command, output=output))
 
         return output
 
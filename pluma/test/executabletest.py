@@ -38,6 +38,12 @@ class ExecutableTest(TestBase):
         else:
             self.check_console_supports_copy(self.board.console)
 
+    def resources(self) -> list:
+        if self.run_on_host:
+            return []
+
+        return [self.board.console]
+
     def check_console_supports_copy(self, console: ConsoleBase):
         if not console:
             raise ValueError(
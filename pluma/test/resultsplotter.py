@@ -1,6 +1,13 @@
 from abc import ABC, abstractmethod
+from typing import List, Tuple
+
+import numpy
+import pandas
 import pygal
 
+""" Default maximum number of points plotted per series """
+DEFAULT_MAX_POINTS = 2000
+
 
 class ResultsPlotter(ABC):
     @abstractmethod
@@ -10,6 +17,50 @@ class ResultsPlotter(ABC):
 
 
 class DefaultResultsPlotter(ResultsPlotter):
+    '''Plot test results with pygal.
+
+    Series longer than "max_points" are decimated before being plotted, so
+    that charts of long runs stay small and quick to render:
+        "minmax": keep the lowest and highest values of each of max_points/2
+            consecutive ranges of points, so that outliers remain visible.
+        "lttb": keep the points forming the largest triangles with their
+            neighbours (Largest-Triangle-Three-Buckets), following the shape
+            of the series.
+    Decimation is disabled if "max_points" is None. Series of a field against
+    another field are not ordered, and are plotted without decimation.
+
+    If "rolling_window" is set, series against iterations plot the mean of
+    that many consecutive values instead, as :func:`pluma.utils.boot_graph`.
+    '''
+    DECIMATIONS = ['minmax', 'lttb']
+
+    def __init__(self, max_points: int = DEFAULT_MAX_POINTS, decimation: str = 'minmax',
+                 rolling_window: int = None):
+        if decimation not in self.DECIMATIONS:
+            raise AttributeError(f'decimation must be in {self.DECIMATIONS}')
+
+        self.max_points = max_points
+        self.decimation = decimation
+        self.rolling_window = rolling_window
+
+    def reduce_points(self, points: List[Tuple], ordered: bool = True) -> List[Tuple]:
+        '''Return the points of a series to plot, averaged and decimated.
+
+        Both assume the points are ordered by x, so the points are returned
+        unchanged if not "ordered", e.g. for a scatter of two fields.
+        '''
+        if not ordered:
+            return points
+
+        if self.rolling_window:
+            points = rolling_mean(points, self.rolling_window)
+
+        if self.max_points and len(points) > self.max_points:
+            decimate = decimate_lttb if self.decimation == 'lttb' else decimate_min_max
+            points = decimate(points, self.max_points)
+
+        return points
+
     def plot(self, file, results: list, test_names=None, fields=None, vs_type=None,
              title=None, output_format=None, config=None):
         """Create a graph of data fields from the test results data.
@@ -145,9 +196,72 @@ class DefaultResultsPlotter(ResultsPlotter):
 
         # Add points to chart
         for k, v in points_combined.items():
-            chart.add(k, v)
+            chart.add(k, self.reduce_points(v, ordered=vs_type != 'fields'))
 
         if output_format == 'svg':
             chart.render_to_file(file)
         elif output_format == 'png':
             chart.render_to_png(file)
+
+
+def rolling_mean(points: List[Tuple], window: int) -> List[Tuple]:
+    '''Return the mean of the values of each "window" consecutive points,
+    at the position of the last point of the window'''
+    if window <= 1 or not points:
+        return points
+
+    x, y = zip(*points)
+    means = pandas.Series(y, dtype=float).rolling(window=window).mean().to_list()
+    return list(zip(x[window-1:], means[window-1:]))
+
+
+def decimate_min_max(points: List[Tuple], max_points: int) -> List[Tuple]:
+    '''Return at most "max_points" points, keeping the points with the lowest
+    and highest values in each of max_points/2 consecutive ranges, in order'''
+    n_points = len(points)
+    if n_points <= max_points:
+        return points
+
+    y = numpy.array([point[1] for point in points], dtype=float)
+    edges = numpy.linspace(0, n_points, max(max_points // 2, 1) + 1).astype(int)
+    ranges = numpy.repeat(numpy.arange(len(edges) - 1), numpy.diff(edges))
+
+    # Sort by range, then value: the first and last of each range are its min and max
+    order = numpy.lexsort((y, ranges))
+    kept = numpy.unique(numpy.concatenate((order[edges[:-1]], order[edges[1:] - 1])))
+    return [points[index] for index in kept.tolist()]
+
+
+def decimate_lttb(points: List[Tuple], max_points: int) -> List[Tuple]:
+    '''Return "max_points" points of the series, selected with the
+    Largest-Triangle-Three-Buckets algorithm.
+
+    The first and last points are kept, and the other points are split in
+    max_points - 2 ranges. In each range, the point kept forms the largest
+    triangle with the point kept in the previous range and the average of
+    the points in the next range.
+    '''
+    n_points = len(points)
+    if n_points <= max_points or max_points < 3:
+        return points
+
+    x = numpy.array([point[0] for point in points], dtype=float)
+    y = numpy.array([point[1] for point in points], dtype=float)
+    edges = numpy.linspace(1, n_points - 1, max_points - 1).astype(int)
+
+    kept = [0]
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_end = edges[bucket + 2]
+            next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        previous = kept[-1]
+        areas = numpy.abs((x[previous] - next_x) * (y[start:end] - y[previous]) -
+                          (x[previous] - x[start:end]) * (next_y - y[previous]))
+        kept.append(start + int(numpy.argmax(areas)))
+
+    kept.append(n_points - 1)
+    return [points[index] for index in kept]
@@ -1,10 +1,20 @@
+import math
+import sys
 from abc import ABC, abstractmethod
-from typing import List
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy
+
 from pluma.test.testbase import TestBase
+from pluma.test.resultsstore import ResultsStore, ResultsView
 
 from statistics import mean, median_grouped, mode, stdev, variance,\
     StatisticsError
 
+""" Maximum number of groups of values kept by a FieldSummary, for chunked means """
+MAX_CHUNK_BUCKETS = 1024
+
 
 class ResultsProcessor(ABC):
     @abstractmethod
@@ -41,11 +51,12 @@ class DefaultResultsProcessor(ResultsProcessor):
             if testname not in results_summary:
                 results_summary[testname] = {}
 
-            for iteration, _ in enumerate(results):
-                for data_key in results[iteration]['TestRunner'][testname]['data']:
+            for result in results:
+                test_data = result['TestRunner'][testname]['data']
+                for data_key in test_data:
                     if data_key not in results_summary[testname]:
                         results_summary[testname][data_key] = {}
-                    data_value = results[iteration]['TestRunner'][testname]['data'][data_key]
+                    data_value = test_data[data_key]
 
                     # Collect values in list
                     if 'values' not in results_summary[testname][data_key]:
@@ -109,3 +120,445 @@ class DefaultResultsProcessor(ResultsProcessor):
                 del(results_summary[testname][data_key]['values'])
 
         return results_summary
+
+
+class FieldSummary():
+    '''Running summary of the values of a test data field.
+
+    Values are added one at a time, in constant time, without being stored:
+    the mean and variance are running moments (Welford's algorithm), and
+    chunked means are computed from the sums of at most MAX_CHUNK_BUCKETS
+    consecutive groups of values. The mode and median are computed from the
+    number of times each value was saved, kept for the "count" summary.
+
+    Summaries have the statistics of :class:`DefaultResultsProcessor`, but
+    are computed with floats, and may differ in the last digit. Chunked means
+    are exact up to MAX_CHUNK_BUCKETS values, and group values by buckets
+    after that.
+    '''
+
+    def __init__(self):
+        self.n_values = 0
+        # First value saved with each string, and the number of times it was saved
+        self.counted: Dict[str, list] = {}
+        self.all_numbers = True
+        self.all_ints = True
+        self.all_numbers_or_bools = True
+        self.max = None
+        self.min = None
+        # Running mean, and sum of squared differences to it, of finite values
+        self.n_finite = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.non_finite = set()
+        # Sum and number of values of consecutive groups of "bucket_size" values
+        self.buckets = []
+        self.bucket_size = 1
+
+    def add(self, value):
+        self.n_values += 1
+        key = str(value)
+        counted = self.counted.get(key)
+        if counted is None:
+            self.counted[key] = [value, 1]
+        else:
+            counted[1] += 1
+
+        is_bool = isinstance(value, bool)
+        is_number = isinstance(value, (int, float)) and not is_bool
+        self.all_numbers_or_bools &= is_number or is_bool
+        self.all_ints &= is_number and isinstance(value, int)
+        self.all_numbers &= is_number
+
+        if self.all_numbers:
+            if self.max is None or value > self.max:
+                self.max = value
+            if self.min is None or value < self.min:
+                self.min = value
+
+            if math.isfinite(value):
+                self.n_finite += 1
+                delta = value - self.mean
+                self.mean += delta / self.n_finite
+                self.m2 += delta * (value - self.mean)
+            else:
+                self.non_finite.add(key)
+
+        if self.all_numbers_or_bools:
+            self._add_to_buckets(value)
+        else:
+            self.buckets = None
+
+    def _add_to_buckets(self, value):
+        if self.buckets and self.buckets[-1][1] < self.bucket_size:
+            self.buckets[-1][0] += value
+            self.buckets[-1][1] += 1
+            return
+
+        if len(self.buckets) == MAX_CHUNK_BUCKETS:
+            # Merge pairs of buckets, all full, to keep their number bounded
+            self.buckets = [[first[0] + second[0], first[1] + second[1]]
+                            for first, second in zip(self.buckets[::2], self.buckets[1::2])]
+            self.bucket_size *= 2
+
+        self.buckets.append([value, 1])
+
+    def summary(self) -> dict:
+        summary = {'count': {key: count for key, (__, count) in self.counted.items()}}
+
+        # Can't generate statistics from a single data point
+        if self.n_values < 2:
+            return summary
+
+        # Statistics calculated for numbers only
+        if self.all_numbers:
+            variance = self._variance()
+            summary['max'] = self.max
+            summary['min'] = self.min
+            summary['mode'] = self._mode()
+            summary['mean'] = round(self._converted(self._mean()), 2)
+            summary['median'] = round(self._median_grouped(), 2)
+            summary['stdev'] = round(math.sqrt(variance), 2)
+            summary['variance'] = round(self._converted(variance), 2)
+
+        # Statistics calculated for numbers or booleans
+        if self.all_numbers_or_bools:
+            summary['chunked_mean'] = self._chunked_mean(10)
+
+        return summary
+
+    def _converted(self, value: float):
+        '''Return "value" as an int, if the "statistics" module would'''
+        return int(value) if self.all_ints and value.is_integer() else value
+
+    def _value_counts(self) -> dict:
+        '''Number of times each value was saved, in the order first saved.
+
+        Values equal as numbers, like 0.0 and -0.0, are counted together.
+        '''
+        counts = {}
+        for value, count in self.counted.values():
+            counts[value] = counts.get(value, 0) + count
+
+        return counts
+
+    def _mode(self):
+        counts = self._value_counts()
+        mode_count = max(counts.values())
+        modes = [value for value, count in counts.items() if count == mode_count]
+        # Before Python 3.8, no mode is returned unless it is unique
+        if sys.version_info < (3, 8) and len(modes) > 1:
+            return None
+
+        return modes[0]
+
+    def _mean(self) -> float:
+        if 'nan' in self.non_finite or {'inf', '-inf'} <= self.non_finite:
+            return math.nan
+        if self.non_finite:
+            return math.inf if 'inf' in self.non_finite else -math.inf
+
+        return self.mean + 0.0
+
+    def _variance(self) -> float:
+        if self.non_finite:
+            return math.nan
+
+        return self.m2 / (self.n_values - 1)
+
+    def _median_grouped(self):
+        middle = self.n_values // 2
+        counts = self._value_counts()
+
+        # Find the middle value, and the number of values below it
+        below = 0
+        for value in sorted(counts):
+            count = counts[value]
+            if below + count > middle:
+                break
+            below += count
+
+        return value - 0.5 + (self.n_values / 2 - below) / count
+
+    def _chunked_mean(self, n, sigfig=2):
+        '''Means of the values, in chunks of an n-th of the values, at most n'''
+        chunk_size = min(round(self.n_values/n) or 1, self.n_values)
+        end = min(self.n_values, chunk_size*n)
+
+        # Buckets are added to the chunk they start in
+        chunks = []
+        for index, (total, count) in enumerate(self.buckets):
+            start = index * self.bucket_size
+            if start >= end:
+                break
+
+            if start // chunk_size >= len(chunks):
+                chunks.append([0, 0])
+            chunks[-1][0] += total
+            chunks[-1][1] += count
+
+        chunked_mean_list = []
+        for total, count in chunks:
+            if isinstance(total, int) and total % count == 0:
+                chunk_mean = total // count
+            else:
+                chunk_mean = total / count + 0.0
+            chunked_mean_list.append(round(chunk_mean, sigfig))
+
+        return chunked_mean_list
+
+
+class StreamingResultsProcessor(ResultsProcessor):
+    '''Summarise test results as iterations complete.
+
+    Each iteration is added with :meth:`add_iteration`, in time proportional
+    to the number of data fields saved, instead of processing all the
+    results again for each summary. Summaries have the statistics of
+    :class:`DefaultResultsProcessor`, computed as described in
+    :class:`FieldSummary`.
+    '''
+
+    def __init__(self):
+        self.fields: Dict[str, Dict[str, FieldSummary]] = {}
+
+    def reset(self):
+        '''Remove all iterations added'''
+        self.fields = {}
+
+    def add_iteration(self, testrunner_data: dict):
+        '''Add the TestRunner data of an iteration to the summary'''
+        for testname, test_results in testrunner_data.items():
+            test_fields = self.fields.setdefault(testname, {})
+            for data_key, data_value in test_results['data'].items():
+                field = test_fields.get(data_key)
+                if field is None:
+                    field = test_fields[data_key] = FieldSummary()
+                field.add(data_value)
+
+    def add_store(self, store: ResultsStore):
+        '''Add all the iterations saved in a results store, one column at a time'''
+        for test_name in store.test_names:
+            test_fields = self.fields.setdefault(test_name, {})
+            for data_key in store.fields(test_name):
+                field = test_fields.get(data_key)
+                if field is None:
+                    field = test_fields[data_key] = FieldSummary()
+                for __, data_value in store.field_values(test_name, data_key):
+                    field.add(data_value)
+
+    def summary(self, tests: List[TestBase]) -> dict:
+        '''Return the summary of the iterations added, for "tests" with data'''
+        return self.tests_summary([str(test) for test in tests if test.data])
+
+    def tests_summary(self, test_names: List[str]) -> dict:
+        '''Return the summary of the iterations added, for tests named "test_names"'''
+        return {test_name: {data_key: field.summary() for data_key, field in
+                            self.fields.get(test_name, {}).items()}
+                for test_name in test_names}
+
+    def generate_summary(self, tests: List[TestBase], results: list) -> dict:
+        processor = StreamingResultsProcessor()
+        for result in results:
+            processor.add_iteration(result['TestRunner'])
+
+        return processor.summary(tests)
+
+
+class NumpyResultsProcessor(ResultsProcessor):
+    '''Summarise test results with vectorised NumPy statistics.
+
+    The values of each data field are converted to an array once, read
+    directly from the results store columns when possible, and all their
+    statistics are computed on the array. Summaries have the statistics of
+    :class:`DefaultResultsProcessor`, and the percentiles of numbers, as
+    "p50", "p90" and "p99".
+
+    Statistics are computed with floats, rather than exactly as with the
+    "statistics" module, and may differ in the last digit after rounding.
+    '''
+    PERCENTILES = [50, 90, 99]
+
+    def generate_summary(self, tests: List[TestBase], results: Sequence) -> dict:
+        results_summary = {}
+        for test in (t for t in tests if t.data):
+            testname = str(test)
+            results_summary[testname] = {
+                data_key: self.field_summary(values)
+                for data_key, values in self._fields_values(testname, results).items()}
+
+        return results_summary
+
+    @staticmethod
+    def _fields_values(testname: str, results: Sequence) -> Dict[str, Union[numpy.ndarray, list]]:
+        '''Return the values of each data field of a test, in the order saved'''
+        if isinstance(results, ResultsView):
+            store = results.store
+            fields_values = {}
+            for data_key in store.fields(testname):
+                values = store.field_array(testname, data_key)
+                if values is None:
+                    values = [value for __, value in store.field_values(testname, data_key)]
+                fields_values[data_key] = values
+
+            return fields_values
+
+        fields_values = {}
+        for result in results:
+            for data_key, data_value in result['TestRunner'][testname]['data'].items():
+                fields_values.setdefault(data_key, []).append(data_value)
+
+        return fields_values
+
+    def field_summary(self, values: Union[numpy.ndarray, list]) -> dict:
+        '''Return the summary of the values of a data field'''
+        values_array = self._typed_array(values)
+        # First index and count of each distinct value, in order of value
+        distinct = numpy.unique(values_array, return_index=True, return_counts=True)[1:] \
+            if values_array is not None else None
+        summary = {'count': self._count(values, values_array, distinct)}
+
+        # Can't generate statistics from a single data point
+        if len(values) < 2:
+            return summary
+
+        if values_array is None:
+            types = set(map(type, values))
+            if not types <= {int, float, bool}:
+                return summary
+
+            # Mixed ints, floats and booleans
+            values_array = numpy.asarray(values, dtype=float)
+            kind = 'b' if bool in types else 'f'
+            floats = numpy.fromiter((type(value) is float for value in values),
+                                    dtype=bool, count=len(values))
+            distinct = numpy.unique(values_array, return_index=True, return_counts=True)[1:]
+        else:
+            kind = values_array.dtype.kind
+            floats = None
+
+        # Statistics calculated for numbers only
+        if kind != 'b':
+            summary.update(self._numbers_summary(values, values_array, distinct))
+
+        # Statistics calculated for numbers or booleans
+        summary['chunked_mean'] = self._chunked_mean(values_array, 10, floats=floats)
+
+        return summary
+
+    @staticmethod
+    def _typed_array(values: Union[numpy.ndarray, list]) -> Optional[numpy.ndarray]:
+        '''Return values of a single type (bool, int or float) as an array, or None'''
+        if isinstance(values, numpy.ndarray):
+            return values
+
+        types = set(map(type, values))
+        if len(types) != 1:
+            return None
+
+        dtype = {bool: bool, int: numpy.int64, float: numpy.float64}.get(types.pop())
+        if dtype is None:
+            return None
+
+        try:
+            return numpy.asarray(values, dtype=dtype)
+        except OverflowError:
+            return None
+
+    @staticmethod
+    def _count(values: Union[numpy.ndarray, list], values_array: Optional[numpy.ndarray],
+               distinct: tuple) -> dict:
+        '''Return the number of times each value was saved, by string'''
+        if values_array is None:
+            return dict(Counter(map(str, values)))
+
+        first_indexes, counts = distinct
+        if values_array.dtype.kind == 'f' and \
+                (numpy.isnan(values_array) | (values_array == 0)).any():
+            # Values equal as floats may have different strings, like -0.0 and 0.0
+            __, first_indexes, counts = numpy.unique(values_array.view(numpy.int64),
+                                                     return_index=True, return_counts=True)
+
+        count = {}
+        order = numpy.argsort(first_indexes, kind='stable')
+        for index, value_count in zip(first_indexes[order].tolist(), counts[order].tolist()):
+            key = str(values_array[index].item())
+            count[key] = count.get(key, 0) + value_count
+
+        return count
+
+    def _numbers_summary(self, values: Union[numpy.ndarray, list],
+                         values_array: numpy.ndarray, distinct: tuple) -> dict:
+        n_values = len(values_array)
+        ints_only = values_array.dtype.kind in 'iu'
+        floats_array = values_array.astype(numpy.float64, copy=False)
+
+        def original(index: int):
+            '''Return the value saved at "index", with its original type'''
+            return values[index] if isinstance(values, list) else values_array[index].item()
+
+        def converted(value: float):
+            '''Return "value" as an int, if the "statistics" module would'''
+            return int(value) if ints_only and value.is_integer() else float(value)
+
+        # Mode, as the value with the highest count first saved
+        first_indexes, counts = distinct
+        modes = first_indexes[counts == counts.max()]
+        mode_value = original(int(modes.min()))
+        # Before Python 3.8, no mode is returned unless it is unique
+        if sys.version_info < (3, 8) and len(modes) > 1:
+            mode_value = None
+
+        # Median of values grouped in intervals of 1 centered on each value
+        sorted_values = numpy.sort(floats_array)
+        middle = sorted_values[n_values // 2]
+        below = numpy.searchsorted(sorted_values, middle, side='left')
+        middle_count = numpy.searchsorted(sorted_values, middle, side='right') - below
+        median = middle - 0.5 + (n_values / 2 - below) / middle_count
+
+        variance_value = float(numpy.var(floats_array, ddof=1))
+        percentiles = numpy.percentile(floats_array, self.PERCENTILES)
+
+        summary = {
+            'max': original(int(numpy.argmax(values_array))),
+            'min': original(int(numpy.argmin(values_array))),
+            'mode': mode_value,
+            'mean': round(converted(float(numpy.mean(floats_array))), 2),
+            'median': round(float(median), 2),
+            'stdev': round(math.sqrt(variance_value), 2),
+            'variance': round(converted(variance_value), 2),
+        }
+        for percentile, value in zip(self.PERCENTILES, percentiles.tolist()):
+            summary[f'p{percentile}'] = round(value, 2)
+
+        return summary
+
+    @staticmethod
+    def _chunked_mean(values_array: numpy.ndarray, n: int, floats: numpy.ndarray = None,
+                      sigfig: int = 2) -> list:
+        '''Means of the values, in chunks of an n-th of the values, at most n.
+
+        "floats" tells which values were floats, if not all of the same type.
+        '''
+        n_values = len(values_array)
+        chunk_size = min(round(n_values/n) or 1, n_values)
+        starts = numpy.arange(0, min(n_values, chunk_size*n), chunk_size)
+        sizes = numpy.minimum(chunk_size, n_values - starts)
+
+        floats_array = values_array.astype(numpy.float64, copy=False)
+        # Adding 0.0 makes means of -0.0 values 0.0, as exact means are
+        means = numpy.add.reduceat(floats_array, starts) / sizes + 0.0
+        # Means of chunks without floats are ints when whole, as with "statistics"
+        if floats is not None:
+            ints_only = numpy.add.reduceat(floats, starts) == 0
+        else:
+            ints_only = numpy.full(len(starts), values_array.dtype.kind in 'iub')
+
+        # Last chunk taken may end before the next one, not taken, starts
+        last_end = starts[-1] + sizes[-1]
+        if last_end < n_values:
+            means[-1] = floats_array[starts[-1]:last_end].mean() + 0.0
+            if floats is not None:
+                ints_only[-1] = not floats[starts[-1]:last_end].any()
+
+        return [round(int(mean) if ints and mean.is_integer() else mean, sigfig)
+                for mean, ints in zip(means.tolist(), ints_only.tolist())]
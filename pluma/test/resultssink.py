@@ -0,0 +1,130 @@
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Iterator
+
+from pluma.core.baseclasses import Logger
+from pluma.utils import indented_json, dump_json_list
+
+from .resultsprocessor import StreamingResultsProcessor
+
+log = Logger()
+
+""" Maximum duration, in seconds, between writes to the disk of a stream """
+DEFAULT_FSYNC_INTERVAL_S = 5
+
+
+class ResultsSink(ABC):
+    @abstractmethod
+    def write_iteration(self, result: dict):
+        '''Save the results of an iteration, as soon as it completes'''
+
+    def close(self):
+        '''Save pending results, and release the sink'''
+
+
+class JsonlResultsSink(ResultsSink):
+    '''Append the results of each iteration to a JSON Lines file.
+
+    Each iteration is written as a compact JSON record on its own line, and
+    flushed immediately, so that results survive the test process crashing
+    or being interrupted. The file is also synced to the disk at most every
+    "fsync_interval_s" seconds, to survive power losses.
+
+    An existing file is truncated, so that the stream only holds the results
+    of the current run, unless "append" is set.
+
+    Use :func:`compact_results_stream` to get a results file from the stream.
+    '''
+
+    def __init__(self, path: str, fsync_interval_s: float = None, append: bool = False):
+        self.path = path
+        self.fsync_interval_s = fsync_interval_s if fsync_interval_s is not None \
+            else DEFAULT_FSYNC_INTERVAL_S
+        self._file = open(path, 'a' if append else 'w')
+        self._last_fsync = time.monotonic()
+
+    def write_iteration(self, result: dict):
+        self._file.write(json.dumps(result, separators=(',', ':')) + '\n')
+        self._file.flush()
+
+        if time.monotonic() - self._last_fsync >= self.fsync_interval_s:
+            self._fsync()
+
+    def _fsync(self):
+        os.fsync(self._file.fileno())
+        self._last_fsync = time.monotonic()
+
+    def close(self):
+        if self._file.closed:
+            return
+
+        self._fsync()
+        self._file.close()
+
+
+def read_results_stream(path: str) -> Iterator[dict]:
+    '''Yield the results of each iteration saved to a JSON Lines stream.
+
+    A last record truncated by a crash is ignored.
+    '''
+    with open(path, 'r') as f:
+        lines = enumerate(f, start=1)
+        for line_number, line in lines:
+            if not line.strip():
+                continue
+
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                if any(other_line.strip() for __, other_line in lines):
+                    raise ValueError(f'Invalid results record at line {line_number} '
+                                     f'of "{path}"')
+
+                log.warning(f'Ignoring incomplete last results record of "{path}"')
+                return
+
+            yield record
+
+
+def compact_results_stream(stream_path: str, output_path: str, data: dict = None,
+                           settings: dict = None):
+    '''Write a results file, as saved by "pluma run", from a results stream.
+
+    The data summary and test settings are generated from the stream unless
+    provided. Results are copied one iteration at a time, without loading
+    the whole stream in memory.
+    '''
+    if data is None or settings is None:
+        stream_data, stream_settings = _summarise_results_stream(stream_path)
+        data = stream_data if data is None else data
+        settings = stream_settings if settings is None else settings
+
+    with open(output_path, 'w') as f:
+        # Same layout as json.dump(results, f, indent=4)
+        f.write('{\n')
+        f.write(f'    "data": {indented_json(data, 1)},\n')
+        f.write(f'    "settings": {indented_json(settings, 1)},\n')
+        f.write('    "results": ')
+        dump_json_list(read_results_stream(stream_path), f, level=1)
+        f.write('\n}')
+
+
+def _summarise_results_stream(stream_path: str) -> (dict, dict):
+    '''Return the data summary and test settings of a results stream'''
+    processor = StreamingResultsProcessor()
+    settings = {}
+    last_result = None
+    for result in read_results_stream(stream_path):
+        processor.add_iteration(result['TestRunner'])
+        for test_name, test_results in result['TestRunner'].items():
+            settings.setdefault(test_name, test_results['settings'])
+        last_result = result
+
+    # Summaries are for the tests which saved data in the last iteration
+    test_names = [test_name for test_name, test_results in
+                  (last_result['TestRunner'] if last_result else {}).items()
+                  if test_results['data']]
+
+    return processor.tests_summary(test_names), settings
@@ -0,0 +1,671 @@
+import json
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from copy import deepcopy
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy
+
+from pluma.utils import datetime_to_timestamp, regex_filter_list
+
+""" Limits of the values stored in a 64 bits integer column """
+INT_MIN = -2**63
+INT_MAX = 2**63 - 1
+""" Value of success for iterations not completed """
+SUCCESS_UNKNOWN = -1
+""" Format name and version of the results saved in columns, by ResultsStore.save """
+COLUMNS_FORMAT = 'pluma-results-columns'
+COLUMNS_FORMAT_VERSION = 1
+
+
+class JsonValues(Sequence):
+    '''List of values saved to a JSON file, read on first access'''
+
+    def __init__(self, path: str):
+        self.path = path
+        self._values = None
+
+    @property
+    def values(self) -> list:
+        if self._values is None:
+            with open(self.path, 'r') as f:
+                self._values = json.load(f)
+
+        return self._values
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __len__(self):
+        return len(self.values)
+
+
+class InternTable():
+    '''Store each distinct (hashable) value once, and refer to it by index'''
+
+    def __init__(self):
+        self._indexes: Dict[Hashable, int] = {}
+        self._values: List[Hashable] = []
+
+    @classmethod
+    def from_values(cls, values: Sequence) -> 'InternTable':
+        '''Create a table of "values", indexed on first lookup'''
+        table = cls()
+        table._indexes = None
+        table._values = values
+        return table
+
+    def index(self, value: Hashable) -> int:
+        '''Return the index of "value", adding it to the table if needed'''
+        if self._indexes is None:
+            self._values = list(self._values)
+            self._indexes = {value: index for index, value in enumerate(self._values)}
+
+        index = self._indexes.get(value)
+        if index is None:
+            index = self._indexes[value] = len(self._values)
+            self._values.append(value)
+
+        return index
+
+    def __getitem__(self, index: int) -> Hashable:
+        return self._values[index]
+
+    def __len__(self):
+        return len(self._values)
+
+
+class DataColumn():
+    '''Values of a test data field, for each iteration it was saved in.
+
+    Values are stored in a typed array while they all share the same type
+    (bool, int, float or str, the latter interned), and as a list of
+    objects otherwise.
+    '''
+    __slots__ = ('iterations', 'kind', 'values')
+
+    TYPED_KINDS = {
+        bool: 'b',
+        int: 'q',
+        float: 'd',
+        str: 'l',
+    }
+    KIND_NAMES = {
+        bool: 'bool',
+        int: 'int',
+        float: 'float',
+        str: 'str',
+        None: 'object',
+    }
+
+    def __init__(self):
+        self.iterations = array('l')
+        self.kind = None
+        self.values = None
+
+    def __len__(self):
+        return len(self.iterations)
+
+    @classmethod
+    def value_kind(cls, value: Any) -> Optional[type]:
+        '''Return the type used to store "value", or None if stored as an object'''
+        kind = type(value)
+        if kind not in cls.TYPED_KINDS:
+            return None
+
+        if kind is int and not INT_MIN <= value <= INT_MAX:
+            return None
+
+        return kind
+
+    def append(self, iteration: int, value: Any, strings: InternTable):
+        kind = self.value_kind(value)
+        if not self.iterations:
+            self.kind = kind
+            self.values = array(self.TYPED_KINDS[kind]) if kind else []
+        elif kind is not self.kind and self.kind is not None:
+            # Mixed types, fall back to objects to return values unchanged
+            self.values = [self.get(position, strings) for position in range(len(self))]
+            self.kind = None
+
+        if self.kind is str:
+            self.values.append(strings.index(value))
+        elif self.kind is None:
+            # Values saved are owned by the tests, and may be modified later
+            self.values.append(deepcopy(value))
+        else:
+            self.values.append(value)
+
+        self.iterations.append(iteration)
+
+    def get(self, position: int, strings: InternTable) -> Any:
+        '''Return the value at "position", in the order values were appended'''
+        value = self.values[position]
+        if self.kind is str:
+            return strings[value]
+        if self.kind is None:
+            return value
+
+        # Values loaded from a file are numpy scalars
+        return self.kind(value)
+
+    def items(self, strings: InternTable, start: int = 0,
+              stop: int = None) -> Iterator[Tuple[int, Any]]:
+        '''Yield the iteration and value of the values between positions
+        "start" and "stop", in the order appended'''
+        values = self.values[start:stop]
+        if self.kind is not None:
+            # Read typed columns at once, as python values
+            values = values.tolist()
+        if self.kind is str:
+            values = (strings[value] for value in values)
+        elif self.kind is bool:
+            values = map(bool, values)
+
+        return zip(self.iterations[start:stop].tolist(), values)
+
+    def to_array(self) -> Optional[numpy.ndarray]:
+        '''Return a copy of the values as an array, if numbers or booleans'''
+        if self.kind not in (bool, int, float):
+            return None
+
+        values = numpy.array(self.values)
+        return values.astype(bool) if self.kind is bool else values
+
+    def positions_between(self, first: int, last: int) -> Tuple[int, int]:
+        '''Return the range of positions of the values saved in iterations
+        "first" to "last", included'''
+        return bisect_left(self.iterations, first), bisect_right(self.iterations, last)
+
+    def position(self, iteration: int) -> Optional[int]:
+        '''Return the position of the value saved in "iteration", or None'''
+        position = bisect_left(self.iterations, iteration)
+        if position < len(self.iterations) and self.iterations[position] == iteration:
+            return position
+
+        return None
+
+
+class TestColumns():
+    '''Results of a test, for each iteration it was part of'''
+
+    def __init__(self):
+        self.iterations = array('l')
+        self.orders = array('l')
+        self.tasks_ran = array('l')
+        # Failures and settings changes are rare, so are stored by position
+        self.tasks_failed: Dict[int, Dict[str, str]] = {}
+        self.settings: List[Tuple[int, dict]] = []
+        self.fields: Dict[str, DataColumn] = {}
+
+    def position(self, iteration: int) -> Optional[int]:
+        position = bisect_left(self.iterations, iteration)
+        if position < len(self.iterations) and self.iterations[position] == iteration:
+            return position
+
+        return None
+
+    def settings_matching(self, settings: dict) -> List[bool]:
+        '''Return whether each settings change includes all "settings" values'''
+        return [all(key in changed_settings and changed_settings[key] == value
+                    for key, value in settings.items())
+                for __, changed_settings in self.settings]
+
+    def position_ranges(self, settings: dict = None) -> List[Tuple[int, int]]:
+        '''Return the start and stop of each run of positions with settings
+        matching all the "settings" values, or of all positions'''
+        if not settings:
+            return [(0, len(self.iterations))] if len(self.iterations) else []
+
+        ranges = []
+        changes = self.settings_matching(settings)
+        for change, (position, __) in enumerate(self.settings):
+            stop = self.settings[change + 1][0] if change + 1 < len(self.settings) \
+                else len(self.iterations)
+            if changes[change] and position < stop:
+                ranges.append((position, stop))
+
+        return ranges
+
+    def settings_at(self, position: int) -> dict:
+        settings = {}
+        for change_position, changed_settings in self.settings:
+            if change_position > position:
+                break
+            settings = changed_settings
+
+        return settings
+
+
+class ResultsStore():
+    '''Compact, columnar storage of the TestRunner data of each iteration.
+
+    Each iteration is appended in time proportional to the number of data
+    fields saved, without copying the TestRunner data. Data fields are
+    stored per test in typed arrays, and task names are interned.
+
+    The results can be read back, in the format of the TestRunner data,
+    through the :attr:`results` sequence view, which builds each iteration
+    on access.
+
+    Results can be saved to a directory of columns with :meth:`save`, and
+    loaded back, read-only, with :meth:`load`. Columns are memory-mapped,
+    and read from the disk only when queried.
+    '''
+
+    def __init__(self):
+        self._starts = array('d')
+        self._ends = array('d')
+        self._success = array('b')
+        self._strings = InternTable()
+        self._task_lists = InternTable()
+        self._tests: Dict[str, TestColumns] = {}
+        self._read_only = False
+        # Function returning the TestRunner data of the iteration in progress
+        self._running_data = None
+        # Test names matching each list of regexes queried
+        self._matches_cache: Dict[Tuple[str, ...], List[str]] = {}
+        # Data summary and test settings saved with the results, if any
+        self.metadata = {}
+
+    def __len__(self):
+        return len(self._starts)
+
+    @property
+    def results(self) -> 'ResultsView':
+        '''Sequence of results, one dictionary per iteration'''
+        return ResultsView(self)
+
+    @property
+    def test_names(self) -> List[str]:
+        return list(self._tests)
+
+    def match_test_names(self, patterns: List[str]) -> List[str]:
+        '''Return the sorted names of the tests matching any regex in "patterns".
+
+        Matches are cached until new tests are added.
+        '''
+        key = tuple(patterns)
+        matches = self._matches_cache.get(key)
+        if matches is None:
+            matches = self._matches_cache[key] = regex_filter_list(
+                patterns, self._tests, unique=True)
+
+        return list(matches)
+
+    def fields(self, test_name: str) -> List[str]:
+        '''Return the names of the data fields saved by a test'''
+        test = self._tests.get(test_name)
+        return list(test.fields) if test else []
+
+    def begin_iteration(self, start: datetime = None,
+                        running_data: Callable[[], dict] = None) -> int:
+        '''Record the start of a new iteration, and return its index.
+
+        Until the iteration ends, its TestRunner data is the one returned by
+        "running_data", if set.
+        '''
+        self._check_writable()
+        start = start or datetime.now()
+        self._running_data = running_data
+        self._starts.append(start.timestamp())
+        self._ends.append(0)
+        self._success.append(SUCCESS_UNKNOWN)
+
+        return len(self) - 1
+
+    def end_iteration(self, testrunner_data: dict, success: bool, end: datetime = None):
+        '''Record the TestRunner data and outcome of the current iteration'''
+        self._check_writable()
+        iteration = len(self) - 1
+        if iteration < 0:
+            raise ValueError('No iteration was started')
+
+        end = end or datetime.now()
+        self._running_data = None
+        self._ends[iteration] = end.timestamp()
+        self._success[iteration] = bool(success)
+
+        for test_name, test_data in testrunner_data.items():
+            self._append_test(iteration, test_name, test_data)
+
+    def _check_writable(self):
+        if self._read_only:
+            raise ValueError('Results loaded from a file cannot be modified')
+
+    def _append_test(self, iteration: int, test_name: str, test_data: dict):
+        test = self._tests.get(test_name)
+        if test is None:
+            test = self._tests[test_name] = TestColumns()
+            self._matches_cache.clear()
+
+        position = len(test.iterations)
+        test.iterations.append(iteration)
+        test.orders.append(test_data.get('order', -1))
+
+        tasks = test_data.get('tasks', {})
+        test.tasks_ran.append(self._task_lists.index(tuple(tasks.get('ran', []))))
+        if tasks.get('failed'):
+            test.tasks_failed[position] = dict(tasks['failed'])
+
+        settings = test_data.get('settings', {})
+        if not test.settings or test.settings[-1][1] != settings:
+            test.settings.append((position, deepcopy(settings)))
+
+        for field, value in test_data.get('data', {}).items():
+            column = test.fields.get(field)
+            if column is None:
+                column = test.fields[field] = DataColumn()
+            column.append(iteration, value, self._strings)
+
+    def settings(self, test_name: str) -> Optional[dict]:
+        '''Return the settings of a test in the first iteration it ran'''
+        test = self._tests.get(test_name)
+        if not test or not test.settings:
+            return None
+
+        return test.settings[0][1]
+
+    def field_values(self, test_name: str, field: str,
+                     settings: dict = None) -> Iterator[Tuple[int, Any]]:
+        '''Yield the iteration and value of a data field, for each iteration saved.
+
+        Only iterations in which the test settings match all the "settings"
+        values are included. Values are read from the matching positions of
+        the field column only.
+        '''
+        test = self._tests.get(test_name)
+        column = test.fields.get(field) if test else None
+        if not column:
+            return
+
+        for first, last in self._iteration_ranges(test, settings):
+            yield from column.items(self._strings, *column.positions_between(first, last))
+
+    def field_array(self, test_name: str, field: str) -> Optional[numpy.ndarray]:
+        '''Return the values of a data field as an array, if all numbers of
+        the same type, or all booleans. Otherwise, return None.'''
+        test = self._tests.get(test_name)
+        column = test.fields.get(field) if test else None
+        return column.to_array() if column else None
+
+    @staticmethod
+    def _iteration_ranges(test: TestColumns, settings: Optional[dict]) -> List[Tuple[int, int]]:
+        '''Return the first and last iterations of runs of a test with settings matching'''
+        return [(int(test.iterations[start]), int(test.iterations[stop - 1]))
+                for start, stop in test.position_ranges(settings)]
+
+    def tests_data(self, test_names: Iterable[str], fields: List[str] = None,
+                   settings: dict = None) -> Iterator[Dict[str, dict]]:
+        '''Yield the data saved by "test_names", for each iteration.
+
+        Each iteration is a dictionary of the data of each test which ran,
+        limited to "fields" if set. Tests with settings not matching all the
+        "settings" values are skipped. Only the columns of the data queried
+        are read, once each.
+        '''
+        tests = [(test_name, self._test_data(test_name, fields, settings))
+                 for test_name in test_names if test_name in self._tests]
+        next_data = {test_name: next(test_data, None) for test_name, test_data in tests}
+
+        for iteration in range(len(self)):
+            iteration_data = {}
+            for test_name, test_data in tests:
+                saved = next_data[test_name]
+                if saved is not None and saved[0] == iteration:
+                    iteration_data[test_name] = saved[1]
+                    next_data[test_name] = next(test_data, None)
+
+            yield iteration_data
+
+    def tests_fields(self, test_names: Iterable[str], fields: List[str] = None,
+                     settings: dict = None) -> List[str]:
+        '''Return the sorted names of the fields in the data of :meth:`tests_data`'''
+        fields_found = set()
+        for test_name in test_names:
+            test = self._tests.get(test_name)
+            if not test:
+                continue
+
+            ranges = self._iteration_ranges(test, settings)
+            for field, column in test.fields.items():
+                if fields and field not in fields:
+                    continue
+
+                if any(start < stop for start, stop in
+                       (column.positions_between(first, last) for first, last in ranges)):
+                    fields_found.add(field)
+
+        return sorted(fields_found)
+
+    def _test_data(self, test_name: str, fields: Optional[List[str]],
+                   settings: Optional[dict]) -> Iterator[Tuple[int, dict]]:
+        '''Yield the iteration and data of a test, for iterations with settings matching'''
+        test = self._tests[test_name]
+        columns = [(field, column) for field, column in test.fields.items()
+                   if not fields or field in fields]
+
+        for start, stop in test.position_ranges(settings):
+            iterations = test.iterations[start:stop].tolist()
+            values = [(field, column.items(self._strings, *column.positions_between(
+                iterations[0], iterations[-1]))) for field, column in columns]
+            next_values = {field: next(field_values, None) for field, field_values in values}
+
+            for iteration in iterations:
+                data = {}
+                for field, field_values in values:
+                    saved = next_values[field]
+                    if saved is not None and saved[0] == iteration:
+                        data[field] = saved[1]
+                        next_values[field] = next(field_values, None)
+
+                yield iteration, data
+
+    def test_result(self, iteration: int, test_name: str) -> Optional[dict]:
+        '''Return the TestRunner data of a test for an iteration, or None'''
+        test = self._tests.get(test_name)
+        position = test.position(iteration) if test else None
+        if position is None:
+            return None
+
+        data = {}
+        for field, column in test.fields.items():
+            field_position = column.position(iteration)
+            if field_position is not None:
+                data[field] = column.get(field_position, self._strings)
+
+        return {
+            'tasks': {
+                'ran': list(self._task_lists[test.tasks_ran[position]]),
+                'failed': dict(test.tasks_failed.get(position, {}))
+            },
+            'data': data,
+            'settings': test.settings_at(position),
+            'order': int(test.orders[position])
+        }
+
+    def iteration(self, iteration: int) -> dict:
+        '''Return the results of an iteration, as saved by the TestController'''
+        if iteration < 0:
+            iteration += len(self)
+        if not 0 <= iteration < len(self):
+            raise IndexError('Iteration index out of range')
+
+        success = self._success[iteration]
+        result = {
+            'iteration': iteration,
+            'start': datetime_to_timestamp(datetime.fromtimestamp(self._starts[iteration])),
+            'end': None,
+            'success': None,
+            'test_order': None,
+            'TestRunner': {}
+        }
+
+        if success == SUCCESS_UNKNOWN and iteration == len(self) - 1 and \
+                self._running_data is not None:
+            result['TestRunner'] = self._running_data()
+
+        if success != SUCCESS_UNKNOWN:
+            result['end'] = datetime_to_timestamp(datetime.fromtimestamp(self._ends[iteration]))
+            result['success'] = bool(success)
+            result['TestRunner'] = {
+                test_name: test_result for test_name, test_result in
+                ((name, self.test_result(iteration, name)) for name in self._tests)
+                if test_result is not None}
+            result['ran'] = True
+
+        return result
+
+    @classmethod
+    def from_results(cls, results: List[dict]) -> 'ResultsStore':
+        '''Create a store from results, as returned by :attr:`results`'''
+        store = cls()
+        for result in results:
+            store.begin_iteration(datetime.strptime(result['start'], '%Y-%m-%d-%H-%M-%S'))
+            if result.get('end'):
+                store.end_iteration(result['TestRunner'], result['success'],
+                                    datetime.strptime(result['end'], '%Y-%m-%d-%H-%M-%S'))
+
+        return store
+
+    def save(self, path: str, data: dict = None, settings: dict = None):
+        '''Save the results to the directory "path", one file per column.
+
+        Typed columns are saved as numpy arrays (.npy), and the table of test
+        names, settings changes and other small tables to "manifest.json".
+        The data summary and test "settings" can be saved along, as
+        :attr:`metadata`.
+        '''
+        os.makedirs(path, exist_ok=True)
+
+        def save_array(name: str, values: array):
+            numpy.save(os.path.join(path, f'{name}.npy'), numpy.asarray(values))
+
+        def save_json(name: str, value: Any):
+            with open(os.path.join(path, f'{name}.json'), 'w') as f:
+                json.dump(value, f)
+
+        save_array('starts', self._starts)
+        save_array('ends', self._ends)
+        save_array('success', self._success)
+        save_json('strings', list(self._strings))
+
+        tests = []
+        for test_index, (test_name, test) in enumerate(self._tests.items()):
+            prefix = f't{test_index}'
+            save_array(f'{prefix}.iterations', test.iterations)
+            save_array(f'{prefix}.orders', test.orders)
+            save_array(f'{prefix}.tasks_ran', test.tasks_ran)
+
+            fields = []
+            for field_index, (field, column) in enumerate(test.fields.items()):
+                field_prefix = f'{prefix}.f{field_index}'
+                save_array(f'{field_prefix}.iterations', column.iterations)
+                if column.kind is None:
+                    save_json(f'{field_prefix}.values', column.values)
+                else:
+                    save_array(f'{field_prefix}.values', column.values)
+                fields.append({'name': field, 'kind': DataColumn.KIND_NAMES[column.kind]})
+
+            tests.append({
+                'name': test_name,
+                'fields': fields,
+                'tasks_failed': [[position, failed]
+                                 for position, failed in test.tasks_failed.items()],
+                'settings': test.settings
+            })
+
+        save_json('manifest', {
+            'format': COLUMNS_FORMAT,
+            'version': COLUMNS_FORMAT_VERSION,
+            'iterations': len(self),
+            'task_lists': list(self._task_lists),
+            'tests': tests,
+            'data': data,
+            'settings': settings
+        })
+
+    @classmethod
+    def load(cls, path: str) -> 'ResultsStore':
+        '''Load results saved with :meth:`save`, memory-mapping their columns.
+
+        Only the manifest is read, columns are read when queried. The store
+        returned is read-only.
+        '''
+        with open(os.path.join(path, 'manifest.json'), 'r') as f:
+            manifest = json.load(f)
+
+        if manifest.get('format') != COLUMNS_FORMAT or \
+                manifest.get('version') != COLUMNS_FORMAT_VERSION:
+            raise ValueError(f'"{path}" does not contain results columns in a supported format')
+
+        def load_array(name: str) -> numpy.ndarray:
+            return numpy.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+
+        kinds = {name: kind for kind, name in DataColumn.KIND_NAMES.items()}
+
+        store = cls()
+        store._read_only = True
+        store._starts = load_array('starts')
+        store._ends = load_array('ends')
+        store._success = load_array('success')
+        store._strings = InternTable.from_values(
+            JsonValues(os.path.join(path, 'strings.json')))
+        store._task_lists = InternTable.from_values(
+            [tuple(tasks) for tasks in manifest['task_lists']])
+        store.metadata = {
+            'data': manifest.get('data'),
+            'settings': manifest.get('settings')
+        }
+
+        for test_index, test_manifest in enumerate(manifest['tests']):
+            prefix = f't{test_index}'
+            test = store._tests[test_manifest['name']] = TestColumns()
+            test.iterations = load_array(f'{prefix}.iterations')
+            test.orders = load_array(f'{prefix}.orders')
+            test.tasks_ran = load_array(f'{prefix}.tasks_ran')
+            test.tasks_failed = {position: failed
+                                 for position, failed in test_manifest['tasks_failed']}
+            test.settings = [(position, settings)
+                             for position, settings in test_manifest['settings']]
+
+            for field_index, field_manifest in enumerate(test_manifest['fields']):
+                field_prefix = f'{prefix}.f{field_index}'
+                column = test.fields[field_manifest['name']] = DataColumn()
+                column.kind = kinds[field_manifest['kind']]
+                column.iterations = load_array(f'{field_prefix}.iterations')
+                if column.kind is None:
+                    column.values = JsonValues(
+                        os.path.join(path, f'{field_prefix}.values.json'))
+                else:
+                    column.values = load_array(f'{field_prefix}.values')
+
+        return store
+
+
+class ResultsView(Sequence):
+    '''Read-only sequence of the results stored, built on access'''
+
+    def __init__(self, store: ResultsStore):
+        self.store = store
+
+    def __len__(self):
+        return len(self.store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.store.iteration(i) for i in range(*index.indices(len(self)))]
+
+        return self.store.iteration(index)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({list(self)})'
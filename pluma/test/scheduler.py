@@ -0,0 +1,109 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+
+@dataclass(frozen=True)
+class SequenceNode:
+    '''Entry of a tests sequence, as used for scheduling the tests it provides.
+
+    "depends_on" lists the ids of the entries which must complete before
+    the tests of this entry start, and "resources" names additional shared
+    resources (e.g. "power") its tests use.
+    '''
+    id: Optional[str] = None
+    depends_on: List[str] = field(default_factory=list)
+    resources: List[str] = field(default_factory=list)
+
+
+@dataclass(eq=False)
+class ScheduledJob:
+    '''Job submitted to a TaskScheduler, and its timing once run'''
+    name: str
+    previous: List['ScheduledJob']
+    future: Future = None
+    start: float = None
+    end: float = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.start is None or self.end is None:
+            return None
+
+        return self.end - self.start
+
+
+class TaskScheduler():
+    '''Run jobs concurrently, serialising jobs which share a resource.
+
+    Each job declares the resources it uses, such as a board console, and
+    the jobs it depends on. A job only starts once its dependencies, and all
+    jobs submitted before it sharing one of its resources, completed. Jobs
+    sharing a resource are then run one at a time, in the order they were
+    submitted, while other jobs run concurrently.
+    '''
+
+    def __init__(self, max_workers: int = None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._last_jobs: Dict[Hashable, ScheduledJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, job: Callable[[], Any], resources: Iterable[Hashable] = None,
+               depends_on: Iterable[ScheduledJob] = None, name: str = None) -> ScheduledJob:
+        '''Schedule "job", using "resources", after the "depends_on" jobs'''
+        with self._lock:
+            resources = list(dict.fromkeys(resources or []))
+            previous_jobs = list(depends_on or [])
+            previous_jobs.extend(self._last_jobs[resource] for resource in resources
+                                 if resource in self._last_jobs)
+
+            scheduled = ScheduledJob(name=name or str(job),
+                                     previous=list(dict.fromkeys(previous_jobs)))
+            # Jobs are started in the order submitted, so previous jobs
+            # always run or are done when a job waits for them.
+            scheduled.future = self._executor.submit(self._run_job, job, scheduled)
+            for resource in resources:
+                self._last_jobs[resource] = scheduled
+
+            return scheduled
+
+    @staticmethod
+    def _run_job(job: Callable[[], Any], scheduled: ScheduledJob) -> Any:
+        wait([previous.future for previous in scheduled.previous])
+
+        scheduled.start = time.monotonic()
+        try:
+            return job()
+        finally:
+            scheduled.end = time.monotonic()
+
+    def shutdown(self, wait: bool = True):
+        '''Release the workers, once all jobs completed if "wait" is set'''
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    @staticmethod
+    def critical_path(jobs: Iterable[ScheduledJob]) -> List[ScheduledJob]:
+        '''Return the chain of jobs which bounded the completion of all "jobs".
+
+        Starting from the last job to complete, each job is preceded by the
+        dependency or resource holder it waited for the longest.
+        '''
+        def last_completed(candidates: Iterable[ScheduledJob]) -> Optional[ScheduledJob]:
+            return max((job for job in candidates if job.end is not None),
+                       key=lambda job: job.end, default=None)
+
+        path = []
+        job = last_completed(jobs)
+        while job:
+            path.append(job)
+            job = last_completed(job.previous)
+
+        return path[::-1]
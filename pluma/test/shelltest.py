@@ -39,13 +39,34 @@ class ShellTest(TestBase):
                 ' was defined. Define a console in "pluma-target.yml", or use '
                 ' "run_on_host" test attribute to run on the host instead.')
 
+    def resources(self) -> list:
+        if self.run_on_host:
+            return []
+
+        return [self.board.console]
+
     def test_body(self):
         self.run_commands()
 
     def run_commands(self, console: ConsoleBase = None,
                      scripts: str = None, timeout: int = None) -> str:
         scripts = scripts or self.scripts
+        console = self.prepare_console(console)
+
+        # Scripts with output checks run one by one, so that the test stops
+        # at the first output failing its checks
+        checks_output = self.should_match_regex or self.should_not_match_regex
+        if self.runs_in_shell and len(scripts) > 1 and not checks_output:
+            return self.run_command_batch(console=console, scripts=scripts, timeout=timeout)
 
+        output = ''
+        for script in scripts:
+            output += self.run_command(console=console, script=script, timeout=timeout)
+
+        return output
+
+    def prepare_console(self, console: ConsoleBase = None) -> ConsoleBase:
+        '''Return the console to run the scripts with, logged in if required'''
         if console is None:
             if self.run_on_host:
                 console = HostConsole('sh')
@@ -58,11 +79,7 @@ class ShellTest(TestBase):
         if self.runs_in_shell and self.login_automatically and console.requires_login:
             self.board.login()
 
-        output = ''
-        for script in scripts:
-            output += self.run_command(console=console, script=script, timeout=timeout)
-
-        return output
+        return console
 
     def run_command(self, console: ConsoleBase, script: str, timeout: int = None) -> str:
         timeout = timeout or self.timeout
@@ -74,10 +91,28 @@ class ShellTest(TestBase):
             output = CommandRunner.run_raw(test_name=self._test_name, console=console,
                                            command=script, timeout=timeout)
 
+        self.check_command_output(script=script, output=output)
+        return output
+
+    def run_command_batch(self, console: ConsoleBase, scripts: List[str],
+                          timeout: int = None) -> str:
+        '''Run scripts in a shell, sending them all at once.
+
+        All scripts run before their outputs are checked.
+        '''
+        timeout = timeout or self.timeout
+
+        outputs = CommandRunner.run_batch(test_name=self._test_name, console=console,
+                                          commands=scripts, timeout=timeout)
+        for script, output in zip(scripts, outputs):
+            self.check_command_output(script=script, output=output)
+
+        return ''.join(outputs)
+
+    def check_command_output(self, script: str, output: str):
         if self.should_match_regex or self.should_not_match_regex:
             CommandRunner.check_output(test_name=self._test_name, command=script, output=output,
                                        match_regex=self.should_match_regex,
                                        error_regex=self.should_not_match_regex)
 
         log.log(CommandRunner.format_command_log(sent=script, output=output))
-        return output
@@ -6,6 +6,14 @@ class TestBase():
 
     task_hooks = ['setup', 'test_body', 'teardown']
 
+    # Optional function called with all the tests, in order, before each run.
+    # Used to prepare tests together, for instance to group their commands.
+    planner = None
+
+    # Sequence entry the test was created from, with its dependencies and
+    # additional resources. See :class:`~pluma.test.scheduler.SequenceNode`.
+    sequence_node = None
+
     def __init__(self, board: Board = None, test_name_suffix: str = None):
         """Construct a TestBase with a board, and test suffix"""
         self.board = board
@@ -25,6 +33,17 @@ class TestBase():
         # Output data to be saved during the test
         self.data = {}
 
+    def resources(self) -> list:
+        '''Return the shared resources used by the test tasks.
+
+        Tests sharing a resource are never run concurrently. By default, tests
+        use their board, and all its consoles.
+        '''
+        if not self.board:
+            return []
+
+        return [self.board, *(self.board.consoles or {}).values()]
+
     def save_data(self, data: dict = None, **data_kwargs: dict):
         '''Save some test data'''
         if data:
@@ -1,16 +1,15 @@
+import io
 import time
-import json
 from datetime import datetime
-from copy import deepcopy
 
-from pluma.utils import send_exception_email, datetime_to_timestamp, \
-    regex_filter_list
+from pluma.utils import send_exception_email, dump_json_list
 
 from .unittest import deferred_function
-from pluma.test import TestRunner
+from pluma.test.testrunner import TestRunnerBase
 
 from .resultsplotter import DefaultResultsPlotter
-from .resultsprocessor import DefaultResultsProcessor
+from .resultsprocessor import StreamingResultsProcessor
+from .resultsstore import ResultsStore
 
 
 class TestController():
@@ -80,7 +79,9 @@ class TestController():
             Defaults to :class:`~pluma.test.resultsplotter.DefaultResultsPlotter`
         results_processor (:class:`~pluma.test.resultsprocessor.ResultsProcessor`): Processor to
             be used to format test results.
-            Defaults to :class:`~pluma.test.resultsprocessor.DefaultResultsProcessor`
+            Defaults to :class:`~pluma.test.resultsprocessor.StreamingResultsProcessor`
+        results_sink (:class:`~pluma.test.resultssink.ResultsSink`): Optional sink to which
+            the results of each iteration are saved, as soon as it completes.
 
     Attributes:
         settings (dict): Controls the behaviour of the TestController.
@@ -109,13 +110,16 @@ class TestController():
                     }
     '''
 
+    # Formats of test data written by export_test_data
+    EXPORT_FORMATS = ['csv', 'json']
+
     def __init__(self, testrunner, setup=None, report=None,
                  run_condition=None, name=None, report_n_iterations=None,
                  continue_on_fail=True, run_forever=False, condition_check_interval_s=0,
                  setup_n_iterations=None, force_initial_run=False, email_on_except=True,
                  log_func=None, verbose_log_func=None, debug_log_func=None,
-                 results_plotter=None, results_processor=None):
-        assert isinstance(testrunner, TestRunner)
+                 results_plotter=None, results_processor=None, results_sink=None):
+        assert isinstance(testrunner, TestRunnerBase)
 
         self.testrunner = testrunner
         self.setup = setup
@@ -129,7 +133,8 @@ class TestController():
         self.name = name
 
         self.results_plotter = results_plotter or DefaultResultsPlotter()
-        self.results_processor = results_processor or DefaultResultsProcessor()
+        self.results_processor = results_processor or StreamingResultsProcessor()
+        self.results_sink = results_sink
 
         # Global data to be used by tests
         # Save TestController data here too
@@ -185,14 +190,24 @@ class TestController():
     def results(self):
         ''' Saved test runtime results.
 
-        ll the data values saved to the "data" dicts of
+        All the data values saved to the "data" dicts of
         the tests in the TestRunner, over all iterations that have been run.
+        This is a read-only sequence, with one dictionary per iteration,
+        built on access from the "results_store": it cannot be appended to,
+        and changes to the dictionaries returned are not saved. Set
+        "results" to replace all the results.
         '''
         return self.data['TestController']['results']
 
     @results.setter
     def results(self, results):
-        self.data['TestController']['results'] = results
+        self.results_store = ResultsStore.from_results(results)
+        self.data['TestController']['results'] = self.results_store.results
+        self.results_summary = None
+
+        if isinstance(self.results_processor, StreamingResultsProcessor):
+            self.results_processor.reset()
+            self.results_processor.add_store(self.results_store)
 
     @property
     def results_summary(self):
@@ -200,7 +215,13 @@ class TestController():
 
         A summary of all the data values saved to the "data" dicts of
         the tests in the TestRunner, over all iterations that have been run.
+        Updated after each iteration with the streaming results processor.
+        Other processors generate it when first accessed after an iteration,
+        and it is None in the "data" dict until then.
         '''
+        if self.data['TestController']['results_summary'] is None:
+            self.results_summary = self.get_test_data_summary()
+
         return self.data['TestController']['results_summary']
 
     @results_summary.setter
@@ -288,20 +309,22 @@ class TestController():
 
     def get_test_data_summary(self):
         ''' Get a summary of test results data values, with some numerical analysis '''
+        if isinstance(self.results_processor, StreamingResultsProcessor):
+            return self.results_processor.summary(self.testrunner.tests)
+
         return self.results_processor.generate_summary(self.testrunner.tests, self.results)
 
     def collect_test_settings(self):
         ''' Get a summary of the settings for tests in the TestRunner '''
         settings = {}
         for test in self.testrunner.tests:
-            if (not self.results or
-                    str(test) not in self.results[0]['TestRunner']):
+            test_settings = self.results_store.settings(str(test))
+            if test_settings is None:
                 # Test has not run, cannot get settings
                 break
             if str(test) not in settings:
                 # NOTE: Assuming test settings never change between iterations
-                settings[str(test)] = self.results[0]['TestRunner'][str(
-                    test)]['settings']
+                settings[str(test)] = test_settings
 
         return settings
 
@@ -334,51 +357,116 @@ class TestController():
                         >>> field1_data = list(returned)[iteration_number]['test_name']['field1']
         '''
 
+        if output_format in self.EXPORT_FORMATS:
+            output = io.StringIO()
+            self.export_test_data(output, test_names=test_names, fields=fields,
+                                  output_format=output_format, settings=settings)
+            return output.getvalue()
+        elif not output_format:
+            return self.results_store.tests_data(self._match_test_names(test_names),
+                                                 fields=fields, settings=settings)
+        else:
+            raise RuntimeError(
+                f'Invalid format: {output_format}. Options: "json", "csv", None')
+
+    def export_test_data(self, file, test_names=None, fields=None, output_format='csv',
+                         settings=None):
+        '''Write test data to a file, as formatted by :meth:`get_test_data`.
+
+        Data is written one iteration at a time, in a single pass over the
+        results, without building the whole output in memory.
+
+        Args:
+            file (str, file object): Path or text file object to write to.
+            output_format (str): Output format, "csv" or "json".
+                Default: "csv"
+            test_names, fields, settings: See :meth:`get_test_data`.
+        '''
+        if output_format not in self.EXPORT_FORMATS:
+            raise RuntimeError(
+                f'Invalid format: {output_format}. Options: {self.EXPORT_FORMATS}')
+
+        if isinstance(file, str):
+            with open(file, 'w') as f:
+                return self.export_test_data(f, test_names=test_names, fields=fields,
+                                             output_format=output_format, settings=settings)
+
+        test_names = self._match_test_names(test_names)
+        tests_data = self.results_store.tests_data(test_names, fields=fields,
+                                                   settings=settings)
+        if output_format == 'json':
+            dump_json_list(tests_data, file)
+        else:
+            header = self.results_store.tests_fields(test_names, fields=fields,
+                                                     settings=settings)
+            self._write_csv(file, tests_data, header)
+
+    def get_field_values(self, field, test_names=None, settings=None):
+        '''Get the values of a data field, for each test saving it.
+
+        Values are read from the results index, in time proportional to the
+        number of values returned.
+            >>> tc.get_field_values('boot_time', 'Boot.*', settings={'speed': 'fast'})
+                {'BootTest': [(0, 12.5), (3, 12.1)]}
+
+        Args:
+            field (str): Name of the data field.
+            test_names, settings: See :meth:`get_test_data`.
+
+        Returns:
+            dict: List of (iteration, value) tuples, for each test name.
+        '''
+        values = {}
+        for test_name in self._match_test_names(test_names):
+            test_values = list(self.results_store.field_values(test_name, field,
+                                                               settings=settings))
+            if test_values:
+                values[test_name] = test_values
+
+        return values
+
+    def _match_test_names(self, test_names):
+        '''Return the names of the tests saved matching any "test_names" regex'''
         test_names = test_names or '.*'
         if not isinstance(test_names, list):
             test_names = [test_names]
 
         # Add a $ to the end of every regex to make it less greedy
-        test_names = [f'{t}$' for t in test_names]
-
-        def data_gen():
-            for r in (result['TestRunner'] for result in self.results):
-                yield {
-                    name: {
-                        f: v for f, v in r[name]['data'].items() if 'data' in r[name] and
-                        not fields or f in fields
-                    } for name in regex_filter_list(test_names, r, unique=True)
-                    if not settings or
-                    all(key in r[name]['settings'] and
-                        r[name]['settings'][key] == val
-                        for key, val in settings.items())
-                }
+        return self.results_store.match_test_names([f'{t}$' for t in test_names])
+
+    @staticmethod
+    def _write_csv(f, tests_data, header):
+        '''Write one CSV line per test and iteration, with a column per "header" field'''
+        def csv_value(value):
+            return str(value).replace('\n', ' ').replace('\r', '')
+
+        # Header is only written with the first line, nothing is written without data
+        header_line = f'iteration,test_name,{csv_value(",".join(header))}\n'
+        for iteration, iteration_data in enumerate(tests_data):
+            for test_name, data in iteration_data.items():
+                if header_line:
+                    f.write(header_line)
+                    header_line = None
+
+                values = ''.join(f',{csv_value(data[field])}' if field in data else ','
+                                 for field in header)
+                f.write(f'{iteration},{test_name}{values}\n')
+
+    def load_results(self, path):
+        '''Load results saved with :meth:`~pluma.test.resultsstore.ResultsStore.save`.
+
+        The results columns are memory-mapped, and read from the disk when
+        queried, for instance by :meth:`get_test_data` or
+        :meth:`graph_test_results`. Loaded results are read-only.
+        '''
+        self.results_store = ResultsStore.load(path)
+        self.data['TestController']['results'] = self.results_store.results
+        self.results_summary = self.results_store.metadata.get('data')
 
-        if output_format == 'json':
-            return json.dumps(list(data_gen()), indent=4)
-        elif output_format == 'csv':
-            newline = '\n'
-            header = sorted(list(set(key for it_data in data_gen()
-                                     for test, data in it_data.items() for key in data)))
-            csv_str = 'iteration,test_name,' + \
-                ','.join(header).replace('\n', ' ').replace('\r', '') + newline
-            empty_csv = True
-            for iteration, tests_data in enumerate(data_gen()):
-                for test_name, data in tests_data.items():
-                    empty_csv = False
-                    csv_str += f'{iteration},{test_name}'
-                    for h in header:
-                        csv_str += ','
-                        if h in data:
-                            csv_str += str(data[h]).replace('\n',
-                                                            ' ').replace('\r', '')
-                    csv_str += newline
-            return csv_str if not empty_csv else ''
-        elif not output_format:
-            return data_gen()
-        else:
-            raise RuntimeError(
-                f'Invalid format: {output_format}. Options: "json", "csv", None')
+        if isinstance(self.results_processor, StreamingResultsProcessor):
+            self.results_processor.reset()
+            if self.results_summary is None:
+                self.results_processor.add_store(self.results_store)
 
     def graph_test_results(self, file, test_names=None, fields=None, vs_type=None,
                            title=None, output_format=None, config=None):
@@ -491,26 +579,16 @@ class TestController():
                 return success
 
     def _init_iteration(self):
-        skeleton = {
-            'iteration': self.stats['num_iterations_run'],
-            'start': datetime_to_timestamp(datetime.now()),
-            'end': None,
-            'success': None,
-            'test_order': None,
-            'TestRunner': self.testrunner.data
-        }
-        self.results.append(skeleton)
+        self.results_store.begin_iteration(datetime.now(),
+                                           running_data=lambda: self.testrunner.data)
 
         return self.results[-1]
 
     def _finalise_iteration(self, success):
-        # Create copies of all TestRunner data
-        self.results[-1]['TestRunner'] = deepcopy(self.testrunner.data)
+        # Data is stored in columns, without keeping the TestRunner data
+        self.results_store.end_iteration(self.testrunner.data, success, datetime.now())
 
         # Update stats
-        self.results[-1]['end'] = datetime_to_timestamp(datetime.now())
-        self.results[-1]['success'] = success
-        self.results[-1]['ran'] = True
 
         num_tests_run = len([
             k for k, v in self.testrunner.data.items()
@@ -528,5 +606,16 @@ class TestController():
 
         self.stats['num_iterations_run'] += 1
 
-        self.results_summary = self.get_test_data_summary()
+        if isinstance(self.results_processor, StreamingResultsProcessor):
+            self.results_processor.add_iteration(self.testrunner.data)
+
+        if self.results_sink:
+            self.results_sink.write_iteration(self.results[-1])
+
+        # The streaming processor summarises iterations as they are added, but
+        # other processors go through all results, only when needed
+        if isinstance(self.results_processor, StreamingResultsProcessor):
+            self.results_summary = self.get_test_data_summary()
+        else:
+            self.results_summary = None
         self.test_settings = self.collect_test_settings()
@@ -4,12 +4,15 @@ import time
 import re
 from abc import ABC, abstractmethod
 import inspect
+import threading
 from copy import copy
+from functools import partial
 from typing import Iterable, List, Union
 
 from pluma import utils
 from pluma.core.baseclasses import LogLevel, Logger
 from pluma.test import TestBase, TestingException, AbortTesting
+from pluma.test.scheduler import SequenceNode, TaskScheduler
 
 global_logger = Logger()
 
@@ -60,6 +63,10 @@ class TestRunnerBase(ABC):
         for test in self.tests:
             self._init_test_data(test)
 
+        # Let tests prepare their work together
+        for planner in dict.fromkeys(test.planner for test in self.tests if test.planner):
+            planner(self.tests)
+
         self.log("Running tests: {}".format(
             list(map(str, self.tests))), level=LogLevel.DEBUG)
 
@@ -297,9 +304,79 @@ class TestRunner(TestRunnerBase):
 
 
 class TestRunnerParallel(TestRunnerBase):
-    '''Run a set of tests in parallel'''
+    '''Run a set of tests in parallel
+
+    Tests run concurrently in a pool of "max_workers" threads, except for
+    tests sharing a resource, such as a board console, which run one after
+    the other, in order. See :meth:`TestBase.resources`. Tests also wait for
+    the sequence entries they depend on, from their "sequence_node".
+
+    The chain of tests which bounded the run duration is logged after each
+    run, and available as "critical_path".
+    '''
+
+    def __init__(self, board: Board = None, tests: Iterable[TestBase] = None,
+                 email_on_fail: bool = None, continue_on_fail: bool = None,
+                 max_workers: int = None):
+        super().__init__(board=board, tests=tests, email_on_fail=email_on_fail,
+                         continue_on_fail=continue_on_fail)
+        self.max_workers = max_workers
+        self.critical_path = []
+        self._aborted = threading.Event()
 
     def _run(self, tests: Iterable[TestBase]):
         self.log('== TESTING MODE: PARALLEL ==', color='blue', bold=True,
                  level=LogLevel.DEBUG)
-        self._run_tasks(tests, self.known_tasks)
+
+        self._aborted.clear()
+        jobs = []
+        sequence_jobs = {}
+        with TaskScheduler(max_workers=self.max_workers) as scheduler:
+            for test in tests:
+                node = test.sequence_node or SequenceNode()
+                depends_on = [job for node_id in node.depends_on
+                              for job in sequence_jobs.get(node_id, [])]
+
+                job = scheduler.submit(partial(self._run_test, test),
+                                       resources=[*test.resources(), *node.resources],
+                                       depends_on=depends_on, name=str(test))
+                jobs.append(job)
+                if node.id:
+                    sequence_jobs.setdefault(node.id, []).append(job)
+
+        self.critical_path = TaskScheduler.critical_path(jobs)
+        self._log_critical_path()
+
+        # Report the first error, as the sequential runner would
+        for job in jobs:
+            if job.future.exception():
+                raise job.future.exception()
+
+    def _log_critical_path(self):
+        '''Log the chain of tests which bounded the duration of the run'''
+        if not self.critical_path:
+            return
+
+        total = self.critical_path[-1].end - self.critical_path[0].start
+        self.log(f'Critical path ({total:.2f}s):', bold=True, level=LogLevel.INFO)
+        for job in self.critical_path:
+            self.log(f'    {job.duration:8.2f}s  {job.name}', level=LogLevel.INFO)
+
+    def _run_test(self, test: TestBase):
+        '''Run all tasks of a test, unless testing was aborted.
+
+        The log of each task is held, and output at once when the task
+        completes, so that it is not mixed with the log of other tests.
+        '''
+        for task_name in self.known_tasks:
+            if self._aborted.is_set():
+                return
+
+            self.hold_log(separator='')
+            try:
+                self._run_tasks(test, task_name)
+            except BaseException:
+                self._aborted.set()
+                raise
+            finally:
+                self.release_log()
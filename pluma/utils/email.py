@@ -258,6 +258,11 @@ class Email():
 
     def send(self):
         """ Validate settings, compose message, and send """
+        # Imported here, as pluma.core depends on pluma.utils
+        from pluma.core.baseclasses.logsink import LogFileSink
+
+        # Attached log files must include the lines still queued
+        LogFileSink().flush()
         self._validate()
 
         msg = self._compose()
@@ -2,15 +2,26 @@ import pandas
 import pygal
 import math
 import json
+import os
 
 
 def boot_graph(data_file, output_file, boot_test_name,
                window=1, interpolate=None):
-    with open(data_file, 'r') as f:
-        all_data = json.load(f)
+    '''Graph the rolling mean of the "boot_success" data of a test.
 
-    boot_data = all_data[boot_test_name]
-    boot_success_data = [d['boot_success'] for d in boot_data]
+    "data_file" is either a JSON file of the test data, or a directory of
+    results saved in columns, of which only the column graphed is read.
+    '''
+    if os.path.isdir(data_file):
+        from pluma.test.resultsstore import ResultsStore
+        boot_success_data = [value for __, value in ResultsStore.load(data_file).field_values(
+            boot_test_name, 'boot_success')]
+    else:
+        with open(data_file, 'r') as f:
+            all_data = json.load(f)
+
+        boot_data = all_data[boot_test_name]
+        boot_success_data = [d['boot_success'] for d in boot_data]
 
     series = pandas.Series(boot_success_data)
     mean_success = series.rolling(window=window).mean().to_list()
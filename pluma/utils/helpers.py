@@ -46,6 +46,31 @@ def format_json_tinydb(db_file, db_output_file):
         f.writelines(db_json)
 
 
+def indented_json(value, level=0):
+    '''
+    Return @value as JSON indented by 4 spaces, as json.dumps(indent=4) does,
+    when nested at depth @level.
+    '''
+    return json.dumps(value, indent=4).replace('\n', '\n' + ' ' * 4 * level)
+
+
+def dump_json_list(values, f, level=0):
+    '''
+    Write the iterable @values to the file @f as a JSON list, one value at a
+    time. Output is the same as json.dump(list(values), f, indent=4), when
+    nested at depth @level.
+    '''
+    indent = ' ' * 4 * (level + 1)
+    empty = True
+    f.write('[')
+    for value in values:
+        f.write('\n' if empty else ',\n')
+        f.write(indent + indented_json(value, level + 1))
+        empty = False
+
+    f.write(']' if empty else '\n' + ' ' * 4 * level + ']')
+
+
 def timestamp_to_datetime(timestamp):
     return datetime.strptime(timestamp, '%Y-%m-%d-%H-%M-%S')
 
@@ -48,6 +48,7 @@ requires = [
     'pexpect>=4.6',
     'pyftdi',
     'pyroute2',
+    'numpy',
     'pandas',
     'pygal',
     'cairosvg',
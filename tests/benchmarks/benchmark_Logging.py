@@ -0,0 +1,66 @@
+'''Compare the cost of writing a line to a log file, with Logging.log.
+
+"open per line" checks the log directory, then opens, appends to and
+closes the log file for each line, as Logging.log did before using a
+LogFileSink. "sink" is Logging.log, queuing lines to the LogFileSink
+writer thread, which keeps the file open. Its time includes waiting for
+all the lines to be written. "no file" is Logging.log without a log
+file, the cost of formatting the lines, common to both.
+
+Run with: python tests/benchmarks/benchmark_Logging.py
+'''
+import os
+import tempfile
+import time
+from typing import Optional
+
+from pluma.core.baseclasses import LogFileSink
+from pluma.core.baseclasses.logging import Logging
+
+LINE = '[    1.234567] usb 1-1: new high-speed USB device number 2 using ehci'
+
+
+class Device(Logging):
+    def __init__(self):
+        pass
+
+
+def open_per_line(log_file: str, n_lines: int) -> float:
+    start = time.perf_counter()
+    for __ in range(n_lines):
+        logdir = os.path.dirname(log_file)
+        if logdir and not os.path.exists(logdir):
+            os.makedirs(logdir)
+        with open(log_file, 'a', encoding='utf-8') as logfd:
+            logfd.write(LINE + '\n')
+
+    return time.perf_counter() - start
+
+
+def sink(log_file: Optional[str], n_lines: int) -> float:
+    device = Device()
+    device.log_file = log_file
+    device.log_echo = False
+
+    start = time.perf_counter()
+    for __ in range(n_lines):
+        device.log(LINE)
+    LogFileSink().flush()
+
+    return time.perf_counter() - start
+
+
+def main():
+    print(f'{"lines":>8} {"no file (us/line)":>18} {"open per line (us/line)":>24} '
+          f'{"sink (us/line)":>16}')
+    with tempfile.TemporaryDirectory() as logdir:
+        for n_lines in [1000, 10000, 100000]:
+            open_time = open_per_line(os.path.join(logdir, f'open-{n_lines}.log'), n_lines)
+            sink_time = sink(os.path.join(logdir, f'sink-{n_lines}.log'), n_lines)
+            no_file_time = sink(None, n_lines)
+            print(f'{n_lines:>8} {no_file_time/n_lines*1e6:>18.2f} '
+                  f'{open_time/n_lines*1e6:>24.2f} {sink_time/n_lines*1e6:>16.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+'''Compare the cost of summarising test results, per results processor.
+
+"default" is DefaultResultsProcessor, computing each statistic with the
+"statistics" module. "numpy (results)" is NumpyResultsProcessor reading
+the results one iteration at a time, as DefaultResultsProcessor does, and
+"numpy (store)" is NumpyResultsProcessor reading the columns of a
+ResultsStore, as the TestController provides them.
+
+Run with: python tests/benchmarks/benchmark_ResultsProcessor.py
+'''
+import random
+import time
+
+from pluma.test import TestBase
+from pluma.test.resultsprocessor import DefaultResultsProcessor, NumpyResultsProcessor
+from pluma.test.resultsstore import ResultsStore
+
+
+class BootTest(TestBase):
+    pass
+
+
+class GeneratedResults():
+    '''Results of each iteration, generated when iterated to limit memory use'''
+
+    def __init__(self, test_name: str, n_iterations: int):
+        self.test_name = test_name
+        self.n_iterations = n_iterations
+
+    def __iter__(self):
+        generator = random.Random(0)
+        for __ in range(self.n_iterations):
+            yield {'TestRunner': {self.test_name: {
+                'tasks': {'ran': ['test_body'], 'failed': {}},
+                'data': {
+                    'boot_time': round(generator.gauss(12, 1.5), 3),
+                    'kernel_size': generator.randint(4_000_000, 4_100_000),
+                    'boot_success': generator.random() < 0.99
+                },
+                'settings': {},
+                'order': 0
+            }}}
+
+
+def timed(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    test = BootTest()
+    test.save_data(boot_time=0)
+
+    print(f'{"iterations":>12} {"default (s)":>12} {"numpy (results) (s)":>20} '
+          f'{"numpy (store) (s)":>18}')
+    for n_iterations in [10_000, 1_000_000]:
+        results = GeneratedResults(str(test), n_iterations)
+        store = ResultsStore()
+        for result in results:
+            store.begin_iteration()
+            store.end_iteration(result['TestRunner'], success=True)
+
+        default_time = timed(lambda: DefaultResultsProcessor().generate_summary([test], results))
+        numpy_results_time = timed(
+            lambda: NumpyResultsProcessor().generate_summary([test], results))
+        numpy_store_time = timed(
+            lambda: NumpyResultsProcessor().generate_summary([test], store.results))
+        print(f'{n_iterations:>12} {default_time:>12.3f} {numpy_results_time:>20.3f} '
+              f'{numpy_store_time:>18.3f}')
+
+
+if __name__ == '__main__':
+    main()
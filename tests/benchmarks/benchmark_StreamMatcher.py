@@ -0,0 +1,63 @@
+'''Compare the cost of waiting for a prompt at the end of a long console log.
+
+"rescan" searches the whole reception buffer after each chunk received, as
+pexpect does with no search window. "stream" uses StreamMatcher, which only
+searches the data received since the last search.
+
+Run with: python tests/benchmarks/benchmark_StreamMatcher.py
+'''
+import re
+import time
+
+from pluma.core.baseclasses import ReceptionBuffer, StreamMatcher
+
+CHUNK_SIZE = 4096
+PATTERNS = [r'root@[\w-]+:~# ', 'Kernel panic', r'login:\s*$']
+LOG_LINE = b'[    1.234567] usb 1-1: new high-speed USB device number 2 using ehci\r\n'
+
+
+def chunks(total_size: int):
+    data = LOG_LINE * (total_size // len(LOG_LINE)) + b'\r\nroot@board:~# '
+    for offset in range(0, len(data), CHUNK_SIZE):
+        yield data[offset:offset+CHUNK_SIZE]
+
+
+def rescan(total_size: int) -> float:
+    regexes = [re.compile(pattern) for pattern in PATTERNS]
+    buffer = ReceptionBuffer()
+
+    start = time.perf_counter()
+    for chunk in chunks(total_size):
+        buffer.append(chunk)
+        text = buffer.text
+        if any(regex.search(text) for regex in regexes):
+            break
+
+    return time.perf_counter() - start
+
+
+def stream(total_size: int) -> float:
+    matcher = StreamMatcher(PATTERNS)
+    buffer = ReceptionBuffer()
+
+    start = time.perf_counter()
+    for chunk in chunks(total_size):
+        buffer.append(chunk)
+        if matcher.feed(buffer.text_from(matcher.position)):
+            break
+
+    return time.perf_counter() - start
+
+
+def main():
+    print(f'{"buffer size":>12} {"rescan (s)":>12} {"stream (s)":>12} {"stream/MB (s)":>14}')
+    for size_mb in [0.25, 0.5, 1, 2, 4]:
+        size = int(size_mb * 1024 * 1024)
+        rescan_time = rescan(size)
+        stream_time = stream(size)
+        print(f'{size_mb:>10}MB {rescan_time:>12.4f} {stream_time:>12.4f} '
+              f'{stream_time/size_mb:>14.4f}')
+
+
+if __name__ == '__main__':
+    main()
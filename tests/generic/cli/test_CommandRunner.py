@@ -1,5 +1,8 @@
+import os
 import pytest
 
+from pluma import HostConsole
+from pluma.core.baseclasses import ExecResult
 from pluma.test import CommandRunner, TaskFailed
 
 
@@ -75,3 +78,68 @@ def test_CommandRunner_check_output_should_error(match_regex, error_regex, outpu
     with pytest.raises(TaskFailed):
         CommandRunner.check_output(test_name='test', command='cmd', output=output,
                                    match_regex=match_regex, error_regex=error_regex)
+
+
+def test_CommandRunner_run_should_use_shell_without_exec_support(mock_console):
+    mock_console.send_and_expect.return_value = ('abc\npluma-retcode=0', 'pluma-retcode=0')
+
+    assert CommandRunner.run(test_name='test', console=mock_console, command='cmd') == 'abc'
+    mock_console.send_and_expect.assert_called_once()
+    mock_console.exec.assert_not_called()
+
+
+def test_CommandRunner_run_should_use_exec_when_supported(mock_console):
+    mock_console.support_exec = True
+    mock_console.exec.return_value = ExecResult(stdout='abc\n', stderr='def\n', retcode=0)
+
+    output = CommandRunner.run(test_name='test', console=mock_console, command='cmd',
+                               timeout=5)
+
+    mock_console.exec.assert_called_once_with('cmd', timeout=5)
+    mock_console.send_and_expect.assert_not_called()
+    assert output.splitlines() == ['abc', 'def']
+
+
+def test_CommandRunner_run_with_exec_should_error_on_failure(mock_console):
+    mock_console.support_exec = True
+    mock_console.exec.return_value = ExecResult(stdout='', stderr='error', retcode=1)
+
+    with pytest.raises(TaskFailed):
+        CommandRunner.run(test_name='test', console=mock_console, command='cmd')
+
+
+@pytest.mark.xfail(os.getenv('PLUMA_ENV') == 'CI', reason='CI fails to properly spawn a shell')
+def test_CommandRunner_execute_batch_should_split_output_per_command():
+    console = HostConsole('sh')
+    results = CommandRunner.execute_batch(
+        console=console, commands=['echo abc', 'printf def', 'false', 'echo ghi'],
+        timeout=2, stop_on_error=False)
+
+    assert [result.stdout for result in results] == ['abc', 'def', '', 'ghi']
+    assert [result.retcode for result in results] == [0, 0, 1, 0]
+
+
+@pytest.mark.xfail(os.getenv('PLUMA_ENV') == 'CI', reason='CI fails to properly spawn a shell')
+def test_CommandRunner_execute_batch_should_stop_on_error():
+    console = HostConsole('sh')
+    results = CommandRunner.execute_batch(
+        console=console, commands=['echo abc', 'false', 'echo ghi'], timeout=2)
+
+    assert [result.retcode for result in results] == [0, 1]
+
+
+@pytest.mark.xfail(os.getenv('PLUMA_ENV') == 'CI', reason='CI fails to properly spawn a shell')
+def test_CommandRunner_run_batch_should_error_on_failure():
+    with pytest.raises(TaskFailed):
+        CommandRunner.run_batch(test_name='test', console=HostConsole('sh'),
+                                commands=['true', 'false', 'true'], timeout=2)
+
+
+def test_CommandRunner_execute_batch_should_use_exec_when_supported(mock_console):
+    mock_console.support_exec = True
+    mock_console.exec.return_value = ExecResult(stdout='', stderr='', retcode=0)
+
+    CommandRunner.execute_batch(console=mock_console, commands=['a', 'b'])
+
+    mock_console.exec.assert_called_once()
+    mock_console.send_and_expect.assert_not_called()
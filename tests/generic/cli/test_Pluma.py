@@ -2,7 +2,9 @@ from os import path
 import os
 import pytest
 
-from pluma.cli import Pluma, ConfigurationError, TestsConfigError, TargetConfigError
+from pluma.cli import Pluma, Configuration, ConfigurationError, TestsConfigError, \
+    TargetConfigError
+from pluma.core.baseclasses import LogRotation
 
 
 config_folder = path.join(path.dirname(__file__), 'test-configs/')
@@ -98,3 +100,23 @@ def test_Pluma_tests_error_on_unknown_attribute():
 def test_Pluma_target_error_on_unknown_attribute():
     with pytest.raises(TargetConfigError):
         run_all('minimal-tests', 'invalid-attributes-target')
+
+
+def test_Pluma_board_keys_should_be_unique():
+    assert Pluma.board_keys(['a/board1.yml', 'b/board2.yml']) == ['board1', 'board2']
+    assert Pluma.board_keys(['a/board.yml', 'b/board.yml']) == ['board-0', 'board-1']
+
+
+def test_Pluma_create_log_rotation_should_parse_settings():
+    rotation = Pluma.create_log_rotation(Configuration({
+        'max_size_mb': 1.5, 'max_age_hours': 2, 'keep': 3, 'compression': 'gzip'}))
+
+    assert rotation == LogRotation(max_bytes=1572864, max_age_s=7200, backup_count=3,
+                                   compression='gzip')
+
+
+@pytest.mark.parametrize('config', [{'max_size_mb': 'big'}, {'compression': 'zip'},
+                                    {'unknown': 1}])
+def test_Pluma_create_log_rotation_should_error_on_invalid_settings(config):
+    with pytest.raises(TestsConfigError):
+        Pluma.create_log_rotation(Configuration(config))
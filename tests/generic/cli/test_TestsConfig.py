@@ -4,6 +4,7 @@ from pytest import fixture
 from unittest.mock import MagicMock
 
 from pluma.cli import TestsConfig, Configuration, TestsProvider, TestsConfigError
+from pluma.test import TestRunnerParallel, SequenceNode
 
 MINIMAL_CONFIG = {
     'sequence': []
@@ -102,3 +103,55 @@ def test_TestsConfig_tests_from_action_should_return_all_tests():
 def test_TestsConfig_tests_from_action_should_error_if_action_unsupported():
     with pytest.raises(TestsConfigError):
         TestsConfig.tests_from_action('abc', {'some': 'settings'}, {'def': MockTestsProvider})
+
+
+def test_TestsConfig_create_test_controller_should_use_parallel_runner_if_set(mock_board):
+    config = copy.deepcopy(MINIMAL_CONFIG)
+    config['settings'] = {'parallel': True}
+    tests_config = TestsConfig(Configuration(config), [MockTestsProvider()])
+
+    controller = tests_config.create_test_controller(mock_board)
+
+    assert isinstance(controller.testrunner, TestRunnerParallel)
+
+
+def test_TestsConfig_tests_from_sequence_should_set_sequence_nodes():
+    provider = MagicMock(MockTestsProvider)
+    provider.configuration_key.return_value = 'mock_tests'
+    provider.all_tests.side_effect = lambda key, config: [MagicMock()]
+
+    sequence = [
+        {'mock_tests': {'id': 'build', 'resources': 'power'}},
+        {'mock_tests': {'depends_on': 'build', 'some': 'setting'}},
+        {'mock_tests': None},
+    ]
+    tests = TestsConfig.tests_from_sequence(sequence, [provider])
+
+    assert tests[0].sequence_node == SequenceNode(id='build', resources=['power'])
+    assert tests[1].sequence_node == SequenceNode(depends_on=['build'])
+    assert tests[2].sequence_node == SequenceNode()
+    assert provider.all_tests.call_args_list[1][1]['config'] == \
+        Configuration({'some': 'setting'})
+
+
+def test_TestsConfig_tests_from_sequence_should_error_on_unknown_dependency():
+    sequence = [
+        {'mock_tests': {'depends_on': ['build']}},
+        {'mock_tests': {'id': 'build'}},
+    ]
+
+    with pytest.raises(TestsConfigError):
+        TestsConfig.tests_from_sequence(sequence, [MockTestsProvider()])
+
+
+def test_TestsConfig_tests_from_sequence_should_error_on_duplicate_id():
+    sequence = [
+        {'mock_tests': {'id': 'build'}},
+        {'mock_tests': {'id': 'build'}},
+    ]
+    provider = MagicMock(MockTestsProvider)
+    provider.configuration_key.return_value = 'mock_tests'
+    provider.all_tests.return_value = []
+
+    with pytest.raises(TestsConfigError):
+        TestsConfig.tests_from_sequence(sequence, [provider])
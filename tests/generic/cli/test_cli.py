@@ -1,8 +1,11 @@
 import os
 import pytest
 import json
+import shutil
 
 from pluma.cli.plugins import load_plugin_modules
+from pluma.core.baseclasses import ConsoleEventLog
+from pluma.test.resultsstore import ResultsStore
 from pluma import plugins
 
 
@@ -236,3 +239,155 @@ def test_cli_should_create_results_file_with_correct_settings(pluma_cli, pluma_c
     finally:
         if os.path.isfile(results_file):
             os.remove(results_file)
+
+
+def test_cli_should_merge_results_of_multiple_targets(pluma_cli, pluma_config_file, temp_file):
+    load_plugin_modules(PLUGIN_DIR)
+
+    results_file = 'results-test.json'
+    config = pluma_config_file(
+        core_tests_params=[(
+            plugins.example_plugin.Maths, {'x': 1}
+        )],
+        settings={
+            'results': {
+                'file': results_file
+        }})
+    targets = [temp_file(), temp_file()]
+
+    pluma_cli(['--config', config, '--target', targets[0], '--target', targets[1]])
+
+    try:
+        with open(results_file, 'r') as f:
+            data = json.load(f)
+
+        boards = data['boards']
+        assert sorted(board['target_config'] for board in boards.values()) == sorted(targets)
+        for board in boards.values():
+            assert board['success'] is True
+            assert 'x_square' in board['data']['example_plugin.maths.Maths']
+    finally:
+        if os.path.isfile(results_file):
+            os.remove(results_file)
+
+
+def test_cli_should_stream_results(pluma_cli, pluma_config_file, temp_file):
+    load_plugin_modules(PLUGIN_DIR)
+
+    results_file = 'results-test.json'
+    stream_file = 'results-test.jsonl'
+    config = pluma_config_file(
+        core_tests_params=[(
+            plugins.example_plugin.Maths, {'x': 1}
+        )],
+        settings={
+            'iterations': 3,
+            'results': {
+                'file': results_file,
+                'stream': True
+        }})
+
+    target = temp_file()
+
+    try:
+        # The stream is started again on each run
+        for _ in range(2):
+            pluma_cli(['--config', config, '--target', target])
+
+        with open(stream_file, 'r') as f:
+            streamed = [json.loads(line) for line in f]
+        with open(results_file, 'r') as f:
+            data = json.load(f)
+
+        assert [result['iteration'] for result in streamed] == [0, 1, 2]
+        assert data['results'] == streamed
+
+        os.remove(results_file)
+        pluma_cli(['compact', '--stream', stream_file])
+
+        with open(results_file, 'r') as f:
+            assert json.load(f) == data
+    finally:
+        for path in [results_file, stream_file]:
+            if os.path.isfile(path):
+                os.remove(path)
+
+
+def test_cli_should_merge_streamed_results_of_multiple_targets(pluma_cli, pluma_config_file,
+                                                               temp_file):
+    load_plugin_modules(PLUGIN_DIR)
+
+    results_file = 'results-test.json'
+    config = pluma_config_file(
+        core_tests_params=[(
+            plugins.example_plugin.Maths, {'x': 1}
+        )],
+        settings={
+            'iterations': 2,
+            'results': {
+                'file': results_file,
+                'stream': True
+        }})
+    targets = [temp_file(), temp_file()]
+
+    try:
+        for _ in range(2):
+            pluma_cli(['--config', config, '--target', targets[0], '--target', targets[1]])
+
+        with open(results_file, 'r') as f:
+            content = f.read()
+        data = json.loads(content)
+
+        assert content == json.dumps(data, indent=4)
+        for board_key, board in data['boards'].items():
+            assert board['success'] is True
+            assert 'x_square' in board['data']['example_plugin.maths.Maths']
+            assert [result['iteration'] for result in board['results']] == [0, 1]
+
+            with open(f'results-test-{board_key}.jsonl', 'r') as f:
+                assert board['results'] == [json.loads(line) for line in f]
+    finally:
+        for path in os.listdir('.'):
+            if path.startswith('results-test'):
+                os.remove(path)
+
+
+def test_cli_should_save_results_in_columns(pluma_cli, pluma_config_file, temp_file):
+    load_plugin_modules(PLUGIN_DIR)
+
+    results_dir = 'results-test.columns'
+    config = pluma_config_file(
+        core_tests_params=[(
+            plugins.example_plugin.Maths, {'x': 1}
+        )],
+        settings={
+            'iterations': 2,
+            'results': {
+                'file': 'results-test.json',
+                'format': 'columns'
+        }})
+
+    pluma_cli(['--config', config, '--target', temp_file()])
+
+    try:
+        store = ResultsStore.load(results_dir)
+        assert list(store.field_values('example_plugin.maths.Maths', 'x_square')) == \
+            [(0, 1.0), (1, 1.0)]
+        assert store.metadata['settings'] == {'example_plugin.maths.Maths': {'x': 1}}
+    finally:
+        shutil.rmtree(results_dir, ignore_errors=True)
+
+
+def test_cli_should_print_console_events(pluma_cli, tmp_path, capsys):
+    path = str(tmp_path / 'events.bin')
+    event_log = ConsoleEventLog.acquire(path)
+    serial = event_log.console_id('serial')
+    ssh = event_log.console_id('ssh')
+    event_log.sent(serial, b'uname\n')
+    event_log.received(ssh, b'Linux\n')
+    event_log.release()
+    capsys.readouterr()
+
+    pluma_cli(['events', '--events', path, '--console', 'serial'])
+
+    assert capsys.readouterr().out == "[    0.000000] serial > 'uname\\n'\n"
@@ -4,6 +4,7 @@ import re
 from pathlib import Path
 
 from pluma.plugins.testsuite import filesystem
+from pluma.test import SequenceNode, TestBase
 
 
 def check_capsys_for_test_fail(test_cls, capsys):
@@ -322,3 +323,55 @@ def test_filesystem_CheckFileSize_should_pass_when_file_in_range(pluma_cli, temp
     target_config = temp_file()
 
     pluma_cli(['-c', test_config, '-t', target_config])
+
+
+def test_filesystem_checks_should_be_batched_and_reported_individually(
+        pluma_cli, temp_file, pluma_config_file, capsys):
+    test_config = pluma_config_file([
+        (filesystem.FileExists, {
+            'path': __file__,
+            'run_on_host': 'true'
+        }),
+        (filesystem.FileIsDir, {
+            'path': __file__,
+            'run_on_host': 'true'
+        }),
+        (filesystem.FileIsRegular, {
+            'path': __file__,
+            'run_on_host': 'true'
+        })
+    ])
+    target_config = temp_file()
+
+    pluma_cli(['-c', test_config, '-t', target_config])
+    stdout = capsys.readouterr().out
+
+    assert re.search(r'FileExists.+PASS', stdout)
+    assert re.search(r'FileIsDir.+FAIL', stdout)
+    assert re.search(r'FileIsRegular.+PASS', stdout)
+
+
+def test_filesystem_plan_should_group_consecutive_checks(mock_board):
+    checks = [filesystem.FileExists(mock_board, path='a'),
+              filesystem.FileIsDir(mock_board, path='b')]
+    other_test = TestBase(mock_board)
+    last_check = filesystem.FileIsRegular(mock_board, path='c')
+
+    filesystem.plan_filesystem_checks([*checks, other_test, last_check])
+
+    assert checks[0].batch is checks[1].batch
+    assert checks[0].batch.checks == checks
+    assert last_check.batch is None
+
+
+def test_filesystem_plan_should_not_group_checks_scheduled_differently(mock_board):
+    checks = [filesystem.FileExists(mock_board, path=path, run_on_host=True)
+              for path in ['a', 'b', 'c']]
+    checks[1].sequence_node = SequenceNode(depends_on=['setup'])
+    checks[2].sequence_node = SequenceNode(depends_on=['setup'])
+
+    filesystem.plan_filesystem_checks(checks)
+
+    assert checks[0].batch is None
+    assert checks[1].batch is checks[2].batch
+    assert checks[1].batch.checks == checks[1:]
@@ -155,7 +155,10 @@ def minimal_ssh_console():
 
 @fixture
 def mock_console():
-    return MagicMock(ConsoleBase)
+    mock_console = MagicMock(ConsoleBase)
+    mock_console.support_exec = False
+
+    return mock_console
 
 
 @fixture
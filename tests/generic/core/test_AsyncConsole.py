@@ -0,0 +1,47 @@
+import asyncio
+import pytest
+
+from pluma import AsyncConsole, HostConsole
+from pluma.core.baseclasses.consoleexceptions import ConsoleExceptionKeywordReceivedError
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_AsyncConsole_send_and_expect_should_match():
+    async def scenario():
+        console = AsyncConsole(HostConsole('/bin/sh'))
+        __, matched = await console.send_and_expect(cmd='echo "hello""-world"',
+                                                    match='hello-world', timeout=2)
+        console.close()
+        return matched
+
+    assert run(scenario()) == 'hello-world'
+
+
+def test_AsyncConsole_send_and_expect_should_raise_on_excepts():
+    async def scenario():
+        console = AsyncConsole(HostConsole('/bin/sh'))
+        try:
+            await console.send_and_expect(cmd='echo "fail""ure"', match='success',
+                                          excepts='failure', timeout=2)
+        finally:
+            console.close()
+
+    with pytest.raises(ConsoleExceptionKeywordReceivedError):
+        run(scenario())
+
+
+def test_AsyncConsole_send_and_read_should_return_output():
+    async def scenario():
+        console = AsyncConsole(HostConsole('/bin/sh'))
+        received = await console.send_and_read('echo "abc""def"', quiet_time=0.2)
+        console.close()
+        return received
+
+    assert 'abcdef' in run(scenario())
@@ -0,0 +1,155 @@
+import asyncio
+import errno
+import os
+import time
+
+import pytest
+
+from pluma.core.baseclasses import AsyncConsoleEngine
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_AsyncConsoleEngine_open_shell_should_succeed():
+    async def scenario():
+        engine = AsyncConsoleEngine()
+        engine.open(console_cmd='sh')
+        is_open = engine.is_open
+        engine.close()
+        return is_open
+
+    assert run(scenario())
+
+
+def test_AsyncConsoleEngine_close_shell_should_succeed():
+    async def scenario():
+        engine = AsyncConsoleEngine()
+        engine.open(console_cmd='sh')
+        engine.close()
+        return engine.is_open
+
+    assert run(scenario()) is False
+
+
+def test_AsyncConsoleEngine_wait_closed_should_wait_for_process_exit():
+    async def scenario():
+        engine = AsyncConsoleEngine()
+        engine.open(console_cmd='sh')
+        process = engine._process
+        engine.close()
+        await engine.wait_closed()
+        return process
+
+    assert run(scenario()).returncode is not None
+
+
+def test_AsyncConsoleEngine_should_raise_read_errors_in_waiting_coroutines(pty_pair,
+                                                                           monkeypatch):
+    def failing_read(fd, size):
+        raise OSError(errno.EBADF, 'Bad file descriptor')
+
+    async def scenario():
+        engine = AsyncConsoleEngine()
+        engine.open(console_fd=pty_pair.main.fd)
+        waiting = asyncio.ensure_future(engine.wait_for_match('never', timeout=5))
+        await asyncio.sleep(0)
+
+        with monkeypatch.context() as patch:
+            patch.setattr(os, 'read', failing_read)
+            engine._on_readable()
+
+        with pytest.raises(OSError):
+            await waiting
+        assert not engine.is_open
+        engine.close()
+
+    run(scenario())
+
+
+def test_AsyncConsoleEngine_send_line_write_content_and_line_break(pty_pair):
+    sent = 'abcdef'
+
+    async def scenario():
+        engine = AsyncConsoleEngine()
+        engine.open(console_fd=pty_pair.main.fd)
+        await engine.send_line(sent)
+        engine.close()
+
+    run(scenario())
+    assert pty_pair.secondary.read(timeout=0.5) == sent+'\n'
+
+
+def test_AsyncConsoleEngine_read_all_reads_from_console(pty_pair):
+    received = 'abcdef'
+
+    async def scenario():
+        engine = AsyncConsoleEngine()
+        engine.open(console_fd=pty_pair.main.fd)
+        pty_pair.secondary.write(received)
+        await engine.wait_for_quiet(quiet=0.1, timeout=1)
+        read = await engine.read_all()
+        engine.close()
+        return read
+
+    assert run(scenario()) == received
+
+
+def test_AsyncConsoleEngine_wait_for_match_consumes_until_match(pty_pair):
+    async def scenario():
+        engine = AsyncConsoleEngine()
+        engine.open(console_fd=pty_pair.main.fd)
+        pty_pair.secondary.write('abc123def')
+        match = await engine.wait_for_match(match=['[0-9]+'], timeout=1)
+        remaining = await engine.read_all()
+        engine.close()
+        return match, remaining
+
+    match, remaining = run(scenario())
+    assert match.regex_matched == '[0-9]+'
+    assert match.text_matched == '123'
+    assert match.text_received == 'abc123'
+    assert remaining == 'def'
+
+
+def test_AsyncConsoleEngine_wait_for_match_returns_on_timeout(pty_pair):
+    async def scenario():
+        engine = AsyncConsoleEngine()
+        engine.open(console_fd=pty_pair.main.fd)
+        pty_pair.secondary.write('abc')
+        match = await engine.wait_for_match(match=['def'], timeout=0.2)
+        engine.close()
+        return match
+
+    match = run(scenario())
+    assert match.regex_matched is None
+    assert match.text_matched is None
+    assert match.text_received == 'abc'
+
+
+def test_AsyncConsoleEngine_should_drive_multiple_shells_concurrently():
+    shell_count = 5
+    sleep_time = 0.5
+
+    async def run_command(engine):
+        engine.open(console_cmd='sh')
+        await engine.send_line(f'sleep {sleep_time}; echo "done""-$((1+1))"')
+        match = await engine.wait_for_match(match='done-2', timeout=5)
+        engine.close()
+        return match.regex_matched
+
+    async def scenario():
+        engines = [AsyncConsoleEngine() for __ in range(shell_count)]
+        return await asyncio.gather(*(run_command(engine) for engine in engines))
+
+    start = time.time()
+    matched = run(scenario())
+    duration = time.time() - start
+
+    assert matched == ['done-2'] * shell_count
+    assert duration < sleep_time * shell_count
@@ -6,7 +6,7 @@ from unittest.mock import MagicMock
 from utils import nonblocking
 
 from pluma.core.baseclasses import (ConsoleError, ConsoleInvalidJSONReceivedError,
-                                    MatchResult)
+                                    MatchResult, PexpectEngine)
 from pluma.core.dataclasses import SystemContext
 
 
@@ -72,6 +72,35 @@ def test_ConsoleBase_wait_for_quiet_should_return_when_quiet(basic_console,
     assert 0.8*total_time < elapsed < 1.2*total_time
 
 
+def test_ConsoleBase_wait_for_quiet_should_not_poll_when_engine_can_wait(basic_console_class,
+                                                                         pty_pair):
+    engine = PexpectEngine()
+    engine.open(console_fd=pty_pair.main.fd)
+    console = basic_console_class(engine=engine)
+
+    start = time.time()
+    success = console.wait_for_quiet(quiet=0.1, sleep_time=1, timeout=2)
+    elapsed = time.time() - start
+
+    assert success is True
+    assert 0.08 < elapsed < 0.3
+
+
+def test_ConsoleBase_wait_for_bytes_should_return_on_reception_when_engine_can_wait(
+        basic_console_class, pty_pair):
+    engine = PexpectEngine()
+    engine.open(console_fd=pty_pair.main.fd)
+    console = basic_console_class(engine=engine)
+
+    start = time.time()
+    async_result = nonblocking(console.wait_for_bytes, sleep_time=1, timeout=2)
+    time.sleep(0.1)
+    pty_pair.secondary.write('abc')
+
+    assert async_result.get() is True
+    assert time.time() - start < 0.5
+
+
 def test_ConsoleBase_send_and_read_sends_data(basic_console):
     sent = 'abc'
     basic_console.send_and_read(cmd=sent, send_newline=False, timeout=0.1)
@@ -0,0 +1,121 @@
+import pytest
+
+from pluma.core.baseclasses import AsyncConsoleEngine, ConsoleCannotOpenError, \
+    ConsoleEventLog, ConsoleEventReader, PexpectEngine, format_console_events
+from pluma.core.baseclasses.consoleeventlog import EVENT_RECORD_HEADER
+
+
+def write_events(path, events):
+    event_log = ConsoleEventLog.acquire(path)
+    for console, direction, data in events:
+        console_id = event_log.console_id(console)
+        if direction == 'sent':
+            event_log.sent(console_id, data)
+        else:
+            event_log.received(console_id, data)
+    event_log.release()
+
+
+def test_ConsoleEventLog_should_read_events_written(tmp_path):
+    path = str(tmp_path / 'events.bin')
+    write_events(path, [('serial', 'sent', b'ls\n'),
+                        ('ssh', 'received', b'file1'),
+                        ('serial', 'received', b'\x00\xff'),
+                        ('serial', 'received', b'')])
+
+    reader = ConsoleEventReader(path)
+    events = list(reader.events())
+
+    assert len(reader) == 3
+    assert reader.consoles == {0: 'serial', 1: 'ssh'}
+    assert [(e.console, e.direction, e.data) for e in events] == [
+        ('serial', 'sent', b'ls\n'),
+        ('ssh', 'received', b'file1'),
+        ('serial', 'received', b'\x00\xff')]
+    assert [e.time for e in events] == sorted(e.time for e in events)
+    assert [e.data for e in reader.events(consoles=['ssh'])] == [b'file1']
+
+
+def test_ConsoleEventReader_should_seek_by_time(tmp_path):
+    path = str(tmp_path / 'events.bin')
+    write_events(path, [('serial', 'received', str(i).encode()) for i in range(100)])
+
+    reader = ConsoleEventReader(path)
+    times = [e.time for e in reader.events()]
+
+    assert [e.data for e in reader.events(start=times[40], end=times[42])] == \
+        [b'40', b'41', b'42']
+    assert [e.data for e in reader.events(start=times[-1] + 1)] == []
+
+
+def test_ConsoleEventLog_should_append_and_drop_partial_records(tmp_path):
+    path = str(tmp_path / 'events.bin')
+    write_events(path, [('serial', 'received', b'first')])
+    with open(path, 'ab') as f:
+        f.write(EVENT_RECORD_HEADER.pack(0, 0, 0, 100) + b'partial')
+
+    assert len(ConsoleEventReader(path)) == 1
+
+    write_events(path, [('ssh', 'sent', b'second'), ('serial', 'sent', b'third')])
+
+    reader = ConsoleEventReader(path)
+    assert reader.consoles == {0: 'serial', 1: 'ssh'}
+    assert [(e.console, e.data) for e in reader.events()] == [
+        ('serial', b'first'), ('ssh', b'second'), ('serial', b'third')]
+
+
+def test_ConsoleEventLog_acquire_should_share_logs_per_path(tmp_path):
+    path = str(tmp_path / 'events.bin')
+    event_log = ConsoleEventLog.acquire(path)
+
+    assert ConsoleEventLog.acquire(path) is event_log
+
+    event_log.release()
+    event_log.release()
+    assert ConsoleEventLog.acquire(path) is not event_log
+    ConsoleEventLog.acquire(path).release()
+
+
+@pytest.mark.parametrize('engine_class', [PexpectEngine, AsyncConsoleEngine])
+def test_ConsoleEngine_should_release_event_log_when_open_fails(tmp_path, engine_class):
+    path = str(tmp_path / 'events.bin')
+    event_log = ConsoleEventLog.acquire(path)
+    engine = engine_class(event_logfile=path)
+
+    with pytest.raises(ConsoleCannotOpenError):
+        engine.open(console_cmd='/nonexistent/command')
+
+    event_log.release()
+    assert ConsoleEventLog.acquire(path) is not event_log
+    ConsoleEventLog.acquire(path).release()
+
+
+def test_PexpectEngine_should_log_console_events(tmp_path):
+    path = str(tmp_path / 'events.bin')
+    engine = PexpectEngine(event_logfile=path, event_log_name='shell')
+    engine.open(console_cmd='sh')
+    engine.send_line('echo hel""lo')
+    engine.wait_for_match('hello')
+    engine.close()
+
+    reader = ConsoleEventReader(path)
+    events = list(reader.events())
+    assert events[0].direction == 'sent'
+    assert events[0].data == b'echo hel""lo\n'
+    assert b'hello' in b''.join(e.data for e in events if e.direction == 'received')
+
+    lines = list(format_console_events(events[:1], start_time=events[0].time))
+    assert lines == ["[    0.000000] shell > 'echo hel\"\"lo\\n'"]
+
+
+def test_PexpectEngine_should_send_non_ascii_text(tmp_path):
+    path = str(tmp_path / 'events.bin')
+    for event_logfile in [None, path]:
+        engine = PexpectEngine(event_logfile=event_logfile)
+        engine.open(console_cmd='cat')
+        engine.send('café\n')
+        engine.close()
+
+    events = list(ConsoleEventReader(path).events())
+    assert events[0].direction == 'sent'
+    assert events[0].data == 'café\n'.encode('utf-8')
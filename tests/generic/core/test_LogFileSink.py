@@ -0,0 +1,95 @@
+from pluma.core.baseclasses import LogFileSink
+
+
+def read(path) -> str:
+    with open(path, 'r') as f:
+        return f.read()
+
+
+def test_LogFileSink_should_be_a_singleton():
+    assert LogFileSink() is LogFileSink()
+
+
+def test_LogFileSink_flush_should_write_lines_queued(tmp_path):
+    path = str(tmp_path / 'logs' / 'board.log')
+    sink = LogFileSink()
+
+    for i in range(5000):
+        sink.write(path, f'line {i}\n')
+
+    assert sink.flush(timeout=10)
+    assert read(path) == ''.join(f'line {i}\n' for i in range(5000))
+
+
+def test_LogFileSink_should_append_to_existing_files(tmp_path):
+    path = tmp_path / 'board.log'
+    path.write_text('existing\n')
+    sink = LogFileSink()
+
+    sink.write(str(path), 'new\n')
+
+    assert sink.flush(timeout=10)
+    assert read(path) == 'existing\nnew\n'
+
+
+def test_LogFileSink_truncate_should_apply_after_writes_queued(tmp_path):
+    path = str(tmp_path / 'board.log')
+    sink = LogFileSink()
+
+    sink.write(path, 'before\n')
+    sink.truncate(path)
+    sink.write(path, 'after\n')
+
+    assert sink.flush(timeout=10)
+    assert read(path) == 'after\n'
+
+
+def test_LogFileSink_close_should_write_lines_and_allow_restart(tmp_path):
+    path = str(tmp_path / 'board.log')
+    sink = LogFileSink()
+
+    sink.write(path, 'first\n')
+    sink.close()
+    assert read(path) == 'first\n'
+
+    sink.write(path, 'second\n')
+    assert sink.flush(timeout=10)
+    assert read(path) == 'first\nsecond\n'
+
+
+def test_LogFileSink_should_ignore_unwritable_paths(tmp_path):
+    path = tmp_path / 'board.log'
+    path.mkdir()
+    sink = LogFileSink()
+
+    sink.write(str(path), 'lost\n')
+    sink.write(str(tmp_path / 'other.log'), 'kept\n')
+
+    assert sink.flush(timeout=10)
+    assert read(tmp_path / 'other.log') == 'kept\n'
+
+
+def test_LogFileSink_should_write_unencodable_text(tmp_path):
+    path = str(tmp_path / 'board.log')
+    sink = LogFileSink()
+
+    sink.write(path, 'bad \udc80\n')
+    sink.write(path, 'next\n')
+
+    assert sink.flush(timeout=10)
+    assert read(path) == 'bad \\udc80\nnext\n'
+
+
+def test_LogFileSink_should_restart_stopped_writer_thread(tmp_path):
+    path = str(tmp_path / 'board.log')
+    sink = LogFileSink()
+    sink.write(path, 'first\n')
+    sink.flush(timeout=10)
+
+    # As if the writer thread died
+    sink._put(('stop', None, None, True, None))
+    sink._thread.join(timeout=10)
+
+    sink.write(path, 'second\n')
+    assert sink.flush(timeout=10)
+    assert read(path) == 'first\nsecond\n'
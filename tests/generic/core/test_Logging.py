@@ -0,0 +1,127 @@
+import threading
+
+from pytest import fixture
+
+from pluma.core.baseclasses import Logger, LogFileSink, LogLevel, LogMode
+from pluma.core.baseclasses.logging import Logging, render_message
+
+
+class Device(Logging):
+    def __init__(self):
+        pass
+
+
+@fixture
+def logger():
+    logger = Logger()
+    mode = logger.mode
+    logger.mode = LogMode.NORMAL
+    yield logger
+    logger.mode = mode
+
+
+@fixture
+def device(tmp_path):
+    device = Device()
+    device.log_file = str(tmp_path / 'device.log')
+    return device
+
+
+def read_log(device) -> str:
+    LogFileSink().flush()
+    with open(device.log_file, 'r') as f:
+        return f.read()
+
+
+def test_render_message_should_call_and_format_messages():
+    assert render_message('text') == 'text'
+    assert render_message('{} and {:.1f}', ('a', 2)) == 'a and 2.0'
+    assert render_message(lambda: 'built') == 'built'
+    assert render_message('{braces}') == '{braces}'
+
+
+def test_Logger_should_not_build_messages_below_mode_level(logger, capsys):
+    def message():
+        raise AssertionError('Message should not be built')
+
+    logger.debug(message)
+    logger.notice('{}', message)
+
+    assert capsys.readouterr().out == ''
+
+
+def test_Logger_should_output_formatted_messages(logger, capsys):
+    logger.info('{} {}', 'hello', 42)
+    logger.info(lambda: 'lazy')
+
+    assert capsys.readouterr().out.splitlines() == ['hello 42', 'lazy']
+
+
+def test_Logging_log_should_write_all_levels_to_file_by_default(logger, device, capsys):
+    device.log('debug {}', args=(1,), level=LogLevel.DEBUG)
+    device.log(lambda: 'info', level=LogLevel.INFO)
+
+    assert read_log(device) == 'debug 1\ninfo\n'
+    assert capsys.readouterr().out == 'info\n'
+
+
+def test_Logging_log_should_not_build_messages_not_output(logger, device, capsys):
+    device.log_file_level = LogLevel.INFO
+
+    def message():
+        raise AssertionError('Message should not be built')
+
+    device.log(message, level=LogLevel.DEBUG)
+    device.log(message, force_log_file=None, level=LogLevel.NOTICE)
+    device.log('info', level=LogLevel.INFO)
+
+    assert read_log(device) == 'info\n'
+    assert capsys.readouterr().out == 'info\n'
+
+
+def test_Logger_release_should_output_held_log_at_once(logger, capsys):
+    logger.hold()
+    logger.info('held')
+    logger.log('bypass', level=LogLevel.INFO, bypass_hold=True)
+    assert capsys.readouterr().out == 'bypass\n'
+
+    logger.release()
+    assert capsys.readouterr().out == 'held\n\n'
+    assert not logger.held
+
+
+def test_Logger_nested_holds_should_only_bypass_innermost_hold(logger, capsys):
+    logger.hold(separator='')
+    logger.log('header ', level=LogLevel.INFO, newline=False)
+    logger.hold()
+    logger.info('task output')
+    logger.log('PASS', level=LogLevel.INFO, bypass_hold=True)
+    logger.release()
+    assert capsys.readouterr().out == ''
+
+    logger.release()
+    assert capsys.readouterr().out == 'header PASS\ntask output\n\n'
+
+
+def test_Logger_hold_should_be_per_thread(logger, capsys):
+    barrier = threading.Barrier(2)
+
+    def log_lines(name):
+        logger.hold(separator='')
+        for i in range(100):
+            logger.info('{} {}', name, i)
+            if i == 50:
+                barrier.wait()
+        logger.release()
+
+    threads = [threading.Thread(target=log_lines, args=(name,)) for name in 'ab']
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not logger.held
+    lines = capsys.readouterr().out.splitlines()
+    blocks = [lines[:100], lines[100:]]
+    assert sorted(blocks) == [[f'a {i}' for i in range(100)],
+                              [f'b {i}' for i in range(100)]]
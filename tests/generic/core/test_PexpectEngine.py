@@ -141,3 +141,87 @@ def test_PexpectEngine_wait_for_match_should_return_immediately_on_match(pty_pai
     engine.wait_for_match(match=[received], timeout=2)
 
     assert time.time() - start_time < 0.2
+
+
+def test_PexpectEngine_read_all_reads_large_reception_at_once(pty_pair):
+    received = 'abcdefghij' * 500
+    engine = PexpectEngine(read_chunk_size=64)
+    engine.open(console_fd=pty_pair.main.fd)
+
+    pty_pair.secondary.write(received)
+    received_actual = engine.read_all()
+
+    assert received_actual == received
+
+
+def test_PexpectEngine_read_all_decodes_characters_split_between_chunks(pty_pair):
+    received = 'aé€b' * 10
+    engine = PexpectEngine(encoding='utf-8', read_chunk_size=3)
+    engine.open(console_fd=pty_pair.main.fd)
+
+    pty_pair.secondary.encoding = 'utf-8'
+    pty_pair.secondary.write(received)
+    received_actual = engine.read_all()
+
+    assert received_actual == received
+
+
+def test_PexpectEngine_wait_for_data_should_return_immediately_on_reception(pty_pair):
+    engine = PexpectEngine()
+    engine.open(console_fd=pty_pair.main.fd)
+    pty_pair.secondary.write('abc')
+
+    start_time = time.time()
+    assert engine.wait_for_data(timeout=2) is True
+    assert time.time() - start_time < 0.2
+
+
+def test_PexpectEngine_wait_for_data_should_return_false_after_timeout(pty_pair):
+    engine = PexpectEngine()
+    engine.open(console_fd=pty_pair.main.fd)
+
+    start_time = time.time()
+    assert engine.wait_for_data(timeout=0.2) is False
+    assert 0.16 < time.time() - start_time < 0.24
+
+
+def test_PexpectEngine_wait_for_match_keeps_data_after_match(pty_pair):
+    engine = PexpectEngine()
+    engine.open(console_fd=pty_pair.main.fd)
+
+    pty_pair.secondary.write('abc123def')
+    match = engine.wait_for_match(match=['[0-9]+'], timeout=1)
+
+    assert match.regex_matched == '[0-9]+'
+    assert match.text_matched == '123'
+    assert match.text_received == 'abc123'
+    assert engine.read_all() == 'def'
+
+
+def test_PexpectEngine_wait_for_match_returns_received_on_timeout(pty_pair):
+    engine = PexpectEngine()
+    engine.open(console_fd=pty_pair.main.fd)
+
+    pty_pair.secondary.write('abc')
+    match = engine.wait_for_match(match=['def'], timeout=0.2)
+
+    assert match.regex_matched is None
+    assert match.text_matched is None
+    assert match.text_received == 'abc'
+
+
+def test_PexpectEngine_wait_for_match_should_match_long_reply_received_in_chunks(tmp_path):
+    reply = '{\n' + '    "key": "value",\n' * 500 + '}\n'
+    paths = []
+    for index, start in enumerate(range(0, len(reply), 1024)):
+        path = tmp_path / f'part{index}'
+        path.write_text(reply[start:start + 1024])
+        paths.append(str(path))
+    engine = PexpectEngine()
+    parts = ' '.join(paths)
+    engine.open(console_cmd=f"sh -c 'for part in {parts}; do cat $part; sleep 0.02; done'")
+
+    match = engine.wait_for_match(match=['{((.|\n)*)\n}'], timeout=5)
+
+    assert match.regex_matched is not None
+    assert match.text_matched.replace('\r\n', '\n') == reply.rstrip('\n')
@@ -0,0 +1,131 @@
+import time
+
+from pluma.core.baseclasses import ReceptionBuffer
+
+
+def test_ReceptionBuffer_should_be_empty_by_default():
+    buffer = ReceptionBuffer()
+    assert len(buffer) == 0
+    assert buffer.data == b''
+    assert buffer.text == ''
+
+
+def test_ReceptionBuffer_text_should_return_appended_data():
+    buffer = ReceptionBuffer()
+    buffer.append(b'abc')
+    buffer.append(b'def')
+
+    assert len(buffer) == 6
+    assert buffer.data == b'abcdef'
+    assert buffer.text == 'abcdef'
+
+
+def test_ReceptionBuffer_text_should_include_data_appended_after_decoding():
+    buffer = ReceptionBuffer()
+    buffer.append(b'abc')
+    assert buffer.text == 'abc'
+
+    buffer.append(b'def')
+    assert buffer.text == 'abcdef'
+
+
+def test_ReceptionBuffer_clear_should_discard_content():
+    buffer = ReceptionBuffer()
+    buffer.append(b'abc')
+    buffer.clear()
+
+    assert len(buffer) == 0
+    assert buffer.text == ''
+
+
+def test_ReceptionBuffer_should_decode_characters_split_between_appends():
+    encoded = 'aé€b'.encode('utf-8')
+    buffer = ReceptionBuffer(encoding='utf-8')
+    for i in range(len(encoded)):
+        buffer.append(encoded[i:i+1])
+        buffer.text
+
+    assert buffer.text == 'aé€b'
+
+
+def test_ReceptionBuffer_should_keep_incomplete_characters_on_clear():
+    encoded = '€'.encode('utf-8')
+    buffer = ReceptionBuffer(encoding='utf-8')
+    buffer.append(encoded[:1])
+    assert buffer.text == ''
+
+    buffer.clear()
+    buffer.append(encoded[1:])
+    assert buffer.text == '€'
+
+
+def test_ReceptionBuffer_append_should_not_slow_down_with_size():
+    chunk = b'[    1.234567] kernel: some boot log line\n' * 100
+    buffer = ReceptionBuffer()
+
+    def append_duration(count):
+        start = time.time()
+        for _ in range(count):
+            buffer.append(chunk)
+            len(buffer)
+        return time.time() - start
+
+    first = append_duration(1000)
+    while len(buffer) < 50 * 1024 * 1024:
+        append_duration(1000)
+    last = append_duration(1000)
+
+    assert last < 5 * first + 0.05
+
+
+def test_ReceptionBuffer_consume_should_return_and_remove_beginning_of_text():
+    buffer = ReceptionBuffer(encoding='utf-8')
+    buffer.append('abc€def'.encode('utf-8'))
+
+    assert buffer.consume(4) == 'abc€'
+    assert buffer.text == 'def'
+    assert len(buffer) == 3
+
+    buffer.append(b'ghi')
+    assert buffer.text == 'defghi'
+
+
+def test_ReceptionBuffer_text_from_returns_text_after_index():
+    buffer = ReceptionBuffer(encoding='utf-8')
+    buffer.append(b'abc')
+    assert buffer.text == 'abc'
+
+    buffer.append(b'def')
+    buffer.append('gh€'.encode('utf-8'))
+
+    assert buffer.text_from(0) == 'abcdefgh€'
+    assert buffer.text_from(2) == 'cdefgh€'
+    assert buffer.text_from(4) == 'efgh€'
+    assert buffer.text_from(9) == ''
+
+
+def test_ReceptionBuffer_consume_should_remove_undecodable_bytes_consumed():
+    buffer = ReceptionBuffer(encoding='utf-8')
+    buffer.append(b'\xffab\n$ rest')
+
+    assert buffer.consume(4) == '\ufffdab\n'
+    assert buffer.text == '$ rest'
+    assert buffer.data == b'$ rest'
+
+    buffer.append(b'\xe2\x82' + '€'.encode('utf-8'))
+    assert buffer.consume(8) == '$ rest\ufffd\ufffd'
+    assert buffer.data == '€'.encode('utf-8')
+    assert buffer.text == '€'
+
+
+def test_ReceptionBuffer_consume_should_keep_characters_completed_after_clear():
+    encoded = '€'.encode('utf-8')
+    buffer = ReceptionBuffer(encoding='utf-8')
+    buffer.append(encoded[:1])
+    buffer.text
+    buffer.clear()
+    buffer.append(encoded[1:] + b'\xffab')
+
+    assert buffer.consume(2) == '€\ufffd'
+    assert buffer.data == b'ab'
+    assert buffer.text == 'ab'
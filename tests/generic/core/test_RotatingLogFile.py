@@ -0,0 +1,81 @@
+import gzip
+import os
+import time
+
+import pytest
+
+from pluma.core.baseclasses import LogFileSink, LogRotation, RotatingLogFile
+
+
+def read(path) -> bytes:
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        return f.read()
+
+
+def test_LogRotation_should_error_on_invalid_settings():
+    with pytest.raises(ValueError):
+        LogRotation(compression='zip')
+    with pytest.raises(ValueError):
+        LogRotation(max_bytes=0)
+    with pytest.raises(ValueError):
+        LogRotation(backup_count=-1)
+
+
+def test_RotatingLogFile_should_rotate_on_size(tmp_path):
+    path = str(tmp_path / 'board.log')
+    log_file = RotatingLogFile(path, LogRotation(max_bytes=10))
+
+    for line in ['line 1\n', 'line 2\n', 'line 3\n']:
+        log_file.write(line)
+    log_file.close()
+    log_file.wait_for_compressions()
+
+    rotated = log_file.rotated_files()
+    assert [read(path) for path in rotated] == [b'line 1\n', b'line 2\n']
+    assert read(path) == b'line 3\n'
+
+
+def test_RotatingLogFile_should_rotate_on_age(tmp_path):
+    path = str(tmp_path / 'board.log')
+    log_file = RotatingLogFile(path, LogRotation(max_age_s=0.05))
+
+    log_file.write(b'old\n')
+    log_file.write(b'recent\n')
+    time.sleep(0.1)
+    log_file.write(b'new\n')
+    log_file.close()
+    log_file.wait_for_compressions()
+
+    assert [read(path) for path in log_file.rotated_files()] == [b'old\nrecent\n']
+    assert read(path) == b'new\n'
+
+
+def test_RotatingLogFile_should_compress_and_keep_last_files(tmp_path):
+    path = str(tmp_path / 'board.log')
+    log_file = RotatingLogFile(path, LogRotation(max_bytes=1, backup_count=2,
+                                                 compression='gzip'))
+
+    for i in range(5):
+        log_file.write(f'{i}\n')
+        log_file.wait_for_compressions()
+    log_file.close()
+
+    rotated = log_file.rotated_files()
+    assert all(path.endswith('.gz') for path in rotated)
+    assert [read(path) for path in rotated] == [b'2\n', b'3\n']
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        ['board.log'] + [os.path.basename(path) for path in rotated])
+
+
+def test_LogFileSink_should_rotate_log_files(tmp_path):
+    path = str(tmp_path / 'board.log')
+    sink = LogFileSink()
+    rotation = LogRotation(max_bytes=8)
+
+    sink.write(path, 'line 1\n', rotation=rotation)
+    sink.write(path, 'line 2\n', rotation=rotation)
+    sink.close()
+
+    assert read(path) == b'line 2\n'
+    assert len(os.listdir(tmp_path)) == 2
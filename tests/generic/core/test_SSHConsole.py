@@ -1,2 +1,19 @@
+import subprocess
+
+from unittest.mock import patch
+
+from pluma import SSHTransport
+
+
 def test_SSHConsole_does_require_login(minimal_ssh_console):
     assert minimal_ssh_console.requires_login is False
+
+
+def test_SSHConsole_exec_should_return_structured_result(minimal_ssh_console):
+    completed = subprocess.CompletedProcess(args=[], returncode=2, stdout=b'out',
+                                            stderr=b'err')
+    with patch.object(SSHTransport, 'run', return_value=completed) as run:
+        result = minimal_ssh_console.exec('cmd', timeout=3)
+
+    run.assert_called_once_with('cmd', timeout=3)
+    assert (result.stdout, result.stderr, result.retcode) == ('out', 'err', 2)
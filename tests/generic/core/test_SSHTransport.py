@@ -0,0 +1,125 @@
+import os
+import subprocess
+import pytest
+
+from unittest.mock import patch
+
+from pluma import SSHTransport
+from pluma.core.exceptions import SSHTransportError
+
+
+def completed(returncode=0, stdout=b'', stderr=b''):
+    return subprocess.CompletedProcess(args=[], returncode=returncode,
+                                       stdout=stdout, stderr=stderr)
+
+
+@pytest.fixture
+def transport(tmpdir):
+    return SSHTransport(target='board', login='root', control_dir=str(tmpdir))
+
+
+def test_SSHTransport_get_should_share_transport():
+    transport = SSHTransport.get(target='board', login='root')
+
+    assert SSHTransport.get(target='board', login='root') is transport
+    assert SSHTransport.get(target='board', login='admin') is not transport
+
+
+def test_SSHTransport_ssh_command_should_use_shared_connection(transport):
+    command = transport.ssh_command('uname')
+
+    assert f'ControlPath={transport.control_path}' in command
+    assert 'ControlMaster=no' in command
+    assert command[-2:] == ['root@board', 'uname']
+
+
+def test_SSHTransport_ssh_command_should_use_sshpass_with_password(tmpdir):
+    transport = SSHTransport(target='board', login='root', password='pass',
+                             control_dir=str(tmpdir))
+
+    assert transport.ssh_command()[:4] == ['sshpass', '-p', 'pass', 'ssh']
+
+
+def test_SSHTransport_connect_should_remove_stale_socket(transport):
+    os.makedirs(transport.control_dir, exist_ok=True)
+    open(transport.control_path, 'w').close()
+
+    with patch('subprocess.run', return_value=completed(returncode=255)) as run:
+        with pytest.raises(SSHTransportError):
+            transport.connect()
+
+    assert not os.path.exists(transport.control_path)
+    connect_command = run.call_args_list[-1][0][0]
+    assert 'ControlMaster=yes' in connect_command
+    assert '-N' in connect_command
+
+
+def test_SSHTransport_connect_should_not_reconnect_when_connected(transport):
+    with patch('subprocess.run', return_value=completed()) as run:
+        transport.connect()
+        transport.connect()
+        transport.run('uname')
+
+    assert run.call_count == 2
+    assert 'ControlMaster=yes' in run.call_args_list[0][0][0]
+    assert run.call_args_list[1][0][0][-1] == 'uname'
+
+
+def test_SSHTransport_control_path_should_differ_between_processes(transport):
+    with patch('os.getpid', return_value=1000):
+        path = transport.control_path
+
+    with patch('os.getpid', return_value=1001):
+        assert transport.control_path != path
+
+
+def test_SSHTransport_disconnect_should_only_close_own_connection(transport):
+    with patch('subprocess.run', return_value=completed()), \
+            patch('os.getpid', return_value=1000):
+        transport.connect()
+
+    os.makedirs(transport.control_dir, exist_ok=True)
+    with patch('os.getpid', return_value=1001), \
+            patch('subprocess.run') as run:
+        open(transport.control_path, 'w').close()
+        transport.disconnect()
+        assert os.path.exists(transport.control_path)
+
+    run.assert_not_called()
+
+    with patch('os.getpid', return_value=1000), \
+            patch('subprocess.run') as run:
+        open(transport.control_path, 'w').close()
+        transport.disconnect()
+        assert not os.path.exists(transport.control_path)
+
+    run.assert_called_once()
+    assert '-O' in run.call_args[0][0]
+    assert 'exit' in run.call_args[0][0]
+
+
+def test_SSHTransport_run_should_reconnect_when_connection_lost(transport):
+    with patch.object(SSHTransport, 'is_connected', False), \
+            patch.object(SSHTransport, 'connect') as connect, \
+            patch.object(SSHTransport, 'reconnect') as reconnect, \
+            patch('subprocess.run', side_effect=[completed(returncode=255),
+                                                 completed(stdout=b'Linux')]) as run:
+        result = transport.run('uname')
+
+    connect.assert_called_once()
+    reconnect.assert_called_once()
+    assert run.call_count == 2
+    assert result.stdout == b'Linux'
+
+
+def test_SSHTransport_copy_to_target_should_raise_on_failure(transport):
+    with patch.object(SSHTransport, 'connect'), \
+            patch.object(SSHTransport, 'is_connected', True), \
+            patch('subprocess.run', return_value=completed(returncode=1,
+                                                           stderr=b'No such file')) as run:
+        with pytest.raises(SSHTransportError):
+            transport.copy_to_target('file.txt', '/tmp/file.txt')
+
+    scp_command = run.call_args[0][0]
+    assert scp_command[0] == 'scp'
+    assert scp_command[-2:] == ['file.txt', 'root@board:/tmp/file.txt']
@@ -0,0 +1,74 @@
+from pluma.core.baseclasses import StreamMatcher, compile_patterns
+
+
+def test_compile_patterns_should_cache_pattern_sets():
+    assert compile_patterns(['abc', 'def']) is compile_patterns(['abc', 'def'])
+    assert compile_patterns(['abc', 'def']) is not compile_patterns(['def', 'abc'])
+
+
+def test_compile_patterns_should_find_max_match_length():
+    assert compile_patterns(['abc', 'a[0-9]{2,4}', 'a.*b']).max_lengths == [3, 5, None]
+
+
+def test_StreamMatcher_should_match_in_single_feed():
+    matcher = StreamMatcher(['def'])
+    match = matcher.feed('abcdefghi')
+
+    assert match.index == 0
+    assert match.regex == 'def'
+    assert match.text == 'def'
+    assert (match.start, match.end) == (3, 6)
+
+
+def test_StreamMatcher_should_match_across_feeds():
+    matcher = StreamMatcher(['login:'])
+
+    assert matcher.feed('Welcome\nlo') is None
+    assert matcher.feed('gi') is None
+    match = matcher.feed('n: ')
+
+    assert match.text == 'login:'
+    assert (match.start, match.end) == (8, 14)
+
+
+def test_StreamMatcher_should_return_earliest_match():
+    matcher = StreamMatcher(['ghi', 'def', 'de'])
+    match = matcher.feed('abcdefghi')
+
+    assert match.regex == 'def'
+    assert match.index == 1
+
+
+def test_StreamMatcher_should_not_match_text_before_previous_match():
+    matcher = StreamMatcher(['[0-9]'])
+
+    assert matcher.feed('a1b').start == 1
+    match = matcher.feed('c2')
+
+    assert match.text == '2'
+    assert match.start == 4
+
+
+def test_StreamMatcher_should_match_unbounded_pattern_within_window():
+    matcher = StreamMatcher(['start.*end'], search_window_size=20)
+
+    assert matcher.feed('x' * 100 + 'start') is None
+    assert matcher.feed('-' * 5) is None
+    assert matcher.feed('end').text == 'start-----end'
+
+
+def test_StreamMatcher_should_match_unbounded_pattern_over_many_feeds():
+    matcher = StreamMatcher(['{((.|\n)*)\n}'])
+    reply = '{\n' + '    "key": "value",\n' * 1000 + '}'
+
+    matches = [matcher.feed(reply[i:i + 1024]) for i in range(0, len(reply), 1024)]
+
+    assert matches[:-1] == [None] * (len(matches) - 1)
+    assert matches[-1].text == reply
+
+
+def test_StreamMatcher_should_not_match_line_start_in_middle_of_stream():
+    matcher = StreamMatcher(['^abc'])
+
+    assert matcher.feed('x' * 10) is None
+    assert matcher.feed('abc') is None
@@ -0,0 +1,93 @@
+import math
+
+import pygal
+import pytest
+
+from pluma.test.resultsplotter import DefaultResultsPlotter, decimate_lttb, \
+    decimate_min_max, rolling_mean
+
+
+def sine_points(n_points: int) -> list:
+    return [(i, math.sin(i / 100)) for i in range(n_points)]
+
+
+def test_decimate_min_max_should_keep_outliers():
+    points = sine_points(10000)
+    points[1234] = (1234, 50)
+    points[5678] = (5678, -50)
+
+    decimated = decimate_min_max(points, 100)
+
+    assert len(decimated) <= 100
+    assert (1234, 50) in decimated
+    assert (5678, -50) in decimated
+    assert decimated == sorted(decimated)
+
+
+def test_decimate_lttb_should_keep_first_and_last_points():
+    points = sine_points(10000)
+
+    decimated = decimate_lttb(points, 100)
+
+    assert len(decimated) == 100
+    assert decimated[0] == points[0]
+    assert decimated[-1] == points[-1]
+    assert decimated == sorted(decimated)
+
+
+@pytest.mark.parametrize('decimate', [decimate_min_max, decimate_lttb])
+def test_decimate_should_return_short_series_unchanged(decimate):
+    points = sine_points(50)
+
+    assert decimate(points, 100) == points
+
+
+def test_rolling_mean_should_average_windows():
+    points = [(0, 1), (1, 2), (2, 3), (3, 6)]
+
+    assert rolling_mean(points, 2) == [(1, 1.5), (2, 2.5), (3, 4.5)]
+    assert rolling_mean(points, 5) == []
+    assert rolling_mean(points, 1) == points
+
+
+def test_DefaultResultsPlotter_should_decimate_long_series(tmp_path):
+    results = [{'MyTest': {'value': value}} for __, value in sine_points(20000)]
+    plotter = DefaultResultsPlotter(max_points=500)
+
+    assert len(plotter.reduce_points(sine_points(20000))) <= 500
+
+    plotter.plot(str(tmp_path / 'graph.svg'), results=results)
+    assert (tmp_path / 'graph.svg').stat().st_size > 0
+
+
+@pytest.mark.parametrize('decimation', DefaultResultsPlotter.DECIMATIONS)
+def test_DefaultResultsPlotter_should_not_decimate_fields_scatter(decimation):
+    # Values of x in no particular order, as when plotting a field vs another
+    points = [((i * 7919) % 1000, math.sin(i)) for i in range(1000)]
+    plotter = DefaultResultsPlotter(max_points=100, decimation=decimation,
+                                    rolling_window=10)
+
+    assert plotter.reduce_points(points, ordered=False) == points
+    assert len(plotter.reduce_points(points)) <= 100
+
+
+def test_DefaultResultsPlotter_should_plot_all_points_of_fields_scatter(tmp_path, monkeypatch):
+    results = [{'MyTest': {'x': (i * 7919) % 1000, 'y': math.sin(i)}} for i in range(1000)]
+    added = {}
+    add = pygal.XY.add
+
+    def record_add(chart, title, values, **kwargs):
+        added[title] = values
+        return add(chart, title, values, **kwargs)
+
+    monkeypatch.setattr(pygal.XY, 'add', record_add)
+
+    DefaultResultsPlotter(max_points=100).plot(
+        str(tmp_path / 'graph.svg'), results=results, fields=['x', 'y'], vs_type='fields')
+
+    assert added['MyTest'] == [(r['MyTest']['x'], r['MyTest']['y']) for r in results]
+
+
+def test_DefaultResultsPlotter_should_error_on_unknown_decimation():
+    with pytest.raises(AttributeError):
+        DefaultResultsPlotter(decimation='random')
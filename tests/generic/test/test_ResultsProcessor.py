@@ -0,0 +1,157 @@
+import random
+
+import pytest
+
+from pluma.test import TestBase
+from pluma.test.resultsprocessor import DefaultResultsProcessor, NumpyResultsProcessor, \
+    StreamingResultsProcessor, MAX_CHUNK_BUCKETS
+from pluma.test.resultsstore import ResultsStore
+
+
+class MyTest(TestBase):
+    pass
+
+
+def random_results(n_iterations: int, test: TestBase) -> list:
+    generators = {
+        'ints': lambda: random.randint(-5, 5),
+        'floats': lambda: round(random.uniform(0, 10), 3),
+        'bools': lambda: random.random() < 0.5,
+        'mixed_numbers': lambda: random.choice([1, 2.5, 3]),
+        'strings': lambda: random.choice(['a', 'b']),
+        'mixed': lambda: random.choice([1, 'a']),
+    }
+
+    return [{'TestRunner': {str(test): {'data': {
+        field: generator() for field, generator in generators.items()}}}}
+        for _ in range(n_iterations)]
+
+
+def test_StreamingResultsProcessor_should_match_default_summary():
+    random.seed(0)
+    test = MyTest()
+    test.data = {'some': 'data'}
+
+    for n_iterations in [1, 2, 3, 7, 10, 11, 25, 100]:
+        results = random_results(n_iterations, test)
+        expected = DefaultResultsProcessor().generate_summary([test], results)
+        summary = StreamingResultsProcessor().generate_summary([test], results)
+
+        for field, field_summary in summary[str(test)].items():
+            assert field_summary.keys() == expected[str(test)][field].keys()
+            for key, value in field_summary.items():
+                assert value == pytest.approx(expected[str(test)][field][key], abs=0.011)
+                assert type(value) == type(expected[str(test)][field][key])
+
+
+def test_StreamingResultsProcessor_should_keep_bounded_state_on_long_runs():
+    test = MyTest()
+    test.data = {'some': 'data'}
+    values = [i % 7 + i / 10000 for i in range(10000)]
+    results = [{'TestRunner': {str(test): {'data': {'value': value}}}} for value in values]
+
+    processor = StreamingResultsProcessor()
+    for result in results:
+        processor.add_iteration(result['TestRunner'])
+    field = processor.fields[str(test)]['value']
+    summary = processor.summary([test])[str(test)]['value']
+    expected = DefaultResultsProcessor().generate_summary([test], results)[str(test)]['value']
+
+    assert len(field.buckets) <= MAX_CHUNK_BUCKETS
+    assert summary['chunked_mean'] == pytest.approx(expected['chunked_mean'], abs=0.05)
+    for key in ['mean', 'stdev', 'variance', 'median']:
+        assert summary[key] == pytest.approx(expected[key], abs=0.011)
+
+
+def test_StreamingResultsProcessor_should_summarise_iterations_added():
+    test = MyTest()
+    test.data = {'some': 'data'}
+    results = [{'TestRunner': {str(test): {'data': {'value': value}}}}
+               for value in [1, 2, 2, 5]]
+
+    processor = StreamingResultsProcessor()
+    for result in results:
+        processor.add_iteration(result['TestRunner'])
+
+    assert processor.summary([test]) == {str(test): {'value': {
+        'count': {'1': 1, '2': 2, '5': 1},
+        'max': 5,
+        'min': 1,
+        'mode': 2,
+        'mean': 2.5,
+        'median': 2.0,
+        'stdev': 1.73,
+        'variance': 3,
+        'chunked_mean': [1, 2, 2, 5]
+    }}}
+
+
+def test_StreamingResultsProcessor_should_only_summarise_tests_with_data():
+    test = MyTest()
+    processor = StreamingResultsProcessor()
+    processor.add_iteration({str(test): {'data': {'value': 1}}})
+
+    assert processor.summary([test]) == {}
+
+
+def test_StreamingResultsProcessor_add_store_should_match_add_iteration():
+    iterations = [
+        {'MyTest': {'data': {'a': 1, 'b': 'x'}}},
+        {'MyTest': {'data': {'a': 2.5}}},
+        {'MyTest': {'data': {'a': 2, 'b': True}}},
+    ]
+    store = ResultsStore()
+    by_iteration = StreamingResultsProcessor()
+    for data in iterations:
+        store.begin_iteration()
+        store.end_iteration(data, success=True)
+        by_iteration.add_iteration(data)
+
+    by_column = StreamingResultsProcessor()
+    by_column.add_store(store)
+
+    assert by_column.tests_summary(['MyTest']) == by_iteration.tests_summary(['MyTest'])
+
+
+def test_NumpyResultsProcessor_should_match_default_summary():
+    random.seed(0)
+    test = MyTest()
+    test.data = {'some': 'data'}
+
+    for n_iterations in [1, 2, 3, 7, 10, 11, 25, 100]:
+        results = random_results(n_iterations, test)
+        expected = DefaultResultsProcessor().generate_summary([test], results)
+        summary = NumpyResultsProcessor().generate_summary([test], results)
+
+        for field, field_summary in summary[str(test)].items():
+            for percentile in ['p50', 'p90', 'p99']:
+                field_summary.pop(percentile, None)
+            assert field_summary.keys() == expected[str(test)][field].keys()
+            for key, value in field_summary.items():
+                assert value == pytest.approx(expected[str(test)][field][key], abs=0.011)
+                assert type(value) == type(expected[str(test)][field][key])
+
+
+def test_NumpyResultsProcessor_should_read_store_columns():
+    test = MyTest()
+    test.data = {'some': 'data'}
+    store = ResultsStore()
+    for value in [1, 2, 2, 5]:
+        store.begin_iteration()
+        store.end_iteration({str(test): {'data': {'value': value}}}, success=True)
+
+    assert NumpyResultsProcessor().generate_summary([test], store.results) == \
+        {str(test): {'value': {
+            'count': {'1': 1, '2': 2, '5': 1},
+            'max': 5,
+            'min': 1,
+            'mode': 2,
+            'mean': 2.5,
+            'median': 2.0,
+            'stdev': 1.73,
+            'variance': 3,
+            'p50': 2.0,
+            'p90': 4.1,
+            'p99': 4.91,
+            'chunked_mean': [1, 2, 2, 5]
+        }}}
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from pluma.test.resultssink import JsonlResultsSink, compact_results_stream, \
+    read_results_stream
+
+
+def iteration_result(iteration: int, value) -> dict:
+    return {
+        'iteration': iteration,
+        'start': '2021-01-02-03-04-05',
+        'end': '2021-01-02-03-04-06',
+        'success': True,
+        'test_order': None,
+        'TestRunner': {
+            'MyTest': {
+                'tasks': {'ran': ['test_body'], 'failed': {}},
+                'data': {'value': value},
+                'settings': {'x': 1},
+                'order': 0
+            }
+        },
+        'ran': True
+    }
+
+
+def write_stream(path, results, append=False):
+    sink = JsonlResultsSink(str(path), append=append)
+    for result in results:
+        sink.write_iteration(result)
+    sink.close()
+
+
+def test_JsonlResultsSink_should_write_one_record_per_iteration(tmp_path):
+    path = tmp_path / 'results.jsonl'
+    results = [iteration_result(0, 1), iteration_result(1, 2.5)]
+    write_stream(path, results)
+
+    assert len(path.read_text().splitlines()) == 2
+    assert list(read_results_stream(str(path))) == results
+
+
+def test_JsonlResultsSink_should_truncate_existing_stream(tmp_path):
+    path = tmp_path / 'results.jsonl'
+    write_stream(path, [iteration_result(0, 1)])
+    write_stream(path, [iteration_result(1, 2)])
+
+    assert [r['iteration'] for r in read_results_stream(str(path))] == [1]
+
+
+def test_JsonlResultsSink_should_append_to_existing_stream(tmp_path):
+    path = tmp_path / 'results.jsonl'
+    write_stream(path, [iteration_result(0, 1)])
+    write_stream(path, [iteration_result(1, 2)], append=True)
+
+    assert [r['iteration'] for r in read_results_stream(str(path))] == [0, 1]
+
+
+def test_read_results_stream_should_ignore_truncated_last_record(tmp_path):
+    path = tmp_path / 'results.jsonl'
+    write_stream(path, [iteration_result(0, 1)])
+    with open(path, 'a') as f:
+        f.write(json.dumps(iteration_result(1, 2))[:20])
+
+    assert list(read_results_stream(str(path))) == [iteration_result(0, 1)]
+
+
+def test_read_results_stream_should_error_on_invalid_record(tmp_path):
+    path = tmp_path / 'results.jsonl'
+    path.write_text('{"iteration": \n' + json.dumps(iteration_result(1, 2)) + '\n')
+
+    with pytest.raises(ValueError):
+        list(read_results_stream(str(path)))
+
+
+@pytest.mark.parametrize('n_results', [0, 1, 3])
+def test_compact_results_stream_should_write_same_file_as_json_dump(tmp_path, n_results):
+    stream_path = tmp_path / 'results.jsonl'
+    output_path = tmp_path / 'results.json'
+    results = [iteration_result(i, i * 1.5) for i in range(n_results)]
+    write_stream(stream_path, results)
+    data = {'MyTest': {'value': {'min': 0}}}
+    settings = {'MyTest': {'x': 1}}
+
+    compact_results_stream(str(stream_path), str(output_path), data=data, settings=settings)
+
+    assert output_path.read_text() == json.dumps(
+        {'data': data, 'settings': settings, 'results': results}, indent=4)
+
+
+def test_compact_results_stream_should_summarise_stream(tmp_path):
+    stream_path = tmp_path / 'results.jsonl'
+    output_path = tmp_path / 'results.json'
+    write_stream(stream_path, [iteration_result(0, 1), iteration_result(1, 3)])
+
+    compact_results_stream(str(stream_path), str(output_path))
+
+    saved = json.loads(output_path.read_text())
+    assert saved['settings'] == {'MyTest': {'x': 1}}
+    assert saved['data']['MyTest']['value']['min'] == 1
+    assert saved['data']['MyTest']['value']['max'] == 3
+    assert len(saved['results']) == 2
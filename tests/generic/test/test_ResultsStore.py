@@ -0,0 +1,157 @@
+from datetime import datetime
+
+import pytest
+
+from pluma.test.resultsstore import ResultsStore
+
+
+def runner_data(data: dict, failed: dict = None, settings: dict = None) -> dict:
+    return {
+        'MyTest': {
+            'tasks': {
+                'ran': ['setup', 'test_body'],
+                'failed': failed or {}
+            },
+            'data': data,
+            'settings': settings or {'x': 1},
+            'order': 0
+        }
+    }
+
+
+def store_iterations(*iterations_data) -> ResultsStore:
+    store = ResultsStore()
+    for data in iterations_data:
+        store.begin_iteration(datetime(2021, 1, 2, 3, 4, 5))
+        store.end_iteration(data, success=True, end=datetime(2021, 1, 2, 3, 4, 6))
+
+    return store
+
+
+def test_ResultsStore_results_should_return_testrunner_data():
+    data = runner_data({'float': 1.5, 'int': 3, 'bool': True, 'str': 'abc',
+                        'list': [1, 2]}, failed={'setup': 'error'})
+    store = store_iterations(data)
+
+    assert list(store.results) == [{
+        'iteration': 0,
+        'start': '2021-01-02-03-04-05',
+        'end': '2021-01-02-03-04-06',
+        'success': True,
+        'test_order': None,
+        'TestRunner': data,
+        'ran': True
+    }]
+
+
+def test_ResultsStore_should_keep_values_of_mixed_types_unchanged():
+    store = store_iterations(runner_data({'value': 1}), runner_data({'value': 1.5}),
+                             runner_data({'value': 'error'}), runner_data({'value': True}))
+
+    values = [result['TestRunner']['MyTest']['data']['value'] for result in store.results]
+    assert values == [1, 1.5, 'error', True]
+    assert [type(value) for value in values] == [int, float, str, bool]
+
+
+def test_ResultsStore_should_not_keep_references_to_data_saved():
+    saved = [1]
+    store = store_iterations(runner_data({'list': saved}))
+    saved.append(2)
+
+    assert store.results[0]['TestRunner']['MyTest']['data']['list'] == [1]
+
+
+def test_ResultsStore_should_handle_fields_missing_in_some_iterations():
+    store = store_iterations(runner_data({'a': 1}), runner_data({'b': 2}),
+                             runner_data({'a': 3}), {})
+
+    assert [result['TestRunner'].get('MyTest', {}).get('data') for result in store.results] == \
+        [{'a': 1}, {'b': 2}, {'a': 3}, None]
+    assert list(store.field_values('MyTest', 'a')) == [(0, 1), (2, 3)]
+
+
+def test_ResultsStore_should_report_settings_changes():
+    store = store_iterations(runner_data({}, settings={'x': 1}),
+                             runner_data({}, settings={'x': 2}),
+                             runner_data({}, settings={'x': 2}))
+
+    assert store.settings('MyTest') == {'x': 1}
+    assert [result['TestRunner']['MyTest']['settings'] for result in store.results] == \
+        [{'x': 1}, {'x': 2}, {'x': 2}]
+
+
+def test_ResultsStore_should_return_iteration_in_progress_without_data():
+    store = ResultsStore()
+    store.begin_iteration()
+
+    assert store.results[-1]['success'] is None
+    assert store.results[-1]['TestRunner'] == {}
+
+
+def test_ResultsStore_from_results_should_store_same_results():
+    store = store_iterations(runner_data({'a': 1}), runner_data({'a': 'b'}))
+
+    assert ResultsStore.from_results(store.results).results == store.results
+
+
+def test_ResultsStore_load_should_return_same_results_as_saved(tmp_path):
+    store = store_iterations(
+        runner_data({'float': 1.5, 'int': 3, 'bool': True, 'str': 'abc', 'list': [1, 2]},
+                    failed={'setup': 'error'}),
+        runner_data({'float': 2.5, 'int': 4, 'bool': False, 'str': 'def', 'list': [3]},
+                    settings={'x': 2}),
+        {})
+    store.begin_iteration(datetime(2021, 1, 2, 3, 4, 7))
+    store.save(str(tmp_path / 'results'), data={'summary': 1}, settings={'MyTest': {'x': 1}})
+
+    loaded = ResultsStore.load(str(tmp_path / 'results'))
+
+    assert loaded.results == store.results
+    assert loaded.metadata == {'data': {'summary': 1}, 'settings': {'MyTest': {'x': 1}}}
+    assert list(loaded.field_values('MyTest', 'int')) == [(0, 3), (1, 4)]
+    assert [type(value) for __, value in loaded.field_values('MyTest', 'float')] == \
+        [float, float]
+
+
+def test_ResultsStore_load_should_return_read_only_store(tmp_path):
+    store_iterations(runner_data({'a': 1})).save(str(tmp_path / 'results'))
+
+    loaded = ResultsStore.load(str(tmp_path / 'results'))
+
+    with pytest.raises(ValueError):
+        loaded.begin_iteration()
+
+
+def test_ResultsStore_tests_data_should_filter_fields_and_settings():
+    store = store_iterations(runner_data({'a': 1, 'b': 2}, settings={'x': 1}),
+                             runner_data({'b': 3}, settings={'x': 2}),
+                             {},
+                             runner_data({'a': 4}, settings={'x': 1}))
+
+    assert list(store.tests_data(['MyTest'], fields=['a'])) == \
+        [{'MyTest': {'a': 1}}, {'MyTest': {}}, {}, {'MyTest': {'a': 4}}]
+    assert list(store.tests_data(['MyTest'], settings={'x': 1})) == \
+        [{'MyTest': {'a': 1, 'b': 2}}, {}, {}, {'MyTest': {'a': 4}}]
+
+
+def test_ResultsStore_field_values_should_filter_settings():
+    store = store_iterations(runner_data({'a': 1}, settings={'x': 1}),
+                             runner_data({'a': 2}, settings={'x': 2}),
+                             runner_data({'b': 3}, settings={'x': 1}),
+                             runner_data({'a': 4}, settings={'x': 1}))
+
+    assert list(store.field_values('MyTest', 'a', settings={'x': 1})) == [(0, 1), (3, 4)]
+    assert list(store.field_values('MyTest', 'a', settings={'y': 1})) == []
+
+
+def test_ResultsStore_match_test_names_should_return_sorted_matches():
+    store = ResultsStore()
+    store.begin_iteration()
+    store.end_iteration({'TestB': {}, 'TestA': {}, 'Other': {}}, success=True)
+
+    assert store.match_test_names(['Test.*']) == ['TestA', 'TestB']
+
+    store.begin_iteration()
+    store.end_iteration({'TestC': {}}, success=True)
+
+    assert store.match_test_names(['Test.*']) == ['TestA', 'TestB', 'TestC']
@@ -0,0 +1,24 @@
+import pytest
+
+from pluma.test import TaskFailed
+from pluma.test.shelltest import ShellTest
+
+
+def test_ShellTest_should_stop_at_first_output_failing_checks(mock_board, tmp_path):
+    marker = tmp_path / 'marker'
+    test = ShellTest(mock_board, script=['echo first', 'echo second', f'touch {marker}'],
+                     should_not_match_regex=['second'], run_on_host=True)
+
+    with pytest.raises(TaskFailed):
+        test.test_body()
+
+    assert not marker.exists()
+
+
+def test_ShellTest_should_run_scripts_without_checks_in_a_batch(mock_board, tmp_path):
+    marker = tmp_path / 'marker'
+    test = ShellTest(mock_board, script=['echo first', f'touch {marker}'], run_on_host=True)
+
+    test.test_body()
+
+    assert marker.exists()
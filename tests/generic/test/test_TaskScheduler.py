@@ -0,0 +1,90 @@
+import threading
+import time
+
+from pluma.test.scheduler import TaskScheduler
+
+
+def test_TaskScheduler_should_run_jobs_without_common_resources_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    with TaskScheduler(max_workers=2) as scheduler:
+        jobs = [scheduler.submit(barrier.wait, resources=['host']),
+                scheduler.submit(barrier.wait, resources=['console'])]
+
+    # Both jobs must run at the same time to pass the barrier
+    assert all(job.future.exception() is None for job in jobs)
+
+
+def test_TaskScheduler_should_run_jobs_sharing_resources_in_order():
+    running = []
+    order = []
+
+    def job(name):
+        def run():
+            running.append(name)
+            assert len(running) == 1
+            time.sleep(0.01)
+            order.append(name)
+            running.remove(name)
+        return run
+
+    with TaskScheduler(max_workers=4) as scheduler:
+        jobs = [scheduler.submit(job(i), resources=['console', f'resource{i}'])
+                for i in range(4)]
+
+    assert all(job.future.exception() is None for job in jobs)
+    assert order == [0, 1, 2, 3]
+
+
+def test_TaskScheduler_should_wait_for_all_previous_jobs_sharing_resources():
+    order = []
+
+    def job(name, delay=0):
+        def run():
+            time.sleep(delay)
+            order.append(name)
+        return run
+
+    with TaskScheduler(max_workers=3) as scheduler:
+        scheduler.submit(job('console1', delay=0.1), resources=['console1'])
+        scheduler.submit(job('console2'), resources=['console2'])
+        scheduler.submit(job('both'), resources=['console1', 'console2'])
+
+    assert order[-1] == 'both'
+
+
+def test_TaskScheduler_should_return_job_result():
+    with TaskScheduler() as scheduler:
+        job = scheduler.submit(lambda: 42)
+
+    assert job.future.result() == 42
+
+
+def test_TaskScheduler_should_wait_for_dependencies():
+    order = []
+
+    def job(name, delay=0):
+        def run():
+            time.sleep(delay)
+            order.append(name)
+        return run
+
+    with TaskScheduler(max_workers=2) as scheduler:
+        build = scheduler.submit(job('build', delay=0.05))
+        scheduler.submit(job('deploy'), depends_on=[build])
+
+    assert order == ['build', 'deploy']
+
+
+def test_TaskScheduler_critical_path_should_follow_longest_waits():
+    with TaskScheduler(max_workers=3) as scheduler:
+        short = scheduler.submit(lambda: time.sleep(0.01), name='short')
+        long = scheduler.submit(lambda: time.sleep(0.1), name='long')
+        last = scheduler.submit(lambda: None, depends_on=[short, long], name='last')
+        scheduler.submit(lambda: None, name='independent')
+
+    assert TaskScheduler.critical_path([short, long, last]) == [long, last]
+
+
+def test_TaskScheduler_critical_path_should_be_empty_without_jobs():
+    assert TaskScheduler.critical_path([]) == []
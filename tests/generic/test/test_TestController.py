@@ -0,0 +1,106 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from pluma.test import TestBase, TestController, TestRunner
+
+
+def controller_with_results(*iterations_data) -> TestController:
+    controller = TestController(TestRunner(tests=[]))
+    for data in iterations_data:
+        controller.results_store.begin_iteration(datetime(2021, 1, 2, 3, 4, 5))
+        controller.results_store.end_iteration({
+            test_name: {
+                'tasks': {'ran': ['test_body'], 'failed': {}},
+                'data': test_data,
+                'settings': {},
+                'order': 0
+            } for test_name, test_data in data.items()}, True)
+
+    return controller
+
+
+def test_TestController_get_test_data_should_return_csv():
+    controller = controller_with_results({'TestA': {'x': 1, 'y': 'a\nb'}},
+                                         {'TestA': {'x': 2}, 'TestB': {'z': 1.5}})
+
+    assert controller.get_test_data(output_format='csv') == \
+        'iteration,test_name,x,y,z\n' \
+        '0,TestA,1,a b,\n' \
+        '1,TestA,2,,\n' \
+        '1,TestB,,,1.5\n'
+
+
+def test_TestController_get_test_data_should_return_empty_csv_without_data():
+    controller = controller_with_results({'TestA': {'x': 1}})
+
+    assert controller.get_test_data(test_names='TestB', output_format='csv') == ''
+
+
+def test_TestController_get_test_data_should_return_json():
+    controller = controller_with_results({'TestA': {'x': 1}}, {'TestB': {'z': 1.5}})
+
+    assert controller.get_test_data(output_format='json') == json.dumps(
+        [{'TestA': {'x': 1}}, {'TestB': {'z': 1.5}}], indent=4)
+
+
+def test_TestController_export_test_data_should_write_to_path(tmp_path):
+    controller = controller_with_results({'TestA': {'x': 1}}, {'TestA': {'x': 2}})
+    path = str(tmp_path / 'data.csv')
+
+    controller.export_test_data(path, fields=['x'])
+
+    with open(path, 'r') as f:
+        assert f.read() == controller.get_test_data(fields=['x'], output_format='csv')
+
+
+def test_TestController_get_field_values_should_return_values_per_test():
+    controller = controller_with_results({'BootA': {'time': 1}, 'Other': {'time': 2}},
+                                         {'BootB': {'time': 3}},
+                                         {'BootA': {'size': 4}})
+
+    assert controller.get_field_values('time', 'Boot.*') == {
+        'BootA': [(0, 1)],
+        'BootB': [(1, 3)]
+    }
+
+
+def test_TestController_results_should_show_iteration_in_progress(mock_board):
+    in_progress = []
+
+    class MyTest(TestBase):
+        def test_body(self):
+            self.save_data(value=len(in_progress))
+            in_progress.append(controller.results[-1]['TestRunner'][str(self)]['data'])
+
+    controller = TestController(TestRunner(board=mock_board, tests=MyTest(mock_board)),
+                                email_on_except=False)
+    controller.run()
+    controller.run_iteration()
+
+    assert in_progress == [{'value': 0}, {'value': 1}]
+
+
+def test_TestController_data_should_hold_results_summary_after_iteration(mock_board):
+    class MyTest(TestBase):
+        def test_body(self):
+            self.save_data(value=1)
+
+    controller = TestController(TestRunner(board=mock_board, tests=MyTest(mock_board)),
+                                email_on_except=False)
+    controller.run()
+
+    summary = controller.data['TestController']['results_summary']
+    assert summary == {str(controller.testrunner.tests[0]): {'value': {'count': {'1': 1}}}}
+
+
+def test_TestController_results_should_be_read_only(mock_board):
+    controller = controller_with_results({'TestA': {'x': 1}})
+
+    with pytest.raises(AttributeError):
+        controller.results.append({})
+
+    controller.results = list(controller.results) * 2
+    assert [result['TestRunner']['TestA']['data'] for result in controller.results] == \
+        [{'x': 1}, {'x': 1}]
@@ -1,7 +1,9 @@
+import threading
+import time
 from subprocess import run
 from pluma.test.testrunner import TestRunnerParallel
 from unittest.mock import Mock, patch
-from pluma.test import TestRunner, TestBase
+from pluma.test import TestRunner, TestBase, SequenceNode
 
 
 def test_TestRunner_should_run_setup_task_if_present(mock_board):
@@ -564,3 +566,140 @@ def test_TestRunner_rm_test_should_remove_test(mock_board):
     runner.rm_test(test)
 
     assert test not in runner.tests
+
+
+def test_TestRunnerParallel_should_run_host_tests_concurrently(mock_board):
+    barrier = threading.Barrier(2, timeout=5)
+
+    class HostTest(TestBase):
+        def resources(self):
+            return []
+
+        def test_body(self):
+            barrier.wait()
+
+    runner = TestRunnerParallel(
+        board=mock_board,
+        tests=[HostTest(mock_board), HostTest(mock_board)]
+    )
+
+    assert runner.run() is True
+
+
+def test_TestRunnerParallel_should_run_tests_sharing_console_in_order(mock_board):
+    order = []
+
+    class ConsoleTest(TestBase):
+        def __init__(self, board, index):
+            super().__init__(board, test_name_suffix=str(index))
+            self.index = index
+
+        def resources(self):
+            return [self.board.console]
+
+        def test_body(self):
+            time.sleep(0.01 * (3 - self.index))
+            order.append(self.index)
+
+    TestRunnerParallel(
+        board=mock_board,
+        tests=[ConsoleTest(mock_board, i) for i in range(3)]
+    ).run()
+
+    assert order == [0, 1, 2]
+
+
+def test_TestRunnerParallel_should_have_expected_data(mock_board):
+    class MyTest(TestBase):
+        def setup(self):
+            pass
+
+        def test_body(self):
+            self.save_data(foo='bar')
+
+    class MyFailingTest(TestBase):
+        def resources(self):
+            return []
+
+        def test_body(self):
+            raise Exception('Foobar')
+
+    runner = TestRunnerParallel(
+        board=mock_board,
+        tests=[MyTest(mock_board), MyFailingTest(mock_board)],
+        continue_on_fail=True
+    )
+
+    assert runner.run() is False
+    assert runner.data == {
+        'test_TestRunner.MyTest': {
+            'data': {'foo': 'bar'},
+            'order': 0,
+            'settings': {},
+            'tasks': {
+                'failed': {},
+                'ran': ['setup', 'test_body']}
+        },
+        'test_TestRunner.MyFailingTest': {
+            'data': {},
+            'order': 1,
+            'settings': {},
+            'tasks': {
+                'failed': {'test_body': 'Foobar'},
+                'ran': ['test_body']}
+        }
+    }
+
+
+def test_TestRunnerParallel_should_not_start_more_tests_if_failure_and_no_continue_on_fail(
+        mock_board):
+    class MyTest1(TestBase):
+        def test_body(self):
+            raise RuntimeError
+
+    class MyTest2(TestBase):
+        def test_body(self):
+            pass
+
+    test2 = MyTest2(mock_board)
+    test2.test_body = Mock(test2.test_body)
+
+    runner = TestRunnerParallel(
+        board=mock_board,
+        tests=[MyTest1(mock_board), test2],
+        continue_on_fail=False
+    )
+
+    assert runner.run() is False
+    runner.tests[1].test_body.assert_not_called()
+
+
+def test_TestRunnerParallel_should_run_tests_after_their_dependencies(mock_board):
+    order = []
+
+    class HostTest(TestBase):
+        def __init__(self, board, name, delay=0):
+            super().__init__(board, test_name_suffix=name)
+            self.name = name
+            self.delay = delay
+
+        def resources(self):
+            return []
+
+        def test_body(self):
+            time.sleep(self.delay)
+            order.append(self.name)
+
+    build = HostTest(mock_board, 'build', delay=0.05)
+    build.sequence_node = SequenceNode(id='build')
+    deploy = HostTest(mock_board, 'deploy')
+    deploy.sequence_node = SequenceNode(depends_on=['build'])
+
+    runner = TestRunnerParallel(
+        board=mock_board,
+        tests=[build, deploy]
+    )
+    runner.run()
+
+    assert order == ['build', 'deploy']
+    assert [job.name for job in runner.critical_path] == [str(test) for test in runner.tests]